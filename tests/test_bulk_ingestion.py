@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.datastructures import UnweightedGraph, WeightedGraph, MultiplexGraph
+
+
+def random_columns(seed, num_rows=60, num_nodes=6):
+    rng = random.Random(seed)
+    return {
+        "source": [rng.randrange(num_nodes) for _ in range(num_rows)],
+        "target": [rng.randrange(num_nodes) for _ in range(num_rows)],
+        "relation": [rng.choice(["reply", "mention"]) for _ in range(num_rows)],
+        "weight": [float(rng.randint(1, 5)) for _ in range(num_rows)]
+    }
+
+
+def storage(graph):
+    """Returns the storage of a graph as plain dicts, with weight lists sorted since bulk ingestion groups the weights
+    of an edge before adding them.
+    """
+    def plain(value):
+        if isinstance(value, dict):
+            return {key: plain(item) for key, item in value.items()}
+        if isinstance(value, (list, set)):
+            return sorted(value)
+        return value
+    return {node: plain(graph[node]) for node in graph}
+
+
+def make_graph(graph_class, directed, weight_is_list):
+    if graph_class is UnweightedGraph:
+        return UnweightedGraph(directed)
+    return graph_class(directed, weight_is_list)
+
+
+def to_edges(graph_class, columns):
+    rows = zip(columns["source"], columns["target"], columns["relation"], columns["weight"])
+    if graph_class is UnweightedGraph:
+        return [(source, target) for source, target, _, _ in rows]
+    if graph_class is WeightedGraph:
+        return [(source, target, weight) for source, target, _, weight in rows]
+    return list(rows)
+
+
+GRAPHS = [(graph_class, directed, weight_is_list) for graph_class in [UnweightedGraph, WeightedGraph, MultiplexGraph]
+          for directed in [False, True] for weight_is_list in [False, True]
+          if not (graph_class is UnweightedGraph and weight_is_list)]
+
+
+@pytest.mark.parametrize("graph_class,directed,weight_is_list", GRAPHS)
+def test_add_edges_from_arrays_matches_add_edges(graph_class, directed, weight_is_list):
+    columns = random_columns(0)
+    expected = make_graph(graph_class, directed, weight_is_list)
+    expected.add_edges(to_edges(graph_class, columns))
+    actual = make_graph(graph_class, directed, weight_is_list)
+    actual.add_edges_from_arrays(np.array(columns["source"]), np.array(columns["target"]),
+                                 relations=np.array(columns["relation"], dtype=object), weights=np.array(columns["weight"]))
+    assert storage(actual) == storage(expected)
+    assert set(actual.get_nodes()) == set(expected.get_nodes())
+    assert actual._predecessors == expected._predecessors
+    assert getattr(actual, "_relations", None) == getattr(expected, "_relations", None)
+
+
+@pytest.mark.parametrize("graph_class,directed,weight_is_list", GRAPHS)
+def test_add_edges_from_arrays_without_rows_adds_nothing(graph_class, directed, weight_is_list):
+    graph = make_graph(graph_class, directed, weight_is_list)
+    empty = np.zeros(0, dtype=np.int64)
+    graph.add_edges_from_arrays(empty, empty, relations=np.zeros(0, dtype=object), weights=np.zeros(0))
+    assert len(graph) == 0
+    assert len(graph.get_nodes()) == 0
+
+
+def test_multiplex_add_edges_from_arrays_requires_relations():
+    graph = MultiplexGraph(True)
+    with pytest.raises(ValueError):
+        graph.add_edges_from_arrays(np.array([0]), np.array([1]), weights=np.array([1.0]))
@@ -0,0 +1,101 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from wundt.multiview.social_score import pagerank, eigenvector_centrality, katz_centrality, hits
+
+
+def random_graph(seed, directed, num_nodes=25, probability=0.15):
+    graph = nx.gnp_random_graph(num_nodes, probability, seed=seed, directed=directed)
+    rng = np.random.default_rng(seed)
+    for source, target in graph.edges():
+        graph[source][target]["weight"] = float(rng.integers(1, 6))
+    return graph
+
+
+def to_matrix(graph):
+    return nx.to_scipy_sparse_array(graph, nodelist=sorted(graph), weight="weight", format="csr")
+
+
+def as_array(scores, graph):
+    return np.array([scores[node] for node in sorted(graph)])
+
+
+GRAPHS = [(seed, directed) for seed in range(3) for directed in [False, True]]
+
+
+@pytest.mark.parametrize("seed,directed", GRAPHS)
+@pytest.mark.parametrize("weighted", [False, True])
+def test_pagerank_matches_networkx(seed, directed, weighted):
+    graph = random_graph(seed, directed)
+    expected = nx.pagerank(graph, weight="weight" if weighted else None, tol=1e-10, max_iter=1000)
+    actual = pagerank(to_matrix(graph), weighted=weighted, tol=1e-10, max_iter=1000)
+    assert np.allclose(actual, as_array(expected, graph), atol=1e-6)
+
+
+@pytest.mark.parametrize("seed,directed", GRAPHS)
+def test_pagerank_personalization_matches_networkx(seed, directed):
+    graph = random_graph(seed, directed)
+    personalization = {node: float(node % 3 + 1) for node in graph}
+    expected = nx.pagerank(graph, alpha=0.7, personalization=personalization, tol=1e-10, max_iter=1000)
+    actual = pagerank(to_matrix(graph), alpha=0.7, personalization=as_array(personalization, graph), tol=1e-10, max_iter=1000)
+    assert np.allclose(actual, as_array(expected, graph), atol=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_eigenvector_centrality_matches_networkx(seed):
+    # A connected undirected graph has a unique principal eigenvector
+    graph = nx.connected_watts_strogatz_graph(25, 4, 0.3, seed=seed)
+    rng = np.random.default_rng(seed)
+    for source, target in graph.edges():
+        graph[source][target]["weight"] = float(rng.integers(1, 6))
+    expected = nx.eigenvector_centrality(graph, weight="weight", tol=1e-10, max_iter=1000)
+    actual = eigenvector_centrality(to_matrix(graph), tol=1e-10, max_iter=1000)
+    assert np.allclose(actual, as_array(expected, graph), atol=1e-6)
+
+
+@pytest.mark.parametrize("seed,directed", GRAPHS)
+@pytest.mark.parametrize("normalized", [False, True])
+def test_katz_centrality_matches_networkx(seed, directed, normalized):
+    graph = random_graph(seed, directed)
+    expected = nx.katz_centrality(graph, alpha=0.02, weight="weight", normalized=normalized, tol=1e-10, max_iter=1000)
+    actual = katz_centrality(to_matrix(graph), alpha=0.02, normalized=normalized, tol=1e-10, max_iter=1000)
+    assert np.allclose(actual, as_array(expected, graph), atol=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_hits_matches_networkx(seed):
+    graph = random_graph(seed, True, probability=0.25)
+    expected_hubs, expected_authorities = nx.hits(graph, tol=1e-12, max_iter=1000)
+    hubs, authorities = hits(to_matrix(graph), tol=1e-12, max_iter=1000)
+    assert np.allclose(hubs, as_array(expected_hubs, graph), atol=1e-6)
+    assert np.allclose(authorities, as_array(expected_authorities, graph), atol=1e-6)
+
+
+def test_list_of_matrices_matches_single_matrices():
+    graphs = [random_graph(seed, True, num_nodes=num_nodes) for seed, num_nodes in [(0, 25), (1, 10), (2, 1), (3, 18)]]
+    matrices = [to_matrix(graph) for graph in graphs]
+    for scores, options in [(pagerank, {}), (eigenvector_centrality, {}), (katz_centrality, {"alpha": 0.02})]:
+        together = scores(matrices, tol=1e-10, max_iter=1000, **options)
+        for matrix, values in zip(matrices, together):
+            assert np.allclose(values, scores(matrix, tol=1e-10, max_iter=1000, **options), atol=1e-6)
+    together_hubs, together_authorities = hits(matrices, tol=1e-12, max_iter=1000)
+    for matrix, hubs, authorities in zip(matrices, together_hubs, together_authorities):
+        expected_hubs, expected_authorities = hits(matrix, tol=1e-12, max_iter=1000)
+        assert np.allclose(hubs, expected_hubs, atol=1e-8)
+        assert np.allclose(authorities, expected_authorities, atol=1e-8)
+
+
+def test_negative_weights_are_rejected():
+    graph = nx.DiGraph()
+    graph.add_edge(0, 1, weight=-1.0)
+    with pytest.raises(ValueError):
+        pagerank(to_matrix(graph))
+    with pytest.raises(ValueError):
+        hits(to_matrix(graph))
+
+
+def test_not_converging_raises():
+    graph = random_graph(0, True)
+    with pytest.raises(RuntimeError):
+        pagerank(to_matrix(graph), tol=1e-14, max_iter=2)
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from wundt.multiview.datastructures import UnweightedGraph, WeightedGraph, MultiplexGraph
+
+
+def random_edges(seed, num_nodes=8, num_edges=40, relations=None):
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(num_edges):
+        source, target = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        weight = float(rng.randint(1, 5))
+        if relations is None:
+            edges.append((source, target, weight))
+        else:
+            edges.append((source, target, rng.choice(relations), weight))
+    return edges
+
+
+def build(graph_class, directed, weight_is_list=False):
+    if graph_class is UnweightedGraph:
+        graph = UnweightedGraph(directed)
+        graph.add_edges([edge[:2] for edge in random_edges(0)])
+    elif graph_class is WeightedGraph:
+        graph = WeightedGraph(directed, weight_is_list)
+        graph.add_edges(random_edges(0))
+    else:
+        graph = MultiplexGraph(directed, weight_is_list)
+        graph.add_edges(random_edges(0, relations=["reply", "mention", "reaction"]))
+    graph.add_node(100)
+    return graph
+
+
+def edge_set(graph):
+    output = set()
+    for edge in graph.get_edges():
+        if len(edge) == 4:
+            edge = edge[:3] + (edge[3]["weight"],)
+        output.add(tuple(round(value, 6) if isinstance(value, float) else value for value in edge))
+    return output
+
+
+def assert_same_graph(expected, actual):
+    assert set(expected.get_nodes()) == set(actual.get_nodes())
+    assert edge_set(expected) == edge_set(actual)
+    for node in expected.get_nodes():
+        assert set(expected.get_neighbors(node)) == set(actual.get_neighbors(node))
+        assert set(expected.get_predecessors(node)) == set(actual.get_predecessors(node))
+        assert expected.out_degree(node) == actual.out_degree(node)
+        assert expected.in_degree(node) == actual.in_degree(node)
+    for edge in expected.get_edges(data=False):
+        assert actual.contains_edge(edge)
+    missing = (0, 101, "reply") if isinstance(expected, MultiplexGraph) else (0, 101)
+    assert not actual.contains_edge(missing)
+
+
+GRAPHS = [(graph_class, directed, weight_is_list) for graph_class in [UnweightedGraph, WeightedGraph, MultiplexGraph]
+          for directed in [False, True] for weight_is_list in [False, True]
+          if not (graph_class is UnweightedGraph and weight_is_list)]
+
+
+@pytest.mark.parametrize("graph_class,directed,weight_is_list", GRAPHS)
+def test_frozen_graph_matches_dict_graph(graph_class, directed, weight_is_list):
+    graph = build(graph_class, directed, weight_is_list)
+    assert_same_graph(graph, graph.freeze())
+
+
+@pytest.mark.parametrize("graph_class,directed,weight_is_list", GRAPHS)
+def test_thawed_graph_matches_dict_graph(graph_class, directed, weight_is_list):
+    graph = build(graph_class, directed, weight_is_list)
+    thawed = graph.freeze().thaw()
+    assert type(thawed) is graph_class
+    assert_same_graph(graph, thawed)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_frozen_and_thawed_layers_match_dict_layers(directed):
+    graph = build(MultiplexGraph, directed)
+    frozen = graph.freeze()
+    thawed = frozen.thaw()
+    relations = set(edge[2] for edge in graph.get_edges(data=False))
+    assert set(frozen.get_relations()) == relations
+    for relation in relations:
+        expected = set((source, target, weight) for source, target, edge_relation, weight in edge_set(graph) if edge_relation == relation)
+        assert edge_set(frozen.get_layer(relation)) == expected
+        assert edge_set(thawed.get_layer(relation)) == expected
+
+
+def test_delete_node_of_thawed_graph_removes_incoming_edges():
+    graph = WeightedGraph(True)
+    graph.add_edge(("a", "b", 1.0))
+    thawed = graph.freeze().thaw()
+    thawed.delete_node("b")
+    assert dict(thawed["a"]) == {}
+    assert thawed.in_degree("b") == 0
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from wundt.multiview.datastructures import MultiplexGraph
+from wundt.multiview.datastructures.walks import MultiplexRandomWalker
+
+
+def random_graph(seed, directed, num_nodes=10, num_edges=80):
+    rng = random.Random(seed)
+    graph = MultiplexGraph(directed)
+    for _ in range(num_edges):
+        graph.add_edge((rng.randrange(num_nodes), rng.randrange(num_nodes), rng.choice(["reply", "mention", "reaction"]), float(rng.randint(1, 5))))
+    return graph
+
+
+def layer_steps(graph, relations):
+    positions = {node: position for position, node in enumerate(graph.get_node_order())}
+    steps = set()
+    for source, target, relation, _ in graph.get_edges():
+        if relation in relations:
+            steps.add((positions[source], positions[target]))
+            if not graph.directed:
+                steps.add((positions[target], positions[source]))
+    return steps
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("p,q", [(1, 1), (0.5, 2.0)])
+def test_zero_weight_layers_are_never_walked(directed, p, q):
+    graph = random_graph(0, directed)
+    allowed = layer_steps(graph, ["reply", "reaction"])
+    excluded = layer_steps(graph, ["mention"]) - allowed
+    assert len(excluded) > 0
+    for walks in graph.multiplex_walk_generator(8, num_walks=20, layer_weights={"mention": 0}, p=p, q=q, batch_size=64, seed=0):
+        for walk in walks.tolist():
+            for source, target in zip(walk, walk[1:]):
+                if target == -1:
+                    break
+                assert (source, target) in allowed
+
+
+def test_nodes_only_in_zero_weight_layers_do_not_move():
+    layers = {
+        "reply": sparse.csr_matrix(([1.0], ([1], [2])), shape=(3, 3)),
+        "mention": sparse.csr_matrix(([1.0, 1.0], ([0, 1], [1, 0])), shape=(3, 3))
+    }
+    walker = MultiplexRandomWalker(layers, layer_weights={"mention": 0})
+    walks = walker.walk(np.array([0, 1], dtype=np.int32), 3, np.random.default_rng(0))
+    assert walks.tolist() == [[0, -1, -1], [1, 2, -1]]
+
+
+def test_layers_are_drawn_by_weight():
+    layers = {
+        "reply": sparse.csr_matrix(([1.0], ([0], [1])), shape=(3, 3)),
+        "mention": sparse.csr_matrix(([1.0], ([0], [2])), shape=(3, 3))
+    }
+    walker = MultiplexRandomWalker(layers, layer_weights={"reply": 1.0, "mention": 3.0})
+    walks = walker.walk(np.zeros(40000, dtype=np.int32), 2, np.random.default_rng(0))
+    frequencies = np.bincount(walks[:, 1], minlength=3) / 40000.0
+    assert np.allclose(frequencies, [0.0, 0.25, 0.75], atol=0.01)
+
+
+def test_negative_layer_weights_are_rejected():
+    layers = {"reply": sparse.csr_matrix(([1.0], ([0], [1])), shape=(2, 2))}
+    with pytest.raises(ValueError):
+        MultiplexRandomWalker(layers, layer_weights={"reply": -1.0})
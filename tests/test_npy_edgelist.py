@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.datastructures.nodes import NodeDictionary
+from wundt.multiview.utils.preprocess import save_npy_edgelist, load_npy_edgelist
+
+COLUMNS = ("source", "target", "relation", "timestamp", "weight")
+
+
+def random_edges(seed, nodes, num_edges=250):
+    rng = random.Random(seed)
+    return [(rng.choice(nodes), rng.choice(nodes), rng.choice(["reply", "mention", "reaction"]),
+             float(rng.randint(0, 1000)), rng.random() * 10) for _ in range(num_edges)]
+
+
+@pytest.mark.parametrize("nodes", [list(range(20)), ["U%02d" % node for node in range(20)]])
+@pytest.mark.parametrize("chunk_size", [7, 100000])
+def test_npy_round_trip(tmp_path, nodes, chunk_size):
+    edges = random_edges(0, nodes)
+    save_npy_edgelist(edges, COLUMNS, str(tmp_path), header={"directed": True}, chunk_size=chunk_size)
+    header, columns = load_npy_edgelist(str(tmp_path))
+    assert header["directed"] is True
+    assert header["columns"] == list(COLUMNS)
+    assert header["num_edges"] == len(edges)
+    assert isinstance(columns["timestamp"], np.memmap)
+    loaded = list(zip(*(columns[name].tolist() for name in COLUMNS)))
+    assert loaded == edges
+
+
+def test_npy_relations_are_kept_as_positions(tmp_path):
+    edges = random_edges(1, list(range(5)))
+    save_npy_edgelist(edges, COLUMNS, str(tmp_path))
+    header, columns = load_npy_edgelist(str(tmp_path), mmap_mode=None, decode_relations=False)
+    assert columns["relation"].dtype == np.int32
+    assert [header["relations"][position] for position in columns["relation"]] == [edge[2] for edge in edges]
+
+
+def test_npy_weights_given_as_dicts_and_node_ids_are_translated(tmp_path):
+    node_dictionary = NodeDictionary(["alice", "bob", "carol"])
+    edges = [(0, 1, 5.0, {"weight": 2.5}), (2, 0, 6.0, {"weight": 1.0})]
+    save_npy_edgelist(edges, ("source", "target", "timestamp", "weight"), str(tmp_path), node_dictionary=node_dictionary)
+    _, columns = load_npy_edgelist(str(tmp_path))
+    assert columns["source"].tolist() == ["alice", "carol"]
+    assert columns["target"].tolist() == ["bob", "alice"]
+    assert columns["weight"].tolist() == [2.5, 1.0]
+
+
+def test_npy_without_edges(tmp_path):
+    save_npy_edgelist([], ("source", "target", "timestamp"), str(tmp_path))
+    header, columns = load_npy_edgelist(str(tmp_path))
+    assert header["num_edges"] == 0
+    assert all(len(columns[name]) == 0 for name in ("source", "target", "timestamp"))
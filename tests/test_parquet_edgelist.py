@@ -0,0 +1,86 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.utils.preprocess import save_parquet_edgelist, load_parquet_edgelist
+
+pytest.importorskip("pyarrow")
+
+COLUMNS = ("source", "target", "relation", "timestamp", "weight")
+
+
+def random_edges(seed, num_edges=500):
+    rng = random.Random(seed)
+    return [(rng.randrange(30), rng.randrange(30), rng.choice(["reply", "mention"]), float(rng.randint(0, 999)),
+             float(rng.randint(1, 9))) for _ in range(num_edges)]
+
+
+def loaded_edges(columns):
+    return sorted(zip(*(columns[name].tolist() for name in COLUMNS)))
+
+
+@pytest.mark.parametrize("bucket_size", [None, 100.0, 250.0])
+def test_parquet_round_trip(tmp_path, bucket_size):
+    edges = random_edges(0)
+    save_parquet_edgelist(edges, COLUMNS, str(tmp_path), header={"directed": False}, bucket_size=bucket_size, row_group_size=32)
+    header, columns = load_parquet_edgelist(str(tmp_path))
+    assert header["directed"] is False
+    assert header["num_edges"] == len(edges)
+    assert loaded_edges(columns) == sorted(edges)
+
+
+def test_parquet_partitions_by_time_bucket(tmp_path):
+    edges = random_edges(1)
+    save_parquet_edgelist(edges, COLUMNS, str(tmp_path), bucket_size=100.0)
+    header, _ = load_parquet_edgelist(str(tmp_path))
+    assert header["buckets"] == sorted(set(int(edge[3] // 100) for edge in edges))
+    for bucket in header["buckets"]:
+        _, columns = load_parquet_edgelist(str(tmp_path), bucket * 100.0, bucket * 100.0 + 99.0)
+        assert (np.floor(columns["timestamp"] / 100) == bucket).all()
+        assert sorted(os.listdir(os.path.join(str(tmp_path), "bucket=%d" % bucket))) == ["part-0.parquet"]
+
+
+@pytest.mark.parametrize("bucket_size", [None, 100.0])
+@pytest.mark.parametrize("start_time,end_time", [(120.0, 380.0), (None, 50.0), (900.0, None), (400.0, 400.0), (2000.0, 3000.0)])
+def test_parquet_time_range(tmp_path, bucket_size, start_time, end_time):
+    edges = random_edges(2)
+    save_parquet_edgelist(edges, COLUMNS, str(tmp_path), bucket_size=bucket_size, row_group_size=16)
+    _, columns = load_parquet_edgelist(str(tmp_path), start_time, end_time)
+    low = -np.inf if start_time is None else start_time
+    high = np.inf if end_time is None else end_time
+    assert loaded_edges(columns) == sorted(edge for edge in edges if low <= edge[3] <= high)
+
+
+def test_parquet_skips_buckets_and_row_groups_outside_of_range(tmp_path, monkeypatch):
+    import pyarrow.parquet as pq
+    edges = random_edges(3)
+    save_parquet_edgelist(edges, COLUMNS, str(tmp_path), bucket_size=250.0, row_group_size=8)
+    read_row_groups = []
+    opened = []
+    original_init = pq.ParquetFile.__init__
+    original_read_row_groups = pq.ParquetFile.read_row_groups
+
+    def tracked_init(self, source, *args, **kwargs):
+        opened.append(os.path.basename(os.path.dirname(source)))
+        original_init(self, source, *args, **kwargs)
+
+    def tracked_read_row_groups(self, row_groups, *args, **kwargs):
+        read_row_groups.append((self.metadata.num_rows, len(row_groups), self.num_row_groups))
+        return original_read_row_groups(self, row_groups, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "__init__", tracked_init)
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", tracked_read_row_groups)
+    _, columns = load_parquet_edgelist(str(tmp_path), 300.0, 320.0)
+    assert opened == ["bucket=1"]
+    assert len(read_row_groups) == 1 and read_row_groups[0][1] < read_row_groups[0][2]
+    assert loaded_edges(columns) == sorted(edge for edge in edges if 300.0 <= edge[3] <= 320.0)
+
+
+def test_parquet_without_timestamps(tmp_path):
+    edges = [(0, 1, 2.0), (1, 2, 3.0)]
+    save_parquet_edgelist(edges, ("source", "target", "weight"), str(tmp_path), bucket_size=10.0)
+    header, columns = load_parquet_edgelist(str(tmp_path), 0.0, 1.0)
+    assert header["buckets"] == []
+    assert list(zip(columns["source"].tolist(), columns["target"].tolist(), columns["weight"].tolist())) == edges
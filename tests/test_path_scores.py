@@ -0,0 +1,78 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from wundt.multiview.social_score import get_path_scores, get_sample_size
+
+
+def random_graph(seed, directed, num_nodes=30, probability=0.1):
+    graph = nx.gnp_random_graph(num_nodes, probability, seed=seed, directed=directed)
+    rng = np.random.default_rng(seed)
+    for source, target in graph.edges():
+        graph[source][target]["weight"] = float(rng.integers(1, 6))
+    return graph
+
+
+def to_matrix(graph):
+    return nx.to_scipy_sparse_array(graph, nodelist=sorted(graph), weight="weight", format="csr")
+
+
+def as_array(scores, graph):
+    return np.array([scores[node] for node in sorted(graph)])
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("normalized", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exact_path_scores_match_networkx(directed, weighted, normalized, workers):
+    graph = random_graph(0, directed)
+    weight = "weight" if weighted else None
+    scores = get_path_scores(to_matrix(graph), directed=directed, weighted=weighted, normalized=normalized, workers=workers)
+    betweenness = nx.betweenness_centrality(graph, weight=weight, normalized=normalized)
+    # networkx measures closeness over incoming distances, as get_path_scores
+    closeness = nx.closeness_centrality(graph, distance=weight)
+    assert np.allclose(scores["betweenness_centrality"], as_array(betweenness, graph))
+    assert np.allclose(scores["closeness_centrality"], as_array(closeness, graph))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_list_of_matrices_matches_networkx(workers):
+    graphs = [random_graph(seed, True, num_nodes=num_nodes) for seed, num_nodes in [(1, 30), (2, 12), (3, 2), (4, 20)]]
+    scores = get_path_scores([to_matrix(graph) for graph in graphs], weighted=True, workers=workers)
+    for index, graph in enumerate(graphs):
+        assert np.allclose(scores["betweenness_centrality"][index], as_array(nx.betweenness_centrality(graph, weight="weight"), graph))
+        assert np.allclose(scores["closeness_centrality"][index], as_array(nx.closeness_centrality(graph, distance="weight"), graph))
+
+
+def test_selected_scores_only():
+    scores = get_path_scores(to_matrix(random_graph(5, True)), centralities=["closeness_centrality"])
+    assert list(scores) == ["closeness_centrality"]
+    with pytest.raises(ValueError):
+        get_path_scores(to_matrix(random_graph(5, True)), centralities=["harmonic_centrality"])
+
+
+def test_sampled_betweenness_approximates_networkx():
+    graph = random_graph(6, False, num_nodes=120, probability=0.05)
+    expected = as_array(nx.betweenness_centrality(graph), graph)
+    scores = get_path_scores(to_matrix(graph), directed=False, sample_size=60, seed=0)
+    assert np.abs(scores["betweenness_centrality"] - expected).max() < 0.05
+    # Pivot samples are reproducible and do not depend on the number of workers
+    parallel = get_path_scores(to_matrix(graph), directed=False, sample_size=60, seed=0, workers=2)
+    assert np.allclose(parallel["betweenness_centrality"], scores["betweenness_centrality"])
+    assert np.allclose(parallel["closeness_centrality"], scores["closeness_centrality"])
+
+
+def test_more_pivots_than_nodes_is_exact():
+    graph = random_graph(7, True)
+    exact = get_path_scores(to_matrix(graph))
+    sampled = get_path_scores(to_matrix(graph), sample_size=100, seed=0)
+    assert np.allclose(exact["betweenness_centrality"], sampled["betweenness_centrality"])
+    assert get_sample_size(1000, 0.05) > get_sample_size(1000, 0.1)
+
+
+def test_negative_weights_are_rejected():
+    graph = nx.DiGraph()
+    graph.add_edge(0, 1, weight=-1.0)
+    with pytest.raises(ValueError):
+        get_path_scores(to_matrix(graph), weighted=True)
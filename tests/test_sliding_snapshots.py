@@ -0,0 +1,54 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from wundt.multiview.datastructures import TemporalWeightedGraph
+
+
+def brute_force_window(events, start_time, end_time):
+    """Returns count and mean of the weights of every undirected edge within [start_time, end_time]
+    """
+    weights = defaultdict(list)
+    for source, target, time, weight in events:
+        if start_time <= time <= end_time:
+            weights[(min(source, target), max(source, target))].append(weight)
+    return {edge: (len(values), sum(values) / len(values)) for edge, values in weights.items()}
+
+
+@pytest.mark.parametrize("weight_is_list", [False, True])
+def test_undirected_count_and_mean_match_brute_force(weight_is_list):
+    rng = random.Random(0)
+    # One event per edge and timestamp, so the count of timestamps is also the count of weights
+    cells = set()
+    while len(cells) < 200:
+        source, target = rng.randint(0, 5), rng.randint(0, 5)
+        cells.add((min(source, target), max(source, target), rng.randint(0, 30)))
+    events = [(source, target, time, float(rng.randint(1, 9))) for source, target, time in sorted(cells)]
+    graph = TemporalWeightedGraph(False, weight_is_list)
+    for event in events:
+        graph.add_edge(event)
+    windows = [(start, start + 6) for start in range(0, 30, 4)]
+    counts = graph.iter_sliding_snapshot_graphs(0, 30, 6, 4, aggregate="count")
+    means = graph.iter_sliding_snapshot_graphs(0, 30, 6, 4, aggregate="mean")
+    for (start_time, end_time), count_graph, mean_graph in zip(windows, counts, means):
+        expected = brute_force_window(events, start_time, end_time)
+        assert set((min(edge), max(edge)) for edge in count_graph.get_edges(data=False)) == set(expected)
+        for (source, target), (count, mean) in expected.items():
+            assert count_graph[source][target] == pytest.approx(count)
+            assert count_graph[target][source] == pytest.approx(count)
+            assert mean_graph[source][target] == pytest.approx(mean)
+            assert mean_graph[target][source] == pytest.approx(mean)
+
+
+def test_undirected_self_loop_is_not_doubled():
+    graph = TemporalWeightedGraph(False, False)
+    graph.add_edge((1, 1, 5, 3.0))
+    graph.add_edge((1, 2, 5, 2.0))
+    graph.add_edge((1, 2, 6, 2.0))
+    count_graph = next(graph.iter_sliding_snapshot_graphs(0, 1, 10, 10, aggregate="count"))
+    mean_graph = next(graph.iter_sliding_snapshot_graphs(0, 1, 10, 10, aggregate="mean"))
+    assert count_graph[1][1] == pytest.approx(1.0)
+    assert mean_graph[1][1] == pytest.approx(3.0)
+    assert count_graph[1][2] == pytest.approx(2.0)
+    assert mean_graph[1][2] == pytest.approx(2.0)
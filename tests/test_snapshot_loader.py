@@ -0,0 +1,98 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.utils.preprocess import save_edgelist, save_snapshot_pack, load_snapshot_edgelists, get_snapshot_matrices
+
+
+def random_snapshots(seed, num_snapshots=6, columns=("source", "target", "weight")):
+    rng = random.Random(seed)
+    snapshots = []
+    for snapshot in range(num_snapshots):
+        # Snapshot 2 has no edges
+        num_edges = 0 if snapshot == 2 else rng.randint(1, 15)
+        edges = []
+        for _ in range(num_edges):
+            edge = [rng.randrange(10), rng.randrange(10)]
+            if "relation" in columns:
+                edge.append(rng.choice(["reply", "mention"]))
+            edge.append(rng.random() * 4)
+            edges.append(tuple(edge))
+        snapshots.append(edges)
+    return snapshots
+
+
+def save_csv_snapshots(snapshots, columns, output_dir):
+    for snapshot, edges in enumerate(snapshots):
+        save_edgelist(edges, columns, os.path.join(output_dir, "snapshot-%d.csv" % snapshot))
+
+
+def loaded_snapshots(header, columns):
+    names = header["columns"]
+    offsets = header["snapshot_offsets"]
+    assert columns["snapshot"].tolist() == np.repeat(np.arange(header["num_snapshots"]), np.diff(offsets)).tolist()
+    rows = list(zip(*(columns[name].tolist() for name in names)))
+    return [rows[offsets[snapshot]:offsets[snapshot + 1]] for snapshot in range(header["num_snapshots"])]
+
+
+def assert_same_snapshots(expected, actual):
+    assert len(expected) == len(actual)
+    for expected_edges, actual_edges in zip(expected, actual):
+        assert len(expected_edges) == len(actual_edges)
+        for expected_edge, actual_edge in zip(expected_edges, actual_edges):
+            assert expected_edge[:-1] == actual_edge[:-1]
+            assert actual_edge[-1] == pytest.approx(expected_edge[-1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("columns", [("source", "target", "weight"), ("source", "target", "relation", "weight")])
+def test_csv_snapshot_directory_round_trip(tmp_path, workers, columns):
+    snapshots = random_snapshots(0, columns=columns)
+    save_csv_snapshots(snapshots, columns, str(tmp_path))
+    header, loaded = load_snapshot_edgelists(str(tmp_path), workers=workers)
+    assert header["num_snapshots"] == len(snapshots)
+    assert header["num_edges"] == sum(len(edges) for edges in snapshots)
+    assert loaded["weight"].dtype == np.float64
+    assert_same_snapshots(snapshots, loaded_snapshots(header, loaded))
+
+
+def test_fractional_weights_are_not_truncated(tmp_path):
+    save_csv_snapshots([[(0, 1, 0.25), (1, 2, 3.0)]], ("source", "target", "weight"), str(tmp_path))
+    _, loaded = load_snapshot_edgelists(str(tmp_path))
+    assert loaded["weight"].tolist() == [0.25, 3.0]
+
+
+def test_snapshot_pack_matches_csv_directory(tmp_path):
+    columns = ("source", "target", "relation", "weight")
+    save_csv_snapshots(random_snapshots(1, columns=columns), columns, str(tmp_path))
+    header, loaded = load_snapshot_edgelists(str(tmp_path))
+    pack_path = os.path.join(str(tmp_path), "graph.pack")
+    save_snapshot_pack(loaded, pack_path, num_snapshots=header["num_snapshots"])
+    pack_header, pack_loaded = load_snapshot_edgelists(pack_path)
+    assert pack_header["num_snapshots"] == header["num_snapshots"]
+    assert pack_header["snapshot_offsets"] == header["snapshot_offsets"]
+    assert_same_snapshots(loaded_snapshots(header, loaded), loaded_snapshots(pack_header, pack_loaded))
+
+
+def test_empty_directory_has_no_snapshots(tmp_path):
+    header, loaded = load_snapshot_edgelists(str(tmp_path))
+    assert header["num_snapshots"] == 0
+    assert len(loaded["snapshot"]) == 0
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_snapshot_matrices_match_edges(tmp_path, directed):
+    snapshots = random_snapshots(2)
+    save_csv_snapshots(snapshots, ("source", "target", "weight"), str(tmp_path))
+    header, loaded = load_snapshot_edgelists(str(tmp_path))
+    matrices = get_snapshot_matrices(loaded, header["num_snapshots"], directed=directed)
+    for edges, (matrix, nodes) in zip(snapshots, matrices):
+        assert nodes == sorted(set(node for edge in edges for node in edge[:2]))
+        expected = np.zeros((len(nodes), len(nodes)))
+        for source, target, weight in edges:
+            expected[nodes.index(source), nodes.index(target)] += weight
+        if not directed:
+            expected = np.maximum(expected, expected.T)
+        assert np.allclose(matrix.toarray(), expected)
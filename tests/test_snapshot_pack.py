@@ -0,0 +1,111 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.datastructures import MultiplexGraph
+from wundt.multiview.preprocess import load_snapshot_graph
+from wundt.multiview.utils.preprocess import (SnapshotPackWriter, SnapshotParquetWriter, read_snapshot_pack_header,
+                                              load_snapshot_pack, load_snapshot_edgelists)
+
+COLUMNS = ("source", "target", "relation", "weight")
+
+
+def random_snapshots(seed, num_snapshots=7, nodes=None):
+    rng = random.Random(seed)
+    nodes = nodes if nodes is not None else list(range(12))
+    snapshots = []
+    for snapshot in range(num_snapshots):
+        # Snapshots 0 and 4 have no edges
+        num_edges = 0 if snapshot in [0, 4] else rng.randint(1, 20)
+        snapshots.append([(rng.choice(nodes), rng.choice(nodes), rng.choice(["reply", "mention", "reaction"]), rng.random() * 5)
+                          for _ in range(num_edges)])
+    return snapshots
+
+
+def write_snapshots(writer, snapshots):
+    for snapshot, edges in enumerate(snapshots):
+        writer.add_snapshot(iter(edges), chunk_size=4, start=snapshot * 10.0, end=snapshot * 10.0 + 15.0)
+    writer.close()
+
+
+def split_snapshots(header, columns, indices):
+    rows = list(zip(*(columns[name].tolist() for name in COLUMNS)))
+    return [[row for row, snapshot in zip(rows, columns["snapshot"].tolist()) if snapshot == index] for index in indices]
+
+
+@pytest.mark.parametrize("nodes", [list(range(12)), ["U%02d" % node for node in range(12)]])
+def test_snapshot_pack_round_trip(tmp_path, nodes):
+    snapshots = random_snapshots(0, nodes=nodes)
+    path = os.path.join(str(tmp_path), "graph.pack")
+    write_snapshots(SnapshotPackWriter(path, COLUMNS, header={"graph_type": "multiplex", "directed": True}), snapshots)
+    header = read_snapshot_pack_header(path)
+    assert header["graph_type"] == "multiplex"
+    assert header["num_snapshots"] == len(snapshots)
+    assert header["ranges"] == [{"start": index * 10.0, "end": index * 10.0 + 15.0} for index in range(len(snapshots))]
+    assert np.diff(header["snapshot_offsets"]).tolist() == [len(edges) for edges in snapshots]
+    _, columns = load_snapshot_pack(path)
+    assert split_snapshots(header, columns, range(len(snapshots))) == snapshots
+
+
+@pytest.mark.parametrize("selection", [3, [0], [4, 1], [6, 2, 5], []])
+def test_snapshot_pack_reads_selected_snapshots(tmp_path, selection):
+    snapshots = random_snapshots(1)
+    path = os.path.join(str(tmp_path), "graph.pack")
+    write_snapshots(SnapshotPackWriter(path, COLUMNS), snapshots)
+    header, columns = load_snapshot_pack(path, snapshots=selection)
+    indices = [selection] if isinstance(selection, int) else selection
+    assert columns["snapshot"].tolist() == [index for index in indices for _ in snapshots[index]]
+    assert split_snapshots(header, columns, indices) == [snapshots[index] for index in indices]
+
+
+def test_snapshot_pack_without_edges(tmp_path):
+    path = os.path.join(str(tmp_path), "graph.pack")
+    write_snapshots(SnapshotPackWriter(path, ("source", "target")), [[], []])
+    header, columns = load_snapshot_pack(path)
+    assert header["num_snapshots"] == 2
+    assert len(columns["snapshot"]) == 0 and len(columns["source"]) == 0
+
+
+def test_non_pack_file_is_rejected(tmp_path):
+    path = os.path.join(str(tmp_path), "graph.pack")
+    with open(path, "wb") as output_file:
+        output_file.write(b"source,target\n0,1\n" * 4)
+    with pytest.raises(ValueError):
+        read_snapshot_pack_header(path)
+
+
+def test_snapshot_parquet_matches_snapshot_pack(tmp_path):
+    pytest.importorskip("pyarrow")
+    snapshots = random_snapshots(2)
+    pack_path = os.path.join(str(tmp_path), "graph.pack")
+    parquet_dir = os.path.join(str(tmp_path), "parquet", "graph=reply")
+    write_snapshots(SnapshotPackWriter(pack_path, COLUMNS), snapshots)
+    write_snapshots(SnapshotParquetWriter(parquet_dir, COLUMNS, header={"directed": True}, row_group_size=8), snapshots)
+    pack_header, pack_columns = load_snapshot_edgelists(pack_path)
+    parquet_header, parquet_columns = load_snapshot_edgelists(parquet_dir)
+    assert parquet_header["directed"] is True
+    assert parquet_header["ranges"] == pack_header["ranges"]
+    assert parquet_header["snapshot_offsets"] == pack_header["snapshot_offsets"]
+    indices = range(len(snapshots))
+    assert split_snapshots(parquet_header, parquet_columns, indices) == split_snapshots(pack_header, pack_columns, indices) == snapshots
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_load_snapshot_graph_matches_written_graph(tmp_path, directed):
+    rng = random.Random(3)
+    graphs = []
+    for _ in range(3):
+        graph = MultiplexGraph(directed)
+        graph.add_edges([(rng.randrange(6), rng.randrange(6), rng.choice(["reply", "mention"]), float(rng.randint(1, 4))) for _ in range(15)])
+        graphs.append(graph)
+    path = os.path.join(str(tmp_path), "graph.pack")
+    writer = SnapshotPackWriter(path, graphs[0].get_column_names(), header={"graph_type": "multiplex", "directed": directed})
+    for graph in graphs:
+        writer.add_snapshot(graph.iter_edges(data=True))
+    writer.close()
+    for index, graph in enumerate(graphs):
+        loaded = load_snapshot_graph(path, index)
+        assert isinstance(loaded, MultiplexGraph)
+        assert sorted(loaded.get_edges()) == sorted(graph.get_edges())
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from wundt.multiview.datastructures import TemporalUnweightedGraph
+from wundt.multiview.datastructures.walks import TemporalRandomWalker
+
+
+def random_events(seed, num_nodes=8, num_events=120):
+    rng = random.Random(seed)
+    return [(rng.randrange(num_nodes), rng.randrange(num_nodes), float(rng.randint(0, 50))) for _ in range(num_events)]
+
+
+def assert_time_respecting(walks, times, edges):
+    for walk, walk_times in zip(walks.tolist(), times.tolist()):
+        assert np.isnan(walk_times[0])
+        length = walk.index(-1) if -1 in walk else len(walk)
+        assert all(node == -1 for node in walk[length:])
+        assert all(np.isnan(time) for time in walk_times[length:])
+        for step in range(1, length):
+            assert (walk[step - 1], walk[step], walk_times[step]) in edges
+            if step > 1:
+                assert walk_times[step] >= walk_times[step - 1]
+
+
+@pytest.mark.parametrize("bias", ["uniform", "linear", "exponential"])
+def test_walker_timestamps_are_non_decreasing(bias):
+    events = random_events(0)
+    sources, targets, times = (np.array(column) for column in zip(*events))
+    walker = TemporalRandomWalker(sources, targets, times, 8, bias=bias)
+    walks, walk_times = walker.get_walks(6, num_walks=20, seed=0)
+    assert walks.shape == (160, 6)
+    assert_time_respecting(walks, walk_times, set(events))
+
+
+@pytest.mark.parametrize("bias", ["uniform", "linear", "exponential"])
+@pytest.mark.parametrize("directed", [False, True])
+def test_graph_walks_are_time_respecting(bias, directed):
+    graph = TemporalUnweightedGraph(directed)
+    events = random_events(1)
+    for event in events:
+        graph.add_edge(event)
+    positions = {node: position for position, node in enumerate(graph.get_node_order())}
+    edges = set()
+    for source, target, time in events:
+        edges.add((positions[source], positions[target], time))
+        if not directed:
+            edges.add((positions[target], positions[source], time))
+    for walks, walk_times in graph.temporal_walk_generator(6, num_walks=5, bias=bias, batch_size=16, seed=0):
+        assert_time_respecting(walks, walk_times, edges)
+
+
+@pytest.mark.parametrize("bias,weights", [("uniform", [1.0, 1.0, 1.0]), ("linear", [3.0, 2.0, 1.0]),
+                                          ("exponential", list(np.exp(-np.arange(3.0))))])
+def test_first_step_follows_time_bias(bias, weights):
+    walker = TemporalRandomWalker([0, 0, 0], [1, 2, 3], [0.0, 1.0, 2.0], 4, bias=bias, time_scale=1.0)
+    walks, _ = walker.walk(np.zeros(40000, dtype=np.int32), 2, np.random.default_rng(0))
+    frequencies = np.bincount(walks[:, 1], minlength=4)[1:] / 40000.0
+    assert np.allclose(frequencies, np.array(weights) / sum(weights), atol=0.01)
+
+
+def test_walks_stop_without_later_edges():
+    walker = TemporalRandomWalker([0, 1], [1, 2], [5.0, 3.0], 3)
+    walks, times = walker.walk(np.array([0], dtype=np.int32), 4, np.random.default_rng(0))
+    assert walks.tolist() == [[0, 1, -1, -1]]
+    assert times[0, 1] == 5.0
+
+
+def test_unknown_bias_is_rejected():
+    with pytest.raises(ValueError):
+        TemporalRandomWalker([0], [1], [0.0], 2, bias="quadratic")
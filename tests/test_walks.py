@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from wundt.multiview.datastructures.walks import RandomWalker, build_alias_tables
+
+
+def undirected_matrix(edges, num_nodes):
+    rows = [source for source, target, _ in edges] + [target for source, target, _ in edges]
+    columns = [target for source, target, _ in edges] + [source for source, target, _ in edges]
+    weights = [weight for _, _, weight in edges] * 2
+    return sparse.csr_matrix((weights, (rows, columns)), shape=(num_nodes, num_nodes))
+
+
+def frequencies(values, num_nodes):
+    return np.bincount(values, minlength=num_nodes) / float(len(values))
+
+
+@pytest.mark.parametrize("weights", [[1.0, 3.0], [1.0, 2.0, 7.0], [5.0, 1.0, 1.0, 1.0, 2.0], [2.0, 2.0, 2.0]])
+def test_first_order_steps_follow_edge_weights(weights):
+    matrix = sparse.csr_matrix((weights, ([0] * len(weights), list(range(1, len(weights) + 1)))), shape=(len(weights) + 1,) * 2)
+    walker = RandomWalker(matrix)
+    walks = walker.walk(np.zeros(40000, dtype=np.int32), 2, np.random.default_rng(0))
+    expected = np.concatenate([[0.0], np.array(weights) / sum(weights)])
+    assert np.allclose(frequencies(walks[:, 1], len(weights) + 1), expected, atol=0.01)
+
+
+def test_unweighted_steps_are_uniform():
+    matrix = sparse.csr_matrix(([1.0, 9.0], ([0, 0], [1, 2])), shape=(3, 3))
+    walks = RandomWalker(matrix, weighted=False).walk(np.zeros(40000, dtype=np.int32), 2, np.random.default_rng(0))
+    assert np.allclose(frequencies(walks[:, 1], 3), [0.0, 0.5, 0.5], atol=0.01)
+
+
+@pytest.mark.parametrize("p,q", [(0.5, 2.0), (4.0, 0.25), (1.0, 3.0)])
+def test_second_order_steps_follow_node2vec_bias(p, q):
+    # After stepping 0 -> 1 the walk may return to 0(bias 1/p), move to 2 which is a neighbor of 0(bias 1) or move
+    # away to 3(bias 1/q); edge weights multiply the biases
+    matrix = undirected_matrix([(0, 1, 1.0), (1, 2, 2.0), (0, 2, 1.0), (1, 3, 1.0)], 4)
+    walker = RandomWalker(matrix, p=p, q=q)
+    walks = walker.walk(np.zeros(60000, dtype=np.int32), 3, np.random.default_rng(0))
+    walks = walks[walks[:, 1] == 1]
+    expected = np.array([1.0 / p, 0.0, 2.0, 1.0 / q])
+    assert np.allclose(frequencies(walks[:, 2], 4), expected / expected.sum(), atol=0.015)
+
+
+def test_walks_stop_at_nodes_without_out_edges():
+    matrix = sparse.csr_matrix(([1.0], ([0], [1])), shape=(2, 2))
+    walks = RandomWalker(matrix).walk(np.array([0, 1], dtype=np.int32), 4, np.random.default_rng(0))
+    assert walks.tolist() == [[0, 1, -1, -1], [1, -1, -1, -1]]
+
+
+def test_parallel_walks_cover_every_start_node():
+    matrix = undirected_matrix([(0, 1, 1.0), (1, 2, 1.0), (2, 3, 1.0)], 4)
+    walks = RandomWalker(matrix).get_walks(5, num_walks=3, batch_size=2, seed=0, workers=2)
+    assert walks.shape == (12, 5)
+    assert sorted(walks[:, 0].tolist()) == [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3]
+    assert (walks >= 0).all()
+
+
+def test_negative_weights_are_rejected():
+    with pytest.raises(ValueError):
+        build_alias_tables(np.array([0, 2]), np.array([1.0, -1.0]))
+    matrix = sparse.csr_matrix(([1.0, -2.0], ([0, 0], [1, 2])), shape=(3, 3))
+    with pytest.raises(ValueError):
+        RandomWalker(matrix)
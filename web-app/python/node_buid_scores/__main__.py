@@ -1,37 +1,35 @@
 import argparse
-from tgraphs import datastructures
+from wundt.multiview.social_score import WarmStartedCentrality, get_path_scores
+from wundt.multiview.utils.preprocess import load_snapshot_edgelists, get_snapshot_matrices
 from pydoc import locate
-import networkx as nx
 import os
 from collections import defaultdict
 import json
 
 def build_snapshot_graphs(args):
-    snapshot_index = 0
-    output = {}
-    while os.path.exists(os.path.join(args.graphs_path, "snapshot-%d.csv" % snapshot_index)):
-        snapshot_file_path = os.path.join(args.graphs_path, "snapshot-%d.csv" % snapshot_index)
-        graph_base = None
-        if args.directed:
-            graph_base = nx.DiGraph()
-        else:
-            graph_base = nx.Graph()
-        data_arg = False
-        if args.graph_type == "weighted" or args.graph_type == "multiplex":
-            data_arg = {"wieght":args.weight_type}
-        with open(snapshot_file_path, "rb") as graph_file:
-            next(graph_file)
-            snapshot_graph = nx.read_edgelist(graph_file, delimiter=",", create_using=graph_base, nodetype=int, data=data_arg)
-            output[snapshot_index] = snapshot_graph
-        snapshot_index += 1
-        
-    return output, snapshot_index
+    # All snapshot-%d.csv files(or a snapshot pack file) are loaded at once and turned into sparse matrices
+    header, columns = load_snapshot_edgelists(args.graphs_path, workers=args.workers)
+    # Weights are kept as float64: snapshots of weight_is_list graphs hold mean weights
+    weighted = args.graph_type == "weighted" or args.graph_type == "multiplex"
+    output = get_snapshot_matrices(columns, header["num_snapshots"], directed=args.directed, weighted=weighted)
+    return output, header["num_snapshots"]
+def get_scoring_mode(args):
+    mode = "sampled" if args.sample_size is not None or args.epsilon is not None else "exact"
+    return {"betweenness_closeness": mode, "workers": args.workers, "sample_size": args.sample_size,
+            "epsilon": args.epsilon, "delta": args.delta, "seed": args.seed, "eigenvector_centrality": "warm_started"}
 def get_temporal_node_bc_scores(args, snapshot_graphs, num_graphs,all_nodes):
     output =defaultdict(lambda: defaultdict(list))
+    snapshot_matrices = [snapshot_graphs[i][0] for i in range(num_graphs)]
+    snapshot_nodes = [snapshot_graphs[i][1] for i in range(num_graphs)]
+    # Sources of all snapshots are split across args.workers processes, or sampled with --sample_size/--epsilon
+    path_scores = get_path_scores(snapshot_matrices, directed=args.directed, weighted=args.weighted, sample_size=args.sample_size,
+                                  epsilon=args.epsilon, delta=args.delta, workers=args.workers, seed=args.seed)
+    # Eigenvector centrality of every snapshot starts from the scores of the previous one
+    evc = WarmStartedCentrality("eigenvector_centrality", {"weighted": args.weighted, "max_iter": args.max_iter})
     for i in range(num_graphs):
-        current_bc_scores = nx.algorithms.centrality.betweenness_centrality(snapshot_graphs[i], weight=args.weighted)
-        current_cc_scores = nx.algorithms.centrality.closeness_centrality(snapshot_graphs[i])
-        current_evc_scores = nx.algorithms.centrality.eigenvector_centrality(snapshot_graphs[i], weight=args.weighted)
+        current_bc_scores = dict(zip(snapshot_nodes[i], path_scores["betweenness_centrality"][i].tolist()))
+        current_cc_scores = dict(zip(snapshot_nodes[i], path_scores["closeness_centrality"][i].tolist()))
+        current_evc_scores = dict(zip(snapshot_nodes[i], evc.update(snapshot_matrices[i], snapshot_nodes[i])["eigenvector_centrality"].tolist()))
         for node in all_nodes:
             if node in current_bc_scores:
                 output["betweenness_centrality"][node].append(current_bc_scores[node])
@@ -41,6 +39,7 @@ def get_temporal_node_bc_scores(args, snapshot_graphs, num_graphs,all_nodes):
                 output["betweenness_centrality"][node].append(0.0)
                 output["closeness_centrality"][node].append(0.0)
                 output["eigenvector_centrality"][node].append(0.0)
+    evc.print_summary()
                 
     return output
 
@@ -48,8 +47,8 @@ def get_temporal_node_bc_scores(args, snapshot_graphs, num_graphs,all_nodes):
 def main(args):
     all_nodes = set()
     s_graphs, num_graphs = build_snapshot_graphs(args)
-    for graph in s_graphs:
-        all_nodes = all_nodes.union(set(s_graphs[graph].nodes))
+    for _, nodes in s_graphs:
+        all_nodes = all_nodes.union(set(nodes))
     node_scores = get_temporal_node_bc_scores(args, s_graphs, num_graphs, all_nodes)
 
 
@@ -60,10 +59,13 @@ def main(args):
         output[centrality]={}
         for node in node_scores[centrality]:
             output[centrality][node] = node_scores[centrality][node]
+    output["mode"] = get_scoring_mode(args)
     graphs_path = args.graphs_path
     if graphs_path[-1] == "/":
         graphs_path = graphs_path[:-1]
     _, folder = os.path.split(graphs_path)
+    if os.path.isfile(graphs_path):
+        folder = os.path.splitext(folder)[0]
     with open(os.path.join(args.output_dir, folder + ".json"), "w+") as output_file:
         json.dump(output, output_file)
 
@@ -71,10 +73,17 @@ if __name__=='__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-g', '--graphs_path', required=True, type=str)
     parser.add_argument('-t', '--graph_type', required=True, choices=["unweighted", "weighted", "multiplex"])
-    parser.add_argument('-r', '--weight_type', default=int, type=locate, choices=[int, float])
+    # Kept for old command lines, snapshot weights are always loaded as float
+    parser.add_argument('-r', '--weight_type', default=float, type=locate, choices=[int, float])
     parser.add_argument('-d', '--directed', action='store_true')
     parser.add_argument('-w', '--weighted', action='store_true')
     parser.add_argument('-o', '--output_dir', required=True)
+    parser.add_argument('-j', '--workers', default=1, type=int)
+    parser.add_argument('-k', '--sample_size', default=None, type=int)
+    parser.add_argument('-e', '--epsilon', default=None, type=float)
+    parser.add_argument('--delta', default=0.1, type=float)
+    parser.add_argument('-s', '--seed', default=None, type=int)
+    parser.add_argument('-m', '--max_iter', default=100, type=int)
 
     
     
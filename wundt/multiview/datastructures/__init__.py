@@ -1,2 +1,6 @@
 from .graphs import UnweightedGraph, WeightedGraph, MultiplexGraph
-from .temporal import TemporalUnweightedGraph, TemporalWeightedGraph, TemporalMultiplexGraph
\ No newline at end of file
+from .temporal import TemporalUnweightedGraph, TemporalWeightedGraph, TemporalMultiplexGraph
+from .compact import CompactUnweightedGraph, CompactWeightedGraph, CompactMultiplexGraph
+from .weights import WeightAggregate
+from .nodes import NodeDictionary
+from .walks import RandomWalker, MultiplexRandomWalker, TemporalRandomWalker, save_walks
@@ -0,0 +1,770 @@
+"""
+Compact, array-backed counterparts of the graphs in graphs.py: nodes are int32 ids and edges are CSR arrays(one
+set per layer for multiplex graphs). Call freeze() on a built graph to get its compact form.
+"""
+import numpy as np
+import pandas as pd
+from .graphs import UnweightedGraph, WeightedGraph, MultiplexGraph
+from .weights import WeightAggregate
+from .sparse import get_positions, build_sparse
+from .walks import MultiplexRandomWalker
+
+
+class CSRAdjacency(object):
+    """Adjacency of a single graph layer in compressed sparse row form.
+
+    The neighbors of node i are indices[indptr[i]:indptr[i + 1]], sorted in increasing order, and their edge weights
+    are found at the same positions of weights. counts holds the number of raw weights aggregated into each edge,
+    which is what graphs with weight_is_list need to compute means.
+    """
+    def __init__(self, indptr, indices, weights, counts):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.counts = counts
+        self._keys = None
+
+    @classmethod
+    def empty(cls, num_nodes):
+        return cls(np.zeros(num_nodes + 1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, num_nodes, sources, targets, weights, counts):
+        """Builds adjacency from edge arrays. Duplicate (source, target) pairs are merged by summing their weights
+        and counts.
+
+        Arguments:
+            num_nodes {int} -- Number of rows of the adjacency
+            sources {numpy.ndarray} -- Source node ids
+            targets {numpy.ndarray} -- Target node ids
+            weights {numpy.ndarray} -- Edge weights
+            counts {numpy.ndarray} -- Number of raw weights behind each edge weight
+
+        Returns:
+            CSRAdjacency -- Adjacency holding the given edges
+        """
+        if len(sources) == 0:
+            return cls.empty(num_nodes)
+        order = np.lexsort((targets, sources))
+        sources = sources[order]
+        targets = targets[order]
+        keys = sources.astype(np.int64) * num_nodes + targets
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources[starts], minlength=num_nodes), out=indptr[1:])
+        return cls(
+            indptr,
+            targets[starts].astype(np.int32),
+            np.add.reduceat(weights[order].astype(np.float64), starts),
+            np.add.reduceat(counts[order].astype(np.int64), starts))
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def row_ids(self):
+        """Returns source node id of every stored edge, aligned with indices.
+        """
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+
+    def resize(self, num_nodes):
+        """Returns adjacency with num_nodes rows. Nodes added since this adjacency was built get empty rows.
+        """
+        if num_nodes == self.num_nodes:
+            return self
+        indptr = np.concatenate((self.indptr, np.full(num_nodes - self.num_nodes, self.indptr[-1], dtype=np.int64)))
+        return CSRAdjacency(indptr, self.indices, self.weights, self.counts)
+
+    def neighbors(self, node_id):
+        return self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def find(self, sources, targets):
+        """Returns the positions of the given edges in indices, or -1 for edges that are not stored.
+
+        Arguments:
+            sources {numpy.ndarray} -- Source node ids
+            targets {numpy.ndarray} -- Target node ids
+
+        Returns:
+            numpy.ndarray -- Position of every edge
+        """
+        if self._keys is None:
+            self._keys = self.row_ids().astype(np.int64) * self.num_nodes + self.indices
+        queries = np.asarray(sources, dtype=np.int64) * self.num_nodes + np.asarray(targets, dtype=np.int64)
+        positions = np.searchsorted(self._keys, queries)
+        found = positions < len(self._keys)
+        found[found] = self._keys[positions[found]] == queries[found]
+        return np.where(found, positions, -1)
+
+    def transpose(self):
+        return CSRAdjacency.from_arrays(self.num_nodes, self.indices, self.row_ids(), self.weights, self.counts)
+
+    def merge(self, sources, targets, weights, counts):
+        """Returns adjacency holding the edges of this adjacency and the given edges.
+        """
+        return CSRAdjacency.from_arrays(
+            self.num_nodes,
+            np.concatenate((self.row_ids(), sources)),
+            np.concatenate((self.indices, targets)),
+            np.concatenate((self.weights, weights)),
+            np.concatenate((self.counts, counts)))
+
+    def copy(self):
+        return CSRAdjacency(self.indptr.copy(), self.indices.copy(), self.weights.copy(), self.counts.copy())
+
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes + self.counts.nbytes
+
+
+class CompactGraph(object):
+    """Parent class of array-backed graphs. Edges added with add_edge/add_edges are buffered and merged into the
+    CSR arrays the next time the graph is queried, so adding edges in large batches is much cheaper than adding
+    them one at a time.
+    """
+    def __init__(self, directed, weight_is_list=False):
+        """Initializes CompactGraph object.
+
+        Arguments:
+            directed {bool} -- True if graph is directed
+
+        Keyword Arguments:
+            weight_is_list {bool} -- True if edge weight is the mean of all weights added to the edge (default: {False})
+        """
+        self.directed = directed
+        self.weight_is_list = weight_is_list
+        self._node_list = []
+        self._node_index = {}
+        self._pending = []
+        self.node_dictionary = None
+
+    def _intern(self, node):
+        node_id = self._node_index.get(node)
+        if node_id is None:
+            node_id = len(self._node_list)
+            self._node_index[node] = node_id
+            self._node_list.append(node)
+        return node_id
+
+    def _parse_weight(self, data):
+        if type(data) == dict:
+            data = data["weight"]
+        if type(data) == list:
+            return float(np.sum(data)), len(data)
+        if type(data) == WeightAggregate:
+            return data.sum, data.count
+        return data, 1
+
+    def _append(self, columns, mirror):
+        """Buffers edges given as dict of column arrays. If mirror is True the reverse of every edge is buffered
+        as well, which is how undirected graphs store their edges.
+        """
+        if mirror:
+            columns = dict(columns)
+            sources, targets = columns["source"], columns["target"]
+            for name in columns:
+                columns[name] = np.concatenate((columns[name], columns[name]))
+            columns["source"] = np.concatenate((sources, targets))
+            columns["target"] = np.concatenate((targets, sources))
+        self._pending.append(columns)
+
+    def _take_pending(self):
+        columns = {}
+        for name in self._pending[0]:
+            columns[name] = np.concatenate([chunk[name] for chunk in self._pending])
+        self._pending = []
+        return columns
+
+    def _intern_array(self, nodes):
+        codes, uniques = pd.factorize(np.asarray(nodes))
+        node_ids = np.fromiter((self._intern(node) for node in uniques.tolist()), dtype=np.int32, count=len(uniques))
+        return node_ids[codes]
+
+    def add_node(self, node):
+        self._intern(node)
+
+    def add_nodes(self, nodes):
+        for node in nodes:
+            self._intern(node)
+
+    def add_edge(self, edge):
+        self.add_edges([edge])
+
+    def get_node_id(self, node):
+        """Returns the int id of a node of this graph.
+
+        Arguments:
+            node {str, int} -- A node in this graph
+
+        Returns:
+            int -- Position of the node in the node arrays
+        """
+        return self._node_index[node]
+
+    def get_node(self, node_id):
+        return self._node_list[node_id]
+
+    def get_nodes(self):
+        return set(self._node_list)
+
+    def get_node_list(self):
+        """Returns nodes of this graph ordered by their int id
+        """
+        return self._node_list
+
+    def contains_node(self, node):
+        return node in self._node_index
+
+    def freeze(self):
+        """Merges buffered edges into the CSR arrays.
+
+        Returns:
+            CompactGraph -- This graph
+        """
+        if len(self._pending) > 0:
+            self._merge(self._take_pending())
+        return self
+
+    def _weight_value(self, weights, counts, sum_weights):
+        if self.weight_is_list and not sum_weights:
+            return weights / counts
+        return weights
+
+    def _iter_adjacency(self, adjacency, relation, data, sum_weights, block_size=65536):
+        """Yields the edges of a CSR adjacency as tuples, converting block_size edges at a time so that only one
+        block of Python objects is alive at once.
+        """
+        nodes = np.empty(len(self._node_list), dtype=object)
+        nodes[:] = self._node_list
+        row_ids = adjacency.row_ids()
+        for start in range(0, len(adjacency.indices), block_size):
+            end = start + block_size
+            columns = [nodes[row_ids[start:end]].tolist(), nodes[adjacency.indices[start:end]].tolist()]
+            if relation is not None:
+                columns.append([relation] * len(columns[0]))
+            if data:
+                weights = self._weight_value(adjacency.weights[start:end], adjacency.counts[start:end], sum_weights)
+                if relation is not None:
+                    columns.append([{"weight": weight} for weight in weights.tolist()])
+                else:
+                    columns.append(weights.tolist())
+            for edge in zip(*columns):
+                yield edge
+
+    def get_node_order(self, nodes=None):
+        """Returns the nodes labelling the rows and columns of the matrices returned by to_sparse. Unless this graph
+        has a node dictionary(see sparse.py) the default order is the id order of this graph, for which the CSR
+        arrays are exported without copying them.
+
+        Keyword Arguments:
+            nodes {list} -- Explicit node order, returned as is (default: {None})
+
+        Returns:
+            list, range -- Node order
+        """
+        if nodes is not None:
+            return nodes if isinstance(nodes, range) or nodes is self._node_list else list(nodes)
+        if self.node_dictionary is not None:
+            return range(len(self.node_dictionary))
+        return self._node_list
+
+    def _adjacency_data(self, adjacency, sum_weights):
+        return self._weight_value(adjacency.weights, adjacency.counts, sum_weights)
+
+    def _adjacencies_to_sparse(self, adjacencies, format, node_order, sum_weights):
+        if len(adjacencies) == 1 and node_order is self._node_list:
+            from scipy import sparse
+            adjacency = adjacencies[0]
+            matrix = sparse.csr_matrix((self._adjacency_data(adjacency, sum_weights), adjacency.indices, adjacency.indptr), shape=(adjacency.num_nodes, adjacency.num_nodes))
+            return matrix if format == "csr" else matrix.asformat(format)
+        positions = get_positions(node_order, self._node_list)
+        rows = [positions[adjacency.row_ids()] for adjacency in adjacencies]
+        columns = [positions[adjacency.indices] for adjacency in adjacencies]
+        data = [self._adjacency_data(adjacency, sum_weights) for adjacency in adjacencies]
+        if len(adjacencies) == 0:
+            rows, columns, data = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], [np.zeros(0)]
+        return build_sparse(np.concatenate(rows), np.concatenate(columns), np.concatenate(data), len(node_order), format)
+
+    def copy(self, deep=False):
+        if not deep:
+            return self
+        self.freeze()
+        output = self.__class__(self.directed, self.weight_is_list)
+        output.node_dictionary = self.node_dictionary
+        output._node_list = list(self._node_list)
+        output._node_index = dict(self._node_index)
+        output._copy_adjacency(self)
+        return output
+
+    def nbytes(self):
+        """Returns number of bytes used by the edge arrays of this graph
+        """
+        self.freeze()
+        return sum(adjacency.nbytes() for adjacency in self._adjacencies())
+
+    def get_neighbors(self, node, include_incoming_connection=True):
+        """Returns nodes which share common edge with the given node
+        """
+        if node not in self._node_index:
+            return set()
+        node_ids = self.get_neighbor_ids(self._node_index[node], include_incoming_connection)
+        return set(self._node_list[i] for i in node_ids)
+
+    def get_neighbor_ids(self, node_id, include_incoming_connection=True):
+        """Returns int ids of the nodes which share common edge with the node with the given id
+
+        Arguments:
+            node_id {int} -- Id of a node in this graph
+
+        Returns:
+            numpy.ndarray -- Sorted ids of the neighbors
+        """
+        self.freeze()
+        output = [adjacency.neighbors(node_id) for adjacency in self._adjacencies()]
+        if include_incoming_connection and self.directed:
+            output.extend(adjacency.neighbors(node_id) for adjacency in self._reverse_adjacencies())
+        return np.unique(np.concatenate(output)) if len(output) > 0 else np.zeros(0, dtype=np.int32)
+
+    def get_predecessors(self, node):
+        """Returns nodes which have edge towards the given node
+        """
+        if node not in self._node_index:
+            return set()
+        if not self.directed:
+            return self.get_neighbors(node, include_incoming_connection=False)
+        self.freeze()
+        node_id = self._node_index[node]
+        return set(self._node_list[i] for adjacency in self._reverse_adjacencies() for i in adjacency.neighbors(node_id))
+
+    def out_degree(self, node):
+        if node not in self._node_index:
+            return 0
+        return len(self.get_neighbor_ids(self._node_index[node], include_incoming_connection=False))
+
+    def in_degree(self, node):
+        return len(self.get_predecessors(node))
+
+    def get_column_names(self):
+        return self.dict_class().get_column_names()
+
+    def get_edgelist(self, data=True, sum_weights=False):
+        return self.get_edges(data=data, sum_weights=sum_weights)
+
+    def iter_edgelist(self, data=True, sum_weights=False):
+        return self.iter_edges(data=data, sum_weights=sum_weights)
+
+    def to_visjs_format(self):
+        return self.thaw().to_visjs_format()
+
+    def get_graph_type(self):
+        return self.dict_class().get_graph_type()
+
+    def dict_class(self):
+        raise NotImplementedError("Not implemented")
+
+    def thaw(self):
+        """Returns the dict based (mutable) form of this graph. Graphs with weight_is_list get the mean weight of
+        every edge as its only list item.
+        """
+        raise NotImplementedError("Not implemented")
+
+
+class CompactWeightedGraph(CompactGraph):
+    def __init__(self, directed=False, weight_is_list=False):
+        super(CompactWeightedGraph, self).__init__(directed, weight_is_list)
+        self._adjacency = CSRAdjacency.empty(0)
+        self._reverse = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds compact graph from a WeightedGraph or an UnweightedGraph.
+
+        Arguments:
+            graph {WeightedGraph} -- Dict based graph
+
+        Returns:
+            CompactWeightedGraph -- Compact form of the given graph
+        """
+        output = cls(graph.directed, getattr(graph, "weight_is_list", False))
+        output.node_dictionary = getattr(graph, "node_dictionary", None)
+        output.add_nodes(graph.get_nodes())
+        sources, targets, weights, counts = [], [], [], []
+        for source in graph:
+            source_id = output._intern(source)
+            for target in graph[source]:
+                if isinstance(graph[source], set):
+                    weight, count = 1.0, 1
+                else:
+                    weight, count = output._parse_weight(graph[source][target])
+                sources.append(source_id)
+                targets.append(output._intern(target))
+                weights.append(weight)
+                counts.append(count)
+        output._append(output._columns(sources, targets, weights, counts), mirror=False)
+        return output.freeze()
+
+    def _columns(self, sources, targets, weights, counts):
+        return {
+            "source": np.asarray(sources, dtype=np.int32),
+            "target": np.asarray(targets, dtype=np.int32),
+            "weight": np.asarray(weights, dtype=np.float64),
+            "count": np.asarray(counts, dtype=np.int64)
+        }
+
+    def _merge(self, columns):
+        self._adjacency = self._adjacency.resize(len(self._node_list)).merge(columns["source"], columns["target"], columns["weight"], columns["count"])
+        self._reverse = None
+
+    def _adjacencies(self):
+        self._adjacency = self._adjacency.resize(len(self._node_list))
+        return [self._adjacency]
+
+    def _reverse_adjacencies(self):
+        if self._reverse is None:
+            self._reverse = self._adjacencies()[0].transpose()
+        self._reverse = self._reverse.resize(len(self._node_list))
+        return [self._reverse]
+
+    def _copy_adjacency(self, other):
+        self._adjacency = other._adjacency.copy()
+        self._reverse = other._reverse.copy() if other._reverse is not None else None
+
+    def get_adjacency(self):
+        """Returns the CSR arrays of this graph.
+
+        Returns:
+            CSRAdjacency -- Adjacency with indptr, indices, weights and counts arrays
+        """
+        self.freeze()
+        return self._adjacencies()[0]
+
+    def add_edges(self, edges):
+        sources, targets, weights, counts = [], [], [], []
+        for edge in edges:
+            if len(edge) == 2:
+                source, target = edge
+                weight, count = 1.0, 1
+            else:
+                source, target, data = edge
+                weight, count = self._parse_weight(data)
+            sources.append(self._intern(source))
+            targets.append(self._intern(target))
+            weights.append(weight)
+            counts.append(count)
+        if len(sources) > 0:
+            self._append(self._columns(sources, targets, weights, counts), mirror=not self.directed)
+
+    def add_edges_from_arrays(self, sources, targets, relations=None, timestamps=None, weights=None):
+        """Adds edges given as columns. Duplicate edges are merged when the CSR arrays are rebuilt.
+        """
+        if len(sources) == 0:
+            return
+        weights = np.ones(len(sources)) if weights is None else weights
+        self._append(self._columns(self._intern_array(sources), self._intern_array(targets), weights, np.ones(len(sources))), mirror=not self.directed)
+
+    @classmethod
+    def from_dataframe(cls, df, directed=False, columns=None, **kwargs):
+        """Creates graph from edges stored in DataFrame columns(source, target and optionally weight).
+        """
+        columns = columns or {}
+        output = cls(directed=directed, **kwargs)
+        weight_column = columns.get("weight", "weight")
+        output.add_edges_from_arrays(
+            df[columns.get("source", "source")].to_numpy(),
+            df[columns.get("target", "target")].to_numpy(),
+            weights=df[weight_column].to_numpy() if weight_column in df else None)
+        return output.freeze()
+
+    def get_edges(self, data=True, sum_weights=False):
+        return list(self.iter_edges(data, sum_weights))
+
+    def iter_edges(self, data=True, sum_weights=False):
+        return self._iter_adjacency(self.get_adjacency(), None, data, sum_weights)
+
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False):
+        """Returns weighted adjacency matrix of this graph as SciPy sparse matrix, see Graph.to_sparse. With the
+        default node order the CSR matrix shares the index arrays of this graph.
+        """
+        return self._adjacencies_to_sparse([self.get_adjacency()], format, self.get_node_order(nodes), sum_weights)
+
+    def contains_edge(self, edge):
+        source, target = edge[:2]
+        if source not in self._node_index or target not in self._node_index:
+            return False
+        source_id, target_id = self._node_index[source], self._node_index[target]
+        adjacency = self.get_adjacency()
+        if adjacency.find([source_id], [target_id])[0] >= 0:
+            return True
+        return not self.directed and adjacency.find([target_id], [source_id])[0] >= 0
+
+    def get_weight(self, source, target, sum_weights=False):
+        """Returns weight of an edge, or None if the edge does not exist.
+        """
+        adjacency = self.get_adjacency()
+        position = adjacency.find([self._node_index[source]], [self._node_index[target]])[0]
+        if position < 0:
+            return None
+        return float(self._weight_value(adjacency.weights[position], adjacency.counts[position], sum_weights))
+
+    def dict_class(self):
+        return WeightedGraph
+
+    def thaw(self):
+        output = WeightedGraph(self.directed, self.weight_is_list)
+        output.node_dictionary = self.node_dictionary
+        output.add_nodes(self._node_list)
+        adjacency = self.get_adjacency()
+        weights = self._weight_value(adjacency.weights, adjacency.counts, False).tolist()
+        for source, target, weight in zip(adjacency.row_ids().tolist(), adjacency.indices.tolist(), weights):
+            if self.weight_is_list:
+                output[self._node_list[source]][self._node_list[target]].append(weight)
+            else:
+                output[self._node_list[source]][self._node_list[target]] = weight
+            output._index_edge(self._node_list[source], self._node_list[target])
+        return output
+
+
+class CompactUnweightedGraph(CompactWeightedGraph):
+    def __init__(self, directed=False, weight_is_list=False):
+        super(CompactUnweightedGraph, self).__init__(directed, False)
+
+    def get_edges(self, data=False, sum_weights=False):
+        return super(CompactUnweightedGraph, self).get_edges(data=False)
+
+    def iter_edges(self, data=False, sum_weights=False):
+        return super(CompactUnweightedGraph, self).iter_edges(data=False)
+
+    def _adjacency_data(self, adjacency, sum_weights):
+        return np.ones(adjacency.num_edges, dtype=np.float64)
+
+    def dict_class(self):
+        return UnweightedGraph
+
+    def thaw(self):
+        output = UnweightedGraph(self.directed)
+        output.node_dictionary = self.node_dictionary
+        output.add_nodes(self._node_list)
+        adjacency = self.get_adjacency()
+        for source, target in zip(adjacency.row_ids().tolist(), adjacency.indices.tolist()):
+            output[self._node_list[source]].add(self._node_list[target])
+            output._index_edge(self._node_list[source], self._node_list[target])
+        return output
+
+
+class CompactMultiplexGraph(CompactGraph):
+    def __init__(self, directed=False, weight_is_list=False):
+        """Array-backed multiplex graph. Each relation(layer) has its own CSR arrays over the shared node ids.
+        """
+        super(CompactMultiplexGraph, self).__init__(directed, weight_is_list)
+        self._layers = {}
+        self._reverse_layers = {}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds compact graph from a MultiplexGraph.
+
+        Arguments:
+            graph {MultiplexGraph} -- Dict based multiplex graph
+
+        Returns:
+            CompactMultiplexGraph -- Compact form of the given graph
+        """
+        output = cls(graph.directed, graph.weight_is_list)
+        output.node_dictionary = getattr(graph, "node_dictionary", None)
+        output.add_nodes(graph.get_nodes())
+        sources, targets, relations, weights, counts = [], [], [], [], []
+        for source in graph:
+            source_id = output._intern(source)
+            for target in graph[source]:
+                target_id = output._intern(target)
+                for relation in graph[source][target]:
+                    weight, count = output._parse_weight(graph[source][target][relation])
+                    sources.append(source_id)
+                    targets.append(target_id)
+                    relations.append(relation)
+                    weights.append(weight)
+                    counts.append(count)
+        output._append(output._columns(sources, targets, relations, weights, counts), mirror=False)
+        return output.freeze()
+
+    def _columns(self, sources, targets, relations, weights, counts):
+        return {
+            "source": np.asarray(sources, dtype=np.int32),
+            "target": np.asarray(targets, dtype=np.int32),
+            "relation": np.asarray(relations, dtype=object),
+            "weight": np.asarray(weights, dtype=np.float64),
+            "count": np.asarray(counts, dtype=np.int64)
+        }
+
+    def _merge(self, columns):
+        num_nodes = len(self._node_list)
+        relations = columns["relation"]
+        for relation in dict.fromkeys(relations.tolist()):
+            mask = relations == relation
+            layer = self._layers.get(relation, CSRAdjacency.empty(num_nodes)).resize(num_nodes)
+            self._layers[relation] = layer.merge(columns["source"][mask], columns["target"][mask], columns["weight"][mask], columns["count"][mask])
+        self._reverse_layers = {}
+
+    def _adjacencies(self):
+        num_nodes = len(self._node_list)
+        for relation in self._layers:
+            self._layers[relation] = self._layers[relation].resize(num_nodes)
+        return list(self._layers.values())
+
+    def _reverse_adjacencies(self):
+        for relation, layer in zip(self._layers, self._adjacencies()):
+            if relation not in self._reverse_layers:
+                self._reverse_layers[relation] = layer.transpose()
+            self._reverse_layers[relation] = self._reverse_layers[relation].resize(len(self._node_list))
+        return list(self._reverse_layers.values())
+
+    def _copy_adjacency(self, other):
+        self._layers = {relation: layer.copy() for relation, layer in other._layers.items()}
+        self._reverse_layers = {relation: layer.copy() for relation, layer in other._reverse_layers.items()}
+
+    def get_relations(self):
+        self.freeze()
+        return list(self._layers.keys())
+
+    def get_adjacency(self, layer):
+        """Returns the CSR arrays of a layer of this graph.
+
+        Arguments:
+            layer {str} -- Layer name(relation type)
+
+        Returns:
+            CSRAdjacency -- Adjacency of the layer
+        """
+        self.freeze()
+        self._adjacencies()
+        return self._layers.get(layer, CSRAdjacency.empty(len(self._node_list)))
+
+    def add_edges(self, edges):
+        sources, targets, relations, weights, counts = [], [], [], [], []
+        for edge in edges:
+            source, target, relation, data = edge
+            weight, count = self._parse_weight(data)
+            sources.append(self._intern(source))
+            targets.append(self._intern(target))
+            relations.append(relation)
+            weights.append(weight)
+            counts.append(count)
+        if len(sources) > 0:
+            self._append(self._columns(sources, targets, relations, weights, counts), mirror=not self.directed)
+
+    def add_edges_from_arrays(self, sources, targets, relations=None, timestamps=None, weights=None):
+        """Adds edges given as columns. Duplicate edges are merged when the CSR arrays are rebuilt.
+
+        Raises:
+            ValueError: If relations is None
+        """
+        if relations is None:
+            raise ValueError("Multiplex graphs need the relation of every edge, relations is None")
+        if len(sources) == 0:
+            return
+        weights = np.ones(len(sources)) if weights is None else weights
+        self._append(self._columns(self._intern_array(sources), self._intern_array(targets), relations, weights, np.ones(len(sources))), mirror=not self.directed)
+
+    @classmethod
+    def from_dataframe(cls, df, directed=False, columns=None, **kwargs):
+        """Creates graph from edges stored in DataFrame columns(source, target, relation and optionally weight).
+        """
+        columns = columns or {}
+        output = cls(directed=directed, **kwargs)
+        weight_column = columns.get("weight", "weight")
+        output.add_edges_from_arrays(
+            df[columns.get("source", "source")].to_numpy(),
+            df[columns.get("target", "target")].to_numpy(),
+            relations=df[columns.get("relation", "relation")].to_numpy(),
+            weights=df[weight_column].to_numpy() if weight_column in df else None)
+        return output.freeze()
+
+    def get_edges(self, data=True, sum_weights=False):
+        return list(self.iter_edges(data, sum_weights))
+
+    def iter_edges(self, data=True, sum_weights=False):
+        self.freeze()
+        for relation, layer in zip(self._layers, self._adjacencies()):
+            for edge in self._iter_adjacency(layer, relation, data, sum_weights):
+                yield edge
+
+    def contains_edge(self, edge):
+        source, target, relation = edge[:3]
+        if source not in self._node_index or target not in self._node_index or relation not in self.get_relations():
+            return False
+        source_id, target_id = self._node_index[source], self._node_index[target]
+        layer = self.get_adjacency(relation)
+        if layer.find([source_id], [target_id])[0] >= 0:
+            return True
+        return not self.directed and layer.find([target_id], [source_id])[0] >= 0
+
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False, layer=None, per_layer=False):
+        """Returns weighted adjacency matrix of this graph as SciPy sparse matrix, see MultiplexGraph.to_sparse.
+        Matrices of single layers share the index arrays of this graph when the default node order is used.
+        """
+        node_order = self.get_node_order(nodes)
+        if per_layer:
+            return {relation: self.to_sparse(format, node_order, sum_weights, layer=relation) for relation in self.get_relations()}
+        if layer is not None:
+            return self._adjacencies_to_sparse([self.get_adjacency(layer)], format, node_order, sum_weights)
+        self.freeze()
+        return self._adjacencies_to_sparse(self._adjacencies(), format, node_order, sum_weights)
+
+    def get_multiplex_walker(self, layer_weights=None, switch_probability=0.5, p=1, q=1, nodes=None, weighted=True):
+        """Returns random walker over the layers of this graph, see MultiplexGraph.get_multiplex_walker.
+        """
+        return MultiplexRandomWalker(self.to_sparse(nodes=nodes, per_layer=True), layer_weights, switch_probability, p, q, weighted)
+
+    def multiplex_walk_generator(self, walk_length=5, num_walks=1, layer_weights=None, switch_probability=0.5, p=1, q=1, nodes=None, batch_size=10000, seed=None, workers=1, weighted=True):
+        """Yields cross-layer random walks over this graph in batches, see MultiplexGraph.multiplex_walk_generator.
+        """
+        walker = self.get_multiplex_walker(layer_weights, switch_probability, p, q, nodes, weighted)
+        return walker.iter_walks(walk_length, num_walks, batch_size=batch_size, seed=seed, workers=workers)
+
+    def get_layer(self, layer):
+        """Returns a layer of this graph as a weighted graph. The returned graph shares the CSR arrays of this graph,
+        so no edge data is copied; its node list and index are copies, so nodes or edges added to the layer do not
+        change this graph.
+
+        Arguments:
+            layer {str} -- Layer name(relation type)
+
+        Returns:
+            CompactWeightedGraph -- Weighted graph made from the given layer of this graph
+        """
+        output = CompactWeightedGraph(self.directed, self.weight_is_list)
+        output.node_dictionary = self.node_dictionary
+        output._node_list = list(self._node_list)
+        output._node_index = dict(self._node_index)
+        output._adjacency = self.get_adjacency(layer)
+        return output
+
+    def get_layers(self):
+        """Returns every layer of this graph as a weighted graph, see get_layer.
+
+        Returns:
+            dict -- Maps layer name(relation type) to the CompactWeightedGraph of that layer
+        """
+        return {relation: self.get_layer(relation) for relation in self.get_relations()}
+
+    def dict_class(self):
+        return MultiplexGraph
+
+    def thaw(self):
+        output = MultiplexGraph(self.directed, self.weight_is_list)
+        output.node_dictionary = self.node_dictionary
+        output.add_nodes(self._node_list)
+        for relation in self.get_relations():
+            layer = self.get_adjacency(relation)
+            weights = self._weight_value(layer.weights, layer.counts, False).tolist()
+            for source, target, weight in zip(layer.row_ids().tolist(), layer.indices.tolist(), weights):
+                if self.weight_is_list:
+                    output[self._node_list[source]][self._node_list[target]][relation].append(weight)
+                else:
+                    output[self._node_list[source]][self._node_list[target]][relation] = weight
+                output._index_edge(self._node_list[source], self._node_list[target])
+                output._index_relation(self._node_list[source], self._node_list[target], relation)
+        return output
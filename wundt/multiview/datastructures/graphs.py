@@ -1,6 +1,10 @@
 from collections import defaultdict
 import abc
 import numpy as np
+import pandas as pd
+from .weights import WeightAggregate, weight_mean, weight_sum, weight_to_json, copy_weight
+from .sparse import get_node_order, edges_to_sparse
+from .walks import RandomWalker, MultiplexRandomWalker
 
 class Graph(defaultdict):
     """Parent class of all graphs. This class provides  an interface to all other classes 
@@ -10,18 +14,26 @@ class Graph(defaultdict):
         defaultdict {collections.defaultdict} -- Parent class
     
     """
-    def __init__(self, directed):
+    def __init__(self, directed, index_predecessors=True, node_dictionary=None):
         """Initializes Graph object.
         
         Arguments:
             factory {type} -- Which factory to use as argument to the defaultdict initialization.
             directed {bool} -- True if the layers are directed graphs
+            index_predecessors {bool} -- If true directed graphs keep index of incoming edges, which makes incoming
+                neighbor queries and node removal proportional to node degree instead of graph size.
+            node_dictionary {NodeDictionary} -- If given, nodes of this graph are the int ids of this dictionary,
+                and writers translate them back to node names when the graph is saved.
         
         Returns:
         """
         self.directed = directed
+        self.index_predecessors = index_predecessors
+        self.node_dictionary = node_dictionary
         self.factory = self._get_factory
         self._nodes = set()
+        self._predecessors = defaultdict(set) if directed and index_predecessors else None
+        self._relations = None
         return super(Graph, self).__init__(self.factory)
     @abc.abstractmethod
     def get_column_names(self):
@@ -29,6 +41,14 @@ class Graph(defaultdict):
     @abc.abstractmethod
     def get_edgelist(self, data=True, sum_weights=False):
         raise NotImplementedError("Not implemented")
+    def iter_edgelist(self, data=True, sum_weights=False):
+        """Lazily yields the rows returned by get_edgelist, one tuple per row matching get_column_names.
+        
+        Keyword Arguments:
+            data {bool} -- If true includes edge weights (default: {True})
+            sum_weights {bool} -- If true weights stored as list are summed instead of averaged (default: {False})
+        """
+        return self.iter_edges(data=data, sum_weights=sum_weights)
     @abc.abstractmethod
     def _get_factory(self):
         raise NotImplementedError("Not implemented")
@@ -63,16 +83,166 @@ class Graph(defaultdict):
         """
         for edge in edges:
             self.add_edge(edge)
+    def add_edges_from_arrays(self, sources, targets, relations=None, timestamps=None, weights=None):
+        """Adds edges given as columns. Rows that refer to the same edge are first aggregated with a vectorized
+        group-by(weights are summed, collected into one list for graphs with weight_is_list, or summarized for graphs
+        with aggregate_weights), so the graph
+        storage is touched once per distinct edge instead of once per row. Columns which are not used by this
+        graph type are ignored.
+        
+        Arguments:
+            sources {numpy.ndarray, list} -- Source nodes
+            targets {numpy.ndarray, list} -- Target nodes
+        
+        Keyword Arguments:
+            relations {numpy.ndarray, list} -- Relation of each edge for multiplex graphs (default: {None})
+            timestamps {numpy.ndarray, list} -- Timestamp of each edge for temporal graphs (default: {None})
+            weights {numpy.ndarray, list} -- Weight of each edge for weighted graphs, 1 if not given (default: {None})
+        """
+        given = {"source": sources, "target": targets, "relation": relations, "timestamp": timestamps, "weight": weights}
+        columns = list(self.get_column_names())
+        if "weight" in columns and weights is None:
+            given["weight"] = np.ones(len(sources))
+        for name in columns:
+            if given[name] is None:
+                raise ValueError("Column '%s' is required by %s graph" % (name, self.get_graph_type()))
+        frame = pd.DataFrame({name: given[name] for name in columns})
+        if len(frame) == 0:
+            return
+        key_columns = [name for name in columns if name != "weight"]
+        if "weight" not in columns:
+            grouped = frame.drop_duplicates()
+            values = [None] * len(grouped)
+        elif getattr(self, "aggregate_weights", False):
+            frame["weight_sq"] = frame["weight"] ** 2
+            grouped = frame.groupby(key_columns, sort=False, dropna=False).agg(
+                count=("weight", "count"), total=("weight", "sum"), sumsq=("weight_sq", "sum"),
+                minimum=("weight", "min"), maximum=("weight", "max")).reset_index()
+            values = [WeightAggregate.from_stats(*stats) for stats in zip(grouped["count"].tolist(), grouped["total"].tolist(),
+                      grouped["sumsq"].tolist(), grouped["minimum"].tolist(), grouped["maximum"].tolist())]
+        elif getattr(self, "weight_is_list", False):
+            grouped = frame.groupby(key_columns, sort=False, dropna=False)["weight"].agg(list).reset_index()
+            values = grouped["weight"].tolist()
+        else:
+            grouped = frame.groupby(key_columns, sort=False, dropna=False)["weight"].sum(min_count=1).reset_index()
+            values = grouped["weight"].tolist()
+        keys = list(zip(*[grouped[name].tolist() for name in key_columns]))
+        for key, value in zip(keys, values):
+            self._add_aggregated(key, value)
+            if not self.directed:
+                self._add_aggregated((key[1], key[0]) + key[2:], value)
+        if self._predecessors is not None:
+            for source, target in set(key[:2] for key in keys):
+                self._index_edge(source, target)
+        self.add_nodes(pd.unique(np.concatenate((frame["source"].to_numpy(), frame["target"].to_numpy()))).tolist())
+    def add_edges_from_dataframe(self, df, columns=None):
+        """Adds edges stored in DataFrame columns, see add_edges_from_arrays.
+        
+        Arguments:
+            df {pandas.DataFrame} -- Edges, one per row
+        
+        Keyword Arguments:
+            columns {dict} -- Maps column names of this graph(see get_column_names) to DataFrame column names when they differ (default: {None})
+        """
+        columns = columns or {}
+        arrays = {}
+        for name in ["source", "target", "relation", "timestamp", "weight"]:
+            column = columns.get(name, name)
+            arrays[name] = df[column].to_numpy() if column in df else None
+        self.add_edges_from_arrays(arrays["source"], arrays["target"], relations=arrays["relation"], timestamps=arrays["timestamp"], weights=arrays["weight"])
+    @classmethod
+    def from_dataframe(cls, df, directed=False, columns=None, **kwargs):
+        """Creates graph from edges stored in DataFrame columns.
+        
+        Arguments:
+            df {pandas.DataFrame} -- Edges, one per row
+        
+        Keyword Arguments:
+            directed {bool} -- True if graph is directed (default: {False})
+            columns {dict} -- Maps column names of the graph to DataFrame column names when they differ (default: {None})
+            kwargs -- Other arguments of the graph constructor, e.g. weight_is_list
+        
+        Returns:
+            Graph -- Graph holding the edges of the DataFrame
+        """
+        output = cls(directed=directed, **kwargs)
+        output.add_edges_from_dataframe(df, columns)
+        return output
+    def _add_aggregated(self, key, value):
+        """Adds aggregated weight(sum or list of weights) of an edge to this graph's storage. The key holds the
+        storage levels of the edge in the order of get_column_names, e.g. (source, target, relation, timestamp).
+        """
+        container = self
+        for level in key[:-1]:
+            container = container[level]
+        if isinstance(container, set):
+            container.add(key[-1])
+        elif isinstance(value, (list, WeightAggregate)):
+            container[key[-1]].extend(value)
+        else:
+            container[key[-1]] += value
+        if self._relations is not None:
+            self._relations[key[2]].add((key[0], key[1]))
+    def _index_edge(self, source, target):
+        """Records source as predecessor of target. Should be called by add_edge of implementing classes.
+        """
+        if self._predecessors is not None:
+            self._predecessors[target].add(source)
+    def _unindex_edge(self, source, target):
+        """Removes empty edge container left at self[source][target] by delete_edge and drops source from
+        predecessors of target once no edge between them is left.
+        """
+        container = self.get(source)
+        if isinstance(container, dict) and target in container:
+            value = container[target]
+            if isinstance(value, (dict, set)) and len(value) == 0:
+                container.pop(target)
+        if self._predecessors is not None and (container is None or target not in container):
+            self._predecessors[target].discard(source)
+            if len(self._predecessors[target]) == 0:
+                self._predecessors.pop(target)
+    def _index_relation(self, source, target, relation):
+        """Records that self[source][target] has edge of the given relation. Only multiplex graphs keep this index.
+        """
+        if self._relations is not None:
+            self._relations[relation].add((source, target))
+    def _unindex_relations(self, source, target, relations):
+        """Removes (source, target) from the index of each of the given relations which self[source][target] no
+        longer has.
+        """
+        if self._relations is None:
+            return
+        remaining = self.get(source, {}).get(target, ())
+        for relation in list(relations):
+            if relation not in remaining and relation in self._relations:
+                self._relations[relation].discard((source, target))
+                if len(self._relations[relation]) == 0:
+                    self._relations.pop(relation)
+    def _drop_target(self, source, target):
+        container = self.get(source)
+        if isinstance(container, set):
+            container.discard(target)
+        elif container is not None:
+            return container.pop(target, None)
     def delete_node(self, node):
         """Removes a node from this graph. All edges that are incident to the given node are also get removed.
         
         Arguments:
             node {str, int} -- A node to remove from graph
         """
-        self.pop(node, None)
-        for n in self:
-            if node in self[n]:
-                self.delete_edge((n, node))
+        predecessors = self.get_predecessors(node)
+        targets = self.pop(node, None) or ()
+        for source in predecessors:
+            dropped = self._drop_target(source, node)
+            if dropped:
+                self._unindex_relations(source, node, dropped)
+        if self._relations is not None:
+            for target in targets:
+                self._unindex_relations(node, target, targets[target])
+        if self._predecessors is not None:
+            for target in targets:
+                self._predecessors[target].discard(node)
+            self._predecessors.pop(node, None)
         self._nodes.remove(node)
     def delete_nodes(self, nodes):
         """Removes list of nodes and edges incident to these nodes from this graph.
@@ -113,6 +283,15 @@ class Graph(defaultdict):
             list -- List of edges in this graph
         """
         return
+    @abc.abstractmethod
+    def iter_edges(self, data=True, sum_weights=False):
+        """Lazily yields edges of this graph in the same order and format as get_edges, without building a list.
+        Arguments:
+            data {bool} -- If true includes edge weights
+        Returns:
+            generator -- Generator of edges in this graph
+        """
+        raise NotImplementedError("Not implemented")
     def get_neighbors(self, node, include_incoming_connection=True):
         """Returns nodes which share common edge with the given node
         
@@ -122,12 +301,47 @@ class Graph(defaultdict):
         Returns:
             set -- Set of nodes which share common edge with given node
         """
-        output = set([target for target in self[node]])
+        output = set(self.get(node, ()))
         if include_incoming_connection:
-            for n in self:
-                if node in self[n]:
-                    output.add(n)
+            output.update(self.get_predecessors(node))
         return output
+    def get_predecessors(self, node):
+        """Returns nodes which have edge towards the given node. For undirected graphs these are the neighbors of
+        the node.
+        
+        Arguments:
+            node {str, int} -- A node in this graph
+        
+        Returns:
+            set -- Set of nodes with edge towards the given node
+        """
+        if not self.directed:
+            return set(self.get(node, ()))
+        if self._predecessors is not None:
+            return set(self._predecessors.get(node, ()))
+        return set([n for n in self if node in self[n]])
+    def out_degree(self, node):
+        """Returns number of distinct nodes the given node has edge to
+        
+        Arguments:
+            node {str, int} -- A node in this graph
+        
+        Returns:
+            int -- Out degree of the node
+        """
+        return len(self.get(node, ()))
+    def in_degree(self, node):
+        """Returns number of distinct nodes which have edge towards the given node
+        
+        Arguments:
+            node {str, int} -- A node in this graph
+        
+        Returns:
+            int -- In degree of the node
+        """
+        if self.directed and self._predecessors is not None:
+            return len(self._predecessors.get(node, ()))
+        return len(self.get_predecessors(node))
     def contains_node(self, node):
         """Check if node presents in this graph
         
@@ -149,6 +363,26 @@ class Graph(defaultdict):
             bool -- True if this graph contains the given edge else false
         """
         return ;
+    def _copy_storage(self, output):
+        """Copies edges, nodes and indexes of this graph into output, an empty graph of the same type. The nested
+        containers are duplicated directly, so the copy holds exactly the stored weights(including weight lists) and
+        shares no mutable state with this graph.
+        
+        Arguments:
+            output {Graph} -- Empty graph to copy into
+        
+        Returns:
+            Graph -- output
+        """
+        for source, row in self.items():
+            output[source] = copy_weight(row)
+        output._nodes = set(self._nodes)
+        output.node_dictionary = self.node_dictionary
+        if self._predecessors is not None and output._predecessors is not None:
+            output._predecessors = defaultdict(set, {target: set(sources) for target, sources in self._predecessors.items()})
+        if self._relations is not None:
+            output._relations = defaultdict(set, {relation: set(pairs) for relation, pairs in self._relations.items()})
+        return output
     def copy(self, deep=False):
         """Returns shallow copy of this object
         
@@ -164,6 +398,57 @@ class Graph(defaultdict):
         if not deep:
             return self
         raise NotImplementedError("Not implemented for deep==True")
+    def get_node_order(self, nodes=None):
+        """Returns the nodes labelling the rows and columns of the matrices returned by to_sparse, see sparse.py.
+        
+        Keyword Arguments:
+            nodes {list} -- Explicit node order, returned as is (default: {None})
+        
+        Returns:
+            list, range -- Node ids of the node dictionary if this graph has one, else sorted nodes of this graph
+        """
+        return get_node_order(self, nodes)
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False):
+        """Returns weighted adjacency matrix of this graph as SciPy sparse matrix. Row and column i belong to the
+        i-th node of get_node_order(nodes). Undirected graphs give symmetric matrices.
+        
+        Keyword Arguments:
+            format {str} -- SciPy sparse format, e.g. "csr", "csc" or "coo" (default: {"csr"})
+            nodes {list} -- Node order; edges of nodes which are not in it are left out (default: {None})
+            sum_weights {bool} -- If true weights stored as list are summed instead of averaged (default: {False})
+        
+        Returns:
+            scipy.sparse.spmatrix -- Adjacency matrix
+        """
+        raise NotImplementedError("Not implemented for %s" % self.get_graph_type())
+    def random_walk_generator(self, p=1, q=1, walk_length=5, num_walks=1, nodes=None, batch_size=10000, seed=None, workers=1, weighted=True):
+        """Yields random walks over this graph in batches, see RandomWalker in walks.py. Walks are int32 arrays, one
+        walk per row, whose entries are positions in get_node_order(nodes), so for graphs with a node dictionary they
+        are node ids. p == q == 1 gives DeepWalk walks, other values node2vec walks.
+        
+        Keyword Arguments:
+            p {float} -- Return parameter of node2vec (default: {1})
+            q {float} -- In-out parameter of node2vec (default: {1})
+            walk_length {int} -- Number of nodes of each walk (default: {5})
+            num_walks {int} -- Number of walks started from every node (default: {1})
+            nodes {list} -- Node order (default: {None})
+            batch_size {int} -- Number of walks per yielded array (default: {10000})
+            seed {int} -- Seed of the random number generators (default: {None})
+            workers {int} -- Number of processes generating walks (default: {1})
+            weighted {bool} -- If false edges are followed with equal probability regardless of weight (default: {True})
+        
+        Returns:
+            generator -- Generator of int32 walk arrays
+        """
+        walker = RandomWalker(self.to_sparse(nodes=nodes), p, q, weighted=weighted)
+        return walker.iter_walks(walk_length, num_walks, batch_size=batch_size, seed=seed, workers=workers)
+    def freeze(self):
+        """Returns compact, array-backed copy of this graph (see compact.py).
+        
+        Returns:
+            CompactGraph -- Compact form of this graph
+        """
+        raise NotImplementedError("Not implemented for %s" % self.get_graph_type())
     @abc.abstractmethod
     def to_visjs_format(self):
         raise NotImplementedError("Not implemented yet")
@@ -171,8 +456,8 @@ class Graph(defaultdict):
     def get_graph_type(self):
         raise NotImplementedError("Not implemented yet")
 class UnweightedGraph(Graph):
-    def __init__(self, directed=False):
-        super(UnweightedGraph, self).__init__(directed)
+    def __init__(self, directed=False, index_predecessors=True, node_dictionary=None):
+        super(UnweightedGraph, self).__init__(directed, index_predecessors, node_dictionary)
     def _get_factory(self):
         """Returns set object when called by defaultdict
         
@@ -185,18 +470,20 @@ class UnweightedGraph(Graph):
         self[source].add(target)
         if not self.directed:
             self[target].add(source)
+        self._index_edge(source, target)
         self.add_nodes([source, target])
     def delete_edge(self, edge):
         source, target = edge
         self[source].remove(target)
         if not self.directed:
-            self[target].remove(source)
+            self[target].discard(source)
+        self._unindex_edge(source, target)
     def get_edges(self, data=False, sum_weights=False):
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=False, sum_weights=False):
         for node in self:
             for neighbor in self[node]:
-                output.append((node, neighbor))
-        return output
+                yield (node, neighbor)
     def contains_edge(self, edge):
         source, target = edge
         if self.directed:
@@ -206,13 +493,14 @@ class UnweightedGraph(Graph):
     def copy(self, deep=False):
         if not deep:
             return super(UnweightedGraph, self).copy(deep)
-        output = UnweightedGraph(self.directed)
-        output.add_edges(self.get_edges())
-        return output
+        output = UnweightedGraph(self.directed, self.index_predecessors)
+        return self._copy_storage(output)
     def get_column_names(self):
         return ("source", "target")
     def get_edgelist(self, data=True, sum_weights=False):
         return self.get_edges()
+    def iter_edgelist(self, data=True, sum_weights=False):
+        return self.iter_edges()
     def to_visjs_format(self):
         nodes = list(self.get_nodes())
         edges = []
@@ -220,19 +508,37 @@ class UnweightedGraph(Graph):
             for target in self[source]:
                 edges.append({"from":source, "to":target})
         return {"nodes":nodes, "edges":edges}
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False):
+        return edges_to_sparse(self, ((source, target, 1.0) for source, target in self.iter_edges()), format, nodes)
+    def freeze(self):
+        from .compact import CompactUnweightedGraph
+        return CompactUnweightedGraph.from_graph(self)
     def get_graph_type(self):
         return "unweighted"
 class WeightedGraph(Graph):
-    def __init__(self, directed=False, weight_is_list=False):
+    def __init__(self, directed=False, weight_is_list=False, index_predecessors=True, aggregate_weights=False, node_dictionary=None):
+        """Datastructure that represents weighted graphs.
+        
+        Keyword Arguments:
+            directed {bool} -- True if graph is directed. (default: {False})
+            weight_is_list {bool} -- True if all weights added to an edge are kept instead of their sum (default: {False})
+            index_predecessors {bool} -- True if incoming edges of directed graph should be indexed (default: {True})
+            aggregate_weights {bool} -- If true, graphs with weight_is_list keep a WeightAggregate(count, sum, sum of
+                squares, min and max) per edge instead of the list of weights (default: {False})
+            node_dictionary {NodeDictionary} -- Dictionary that maps the int nodes of this graph to node names (default: {None})
+        """
         self.weight_is_list = weight_is_list
-        super(WeightedGraph, self).__init__( directed)
+        self.aggregate_weights = weight_is_list and aggregate_weights
+        super(WeightedGraph, self).__init__(directed, index_predecessors, node_dictionary)
     def _get_factory(self):
         """Returns defaultdict object when called
         
         Returns:
             defaultdict -- defaultdict object
         """
-        if self.weight_is_list:
+        if self.aggregate_weights:
+            return defaultdict(WeightAggregate)
+        elif self.weight_is_list:
             return defaultdict(list)
         else:
             return defaultdict(float)
@@ -248,12 +554,13 @@ class WeightedGraph(Graph):
             self[source][target] += weight
         if not self.directed:
             if self.weight_is_list:
-                if type(weight) == list:
+                if type(weight) in (list, WeightAggregate):
                     self[target][source].extend(weight)
                 else:
                     self[target][source].append(weight)
             else:
                 self[target][source] += weight
+        self._index_edge(source, target)
         self.add_nodes([source, target])
     def delete_edge(self, edge):
         if(len(edge)==2):
@@ -265,23 +572,23 @@ class WeightedGraph(Graph):
         self[source].pop(target, None)
         if not self.directed:
             self[target].pop(source, None)
+        self._unindex_edge(source, target)
     def get_edges(self, data=True, sum_weights=False):
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=True, sum_weights=False):
         for node in self:
             for neighbor in self[node]:
                 if data:
                     if self.weight_is_list:
                         if sum_weights:
-                            output.append((node, neighbor, np.sum(self[node][neighbor])))
+                            yield (node, neighbor, weight_sum(self[node][neighbor]))
                         else:
-                            output.append((node, neighbor, np.mean(self[node][neighbor])))
+                            yield (node, neighbor, weight_mean(self[node][neighbor]))
                     else:
-                        output.append((node, neighbor, self[node][neighbor]))
+                        yield (node, neighbor, self[node][neighbor])
 
                 else:
-                    output.append((node, neighbor))
-
-        return output
+                    yield (node, neighbor)
     def contains_edge(self, edge):
         source, target = edge
         if self.directed:
@@ -291,11 +598,8 @@ class WeightedGraph(Graph):
     def copy(self, deep=False):
         if not deep:
             return super(WeightedGraph, self).copy(deep)
-        output = WeightedGraph(self.directed, self.weight_is_list)
-        output.add_edges(self.get_edges())
-        return output
-    def random_walk_generator(self, p=1, q=1, walk_length=5):
-        pass
+        output = WeightedGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights)
+        return self._copy_storage(output)
     def get_column_names(self):
         return ("source", "target", "weight")
     def get_edgelist(self, data=True, sum_weights=False):
@@ -305,12 +609,17 @@ class WeightedGraph(Graph):
         edges = []
         for source in self:
             for target in self[source]:
-                edges.append({"from": source, "to": target, "weight": self[source][target]})
+                edges.append({"from": source, "to": target, "weight": weight_to_json(self[source][target])})
         return {"nodes": nodes, "edges": edges}
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False):
+        return edges_to_sparse(self, self.iter_edges(data=True, sum_weights=sum_weights), format, nodes)
+    def freeze(self):
+        from .compact import CompactWeightedGraph
+        return CompactWeightedGraph.from_graph(self)
     def get_graph_type(self):
         return "weighted"
 class MultiplexGraph(Graph):
-    def __init__(self, directed=False, weight_is_list=False):
+    def __init__(self, directed=False, weight_is_list=False, index_predecessors=True, aggregate_weights=False, node_dictionary=None):
         """Datastructure that represents  multiplex multilayer graphs.
         
         Arguments:
@@ -319,11 +628,18 @@ class MultiplexGraph(Graph):
         Keyword Arguments:
             directed {bool} -- True if graph is directed. (default: {False})
             weight_is_list {bool} -- True if weight of edge represented by list (default: {False})
+            index_predecessors {bool} -- True if incoming edges of directed graph should be indexed (default: {True})
+            aggregate_weights {bool} -- If true, graphs with weight_is_list keep a WeightAggregate per edge instead of the list of weights (default: {False})
+            node_dictionary {NodeDictionary} -- Dictionary that maps the int nodes of this graph to node names (default: {None})
         """
         self.weight_is_list = weight_is_list
-        super(MultiplexGraph, self).__init__(directed)
+        self.aggregate_weights = weight_is_list and aggregate_weights
+        super(MultiplexGraph, self).__init__(directed, index_predecessors, node_dictionary)
+        self._relations = defaultdict(set)
     def _get_factory(self):
-        if self.weight_is_list:
+        if self.aggregate_weights:
+            return defaultdict(lambda: defaultdict(WeightAggregate))
+        elif self.weight_is_list:
             return defaultdict(lambda: defaultdict(list))
         else:
             return defaultdict(lambda: defaultdict(float))
@@ -342,6 +658,10 @@ class MultiplexGraph(Graph):
             self[source][target][r_type].append(weight)
             if not self.directed:
                 self[target][source][r_type].append(weight)
+        self._index_edge(source, target)
+        self._index_relation(source, target, r_type)
+        if not self.directed:
+            self._index_relation(target, source, r_type)
         self.add_nodes([source, target])
     def delete_edge(self, edge):
         if(len(edge)==3):
@@ -353,20 +673,23 @@ class MultiplexGraph(Graph):
         self[source][target].pop(rel, None)
         if not self.directed:
             self[target][source].pop(rel, None)
+            self._unindex_edge(target, source)
+            self._unindex_relations(target, source, [rel])
+        self._unindex_edge(source, target)
+        self._unindex_relations(source, target, [rel])
     def get_edges(self, data=True, sum_weights=False):
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=True, sum_weights=False):
         for node in self:
             for neighbor in self[node]:
                 for rel in self[node][neighbor]:
                     if data:
                         if sum_weights:
-                            output.append((node, neighbor, rel, {"weight": np.sum(self[node][neighbor][rel])}))
+                            yield (node, neighbor, rel, {"weight": weight_sum(self[node][neighbor][rel])})
                         else:
-                            output.append((node, neighbor, rel, {"weight": np.mean(self[node][neighbor][rel])}))
+                            yield (node, neighbor, rel, {"weight": weight_mean(self[node][neighbor][rel])})
                     else:
-                        output.append((node, neighbor, rel))
-
-        return output
+                        yield (node, neighbor, rel)
     
     def contains_edge(self, edge):
         source, target, relation = edge
@@ -377,12 +700,30 @@ class MultiplexGraph(Graph):
     def copy(self, deep=False):
         if not deep:
             return super(MultiplexGraph, self).copy(deep)
-        output = MultiplexGraph(self.directed, self.weight_is_list)
-        output.add_edges(self.get_edges())
-        return output
+        output = MultiplexGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights)
+        return self._copy_storage(output)
     
+    def get_relations(self):
+        """Returns relation types(layers) which have at least one edge in this graph.
+        
+        Returns:
+            list -- Relation types of this graph
+        """
+        return list(self._relations)
+    def _new_layer_graph(self):
+        return WeightedGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights, self.node_dictionary)
+    def _iter_layer_edges(self, layer, data=True, sum_weights=False):
+        for source, target in self._relations.get(layer, ()):
+            if data:
+                if sum_weights:
+                    yield (source, target, weight_sum(self[source][target][layer]))
+                else:
+                    yield (source, target, weight_mean(self[source][target][layer]))
+            else:
+                yield (source, target)
     def get_layer(self, layer):
-        """Contracts weighted graph from this graph where the edges are from specified layer of this graph.
+        """Contracts weighted graph from this graph where the edges are from specified layer of this graph. Edges
+        of the layer are found with the relation index, so the cost is proportional to the size of the layer.
         
         Arguments:
             layer {str} -- Layer name(relation type)
@@ -390,12 +731,39 @@ class MultiplexGraph(Graph):
         Returns:
             [WeightedGraph] -- WeigthedGraph constructed from a given layer of this graph
         """
-        output = WeightedGraph(self.directed, self.weight_is_list)
-        for node in self:
-            for neighbor in self[node]:
-                if layer in self[node][neighbor]:
-                    output.add_edge((node, neighbor, {"weight": self[node][neighbor][layer]}))
+        output = self._new_layer_graph()
+        for source, target in self._relations.get(layer, ()):
+            output[source][target] = copy_weight(self[source][target][layer])
+            output._index_edge(source, target)
+            output.add_nodes([source, target])
+        return output
+    def get_layers(self):
+        """Contracts weighted graph of every layer of this graph in a single pass over the edges.
+        
+        Returns:
+            dict -- Maps layer name(relation type) to the WeightedGraph of that layer
+        """
+        output = {}
+        for source in self:
+            for target in self[source]:
+                for relation, weight in self[source][target].items():
+                    if relation not in output:
+                        output[relation] = self._new_layer_graph()
+                    output[relation][source][target] = copy_weight(weight)
+                    output[relation]._index_edge(source, target)
+                    output[relation]._nodes.update((source, target))
         return output
+    def get_layer_view(self, layer):
+        """Returns read-only view of a layer of this graph. Unlike get_layer nothing is copied, so the view reflects
+        later changes of this graph.
+        
+        Arguments:
+            layer {str} -- Layer name(relation type)
+        
+        Returns:
+            LayerView -- View of the given layer
+        """
+        return LayerView(self, layer)
     def get_column_names(self):
         return ("source", "target", "relation", "weight")
     def get_edgelist(self, data=True, sum_weights=False):
@@ -406,7 +774,131 @@ class MultiplexGraph(Graph):
         for source in self:
             for target in self[source]:
                 for relation in self[source][target]:
-                    edges.append({"from":source, "to":target, "relation": relation, "weight":self[source][target][relation]})
+                    edges.append({"from":source, "to":target, "relation": relation, "weight":weight_to_json(self[source][target][relation])})
         return {"nodes": nodes, "edges": edges}
+    def to_sparse(self, format="csr", nodes=None, sum_weights=False, layer=None, per_layer=False):
+        """Returns weighted adjacency matrix of this graph as SciPy sparse matrix, see Graph.to_sparse. Weights of
+        parallel edges of different layers are added up unless a single layer is selected.
+        
+        Keyword Arguments:
+            format {str} -- SciPy sparse format (default: {"csr"})
+            nodes {list} -- Node order (default: {None})
+            sum_weights {bool} -- If true weights stored as list are summed instead of averaged (default: {False})
+            layer {str} -- If given only the edges of this layer(relation type) are exported (default: {None})
+            per_layer {bool} -- If true returns dict which maps every layer to its own matrix (default: {False})
+        
+        Returns:
+            scipy.sparse.spmatrix, dict -- Adjacency matrix, or matrix of every layer if per_layer is true
+        """
+        node_order = self.get_node_order(nodes)
+        if per_layer:
+            return {relation: self.to_sparse(format, node_order, sum_weights, layer=relation) for relation in self.get_relations()}
+        if layer is not None:
+            edges = self._iter_layer_edges(layer, data=True, sum_weights=sum_weights)
+        else:
+            edges = ((source, target, data["weight"]) for source, target, _, data in self.iter_edges(data=True, sum_weights=sum_weights))
+        return edges_to_sparse(self, edges, format, node_order)
+    def get_multiplex_walker(self, layer_weights=None, switch_probability=0.5, p=1, q=1, nodes=None, weighted=True):
+        """Returns random walker which walks inside the layers of this graph and switches between them, see
+        MultiplexRandomWalker in walks.py. Layers are exported with the relation index, without layer copies.
+        
+        Keyword Arguments:
+            layer_weights {dict} -- Maps layer name(relation type) to weight, missing layers have weight 1 (default: {None})
+            switch_probability {float} -- Probability of redrawing the layer before a step (default: {0.5})
+            p {float} -- Return parameter of node2vec (default: {1})
+            q {float} -- In-out parameter of node2vec (default: {1})
+            nodes {list} -- Node order (default: {None})
+            weighted {bool} -- If false edges are followed with equal probability regardless of weight (default: {True})
+        
+        Returns:
+            MultiplexRandomWalker -- Walker over the layers of this graph
+        """
+        return MultiplexRandomWalker(self.to_sparse(nodes=nodes, per_layer=True), layer_weights, switch_probability, p, q, weighted)
+    def multiplex_walk_generator(self, walk_length=5, num_walks=1, layer_weights=None, switch_probability=0.5, p=1, q=1, nodes=None, batch_size=10000, seed=None, workers=1, weighted=True):
+        """Yields cross-layer random walks(multi-node2vec) over this graph in batches. Unlike random_walk_generator,
+        which walks on the sum of the layers, every step follows an edge of a single layer. Walks are int32 arrays,
+        one walk per row, whose entries are positions in get_node_order(nodes).
+        
+        Keyword Arguments:
+            walk_length {int} -- Number of nodes of each walk (default: {5})
+            num_walks {int} -- Number of walks started from every node (default: {1})
+            layer_weights {dict} -- Maps layer name(relation type) to weight, missing layers have weight 1 (default: {None})
+            switch_probability {float} -- Probability of redrawing the layer before a step (default: {0.5})
+            p {float} -- Return parameter of node2vec (default: {1})
+            q {float} -- In-out parameter of node2vec (default: {1})
+            nodes {list} -- Node order (default: {None})
+            batch_size {int} -- Number of walks per yielded array (default: {10000})
+            seed {int} -- Seed of the random number generators (default: {None})
+            workers {int} -- Number of processes generating walks (default: {1})
+            weighted {bool} -- If false edges are followed with equal probability regardless of weight (default: {True})
+        
+        Returns:
+            generator -- Generator of int32 walk arrays
+        """
+        walker = self.get_multiplex_walker(layer_weights, switch_probability, p, q, nodes, weighted)
+        return walker.iter_walks(walk_length, num_walks, batch_size=batch_size, seed=seed, workers=workers)
+    def freeze(self):
+        from .compact import CompactMultiplexGraph
+        return CompactMultiplexGraph.from_graph(self)
     def get_graph_type(self):
-        return "multiplex"
\ No newline at end of file
+        return "multiplex"
+class LayerView(object):
+    """Read-only view of one layer of a multiplex graph(static or temporal). The view holds no edge data; edges
+    are looked up in the multiplex graph through its relation index.
+    """
+    def __init__(self, graph, layer):
+        """Initializes LayerView object.
+        
+        Arguments:
+            graph {MultiplexGraph, TemporalMultiplexGraph} -- Multiplex graph
+            layer {str} -- Layer name(relation type)
+        """
+        self.graph = graph
+        self.layer = layer
+        self.directed = graph.directed
+        self.weight_is_list = graph.weight_is_list
+    def _pairs(self):
+        return self.graph._relations.get(self.layer, ())
+    def __iter__(self):
+        return iter(set(source for source, _ in self._pairs()))
+    def __contains__(self, source):
+        return len(self[source]) > 0
+    def __getitem__(self, source):
+        """Returns weights of the edges of source in this layer keyed by target.
+        """
+        row = self.graph.get(source, {})
+        return {target: row[target][self.layer] for target in row if self.layer in row[target]}
+    def __len__(self):
+        return len(set(source for source, _ in self._pairs()))
+    def number_of_edges(self):
+        return len(self._pairs())
+    def get_nodes(self):
+        output = set()
+        for source, target in self._pairs():
+            output.add(source)
+            output.add(target)
+        return output
+    def get_neighbors(self, node, include_incoming_connection=True):
+        output = set(self[node])
+        if include_incoming_connection:
+            output.update(source for source in self.graph.get_predecessors(node) if self.layer in self.graph[source][node])
+        return output
+    def contains_edge(self, edge):
+        source, target = edge[:2]
+        if source in self.graph and target in self.graph[source] and self.layer in self.graph[source][target]:
+            return True
+        return not self.directed and target in self.graph and source in self.graph[target] and self.layer in self.graph[target][source]
+    def iter_edges(self, data=True, sum_weights=False):
+        return self.graph._iter_layer_edges(self.layer, data=data, sum_weights=sum_weights)
+    def get_edges(self, data=True, sum_weights=False):
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edgelist(self, data=True, sum_weights=False):
+        return self.iter_edges(data=data, sum_weights=sum_weights)
+    def get_edgelist(self, data=True, sum_weights=False):
+        return self.get_edges(data=data, sum_weights=sum_weights)
+    def get_column_names(self):
+        return tuple(name for name in self.graph.get_column_names() if name != "relation")
+    def to_graph(self):
+        """Returns copy of this layer as a graph, see get_layer of the multiplex graphs.
+        """
+        return self.graph.get_layer(self.layer)
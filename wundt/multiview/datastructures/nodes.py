@@ -0,0 +1,91 @@
+"""
+Node interning: NodeDictionary maps external node names(e.g. user hashcodes) to contiguous int ids and back.
+"""
+import numpy as np
+import pandas as pd
+
+
+class NodeDictionary(object):
+    def __init__(self, nodes=None):
+        """Initializes NodeDictionary object.
+
+        Keyword Arguments:
+            nodes {list} -- External node names to intern, in id order (default: {None})
+        """
+        self._node2id = {}
+        self._id2node = []
+        self._node_array = None
+        if nodes is not None:
+            self.get_ids(nodes)
+
+    def get_id(self, node):
+        """Returns id of a node, assigning the next free id if the node has not been seen before.
+
+        Arguments:
+            node {str, int} -- External node name
+
+        Returns:
+            int -- Node id
+        """
+        node_id = self._node2id.get(node)
+        if node_id is None:
+            node_id = len(self._id2node)
+            self._node2id[node] = node_id
+            self._id2node.append(node)
+        return node_id
+
+    def get_ids(self, nodes):
+        """Returns ids of list of nodes, assigning ids to unseen nodes in order of first appearance.
+
+        Arguments:
+            nodes {numpy.ndarray, list, pandas.Series} -- External node names
+
+        Raises:
+            ValueError: If a node is missing(None or NaN)
+
+        Returns:
+            numpy.ndarray -- Node ids
+        """
+        codes, uniques = pd.factorize(np.asarray(nodes, dtype=object))
+        if (codes < 0).any():
+            raise ValueError("Nodes should not be missing, found %d None or NaN nodes" % int((codes < 0).sum()))
+        unique_ids = np.fromiter((self.get_id(node) for node in uniques), dtype=np.int64, count=len(uniques))
+        return unique_ids[codes] if len(codes) > 0 else np.zeros(0, dtype=np.int64)
+
+    def lookup(self, node):
+        """Returns id of a node without interning it.
+
+        Raises:
+            KeyError: If the node has no id
+        """
+        return self._node2id[node]
+
+    def get_node(self, node_id):
+        """Returns external name of a node id.
+        """
+        return self._id2node[node_id]
+
+    def get_nodes(self, node_ids):
+        """Returns external names of an array of node ids.
+
+        Arguments:
+            node_ids {numpy.ndarray, list} -- Node ids
+
+        Returns:
+            numpy.ndarray -- Object array of external node names
+        """
+        if self._node_array is None or len(self._node_array) != len(self._id2node):
+            self._node_array = np.empty(len(self._id2node), dtype=object)
+            self._node_array[:] = self._id2node
+        return self._node_array[np.asarray(node_ids, dtype=np.int64)]
+
+    def get_node_list(self):
+        """Returns external node names in id order.
+        """
+        return list(self._id2node)
+
+    def __contains__(self, node):
+        return node in self._node2id
+
+    def __len__(self):
+        return len(self._id2node)
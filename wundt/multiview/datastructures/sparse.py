@@ -0,0 +1,99 @@
+"""
+Export of graphs to SciPy sparse matrices, where row and column i stand for the i-th node of a node order.
+"""
+import numpy as np
+import pandas as pd
+
+
+def get_node_order(graph, nodes=None):
+    """Returns the nodes labelling the rows and columns of the sparse matrices of a graph.
+
+    Arguments:
+        graph {Graph, CompactGraph} -- Graph to export
+
+    Keyword Arguments:
+        nodes {list} -- Explicit node order, returned as is (default: {None})
+
+    Returns:
+        list, range -- Node order
+    """
+    if nodes is not None:
+        return nodes if isinstance(nodes, range) else list(nodes)
+    if getattr(graph, "node_dictionary", None) is not None:
+        return range(len(graph.node_dictionary))
+    nodes = graph.get_nodes()
+    try:
+        return sorted(nodes)
+    except TypeError:
+        return list(nodes)
+
+
+def get_positions(node_order, nodes):
+    """Returns the position of every node in node_order, or -1 for nodes that are not in it.
+
+    Arguments:
+        node_order {list, range} -- Node order returned by get_node_order
+        nodes {numpy.ndarray, list} -- Nodes to look up
+
+    Returns:
+        numpy.ndarray -- int64 positions
+    """
+    if isinstance(node_order, range) and node_order.start == 0 and node_order.step == 1:
+        # Dictionary ids are their own positions
+        positions = np.asarray(nodes, dtype=np.int64)
+        return np.where((positions >= 0) & (positions < len(node_order)), positions, -1)
+    values = np.empty(len(nodes), dtype=object)
+    values[:] = list(nodes)
+    return pd.Index(list(node_order), dtype=object).get_indexer(values).astype(np.int64)
+
+
+def build_sparse(rows, columns, data, num_nodes, format="csr"):
+    """Builds num_nodes x num_nodes sparse matrix from coordinates. Entries whose row or column is -1(nodes outside
+    of the node order) are dropped and duplicate entries are summed.
+
+    Arguments:
+        rows {numpy.ndarray} -- Row of every entry
+        columns {numpy.ndarray} -- Column of every entry
+        data {numpy.ndarray} -- Value of every entry
+        num_nodes {int} -- Number of rows and columns
+
+    Keyword Arguments:
+        format {str} -- SciPy sparse format, e.g. "csr", "csc" or "coo" (default: {"csr"})
+
+    Returns:
+        scipy.sparse.spmatrix -- Sparse matrix
+    """
+    from scipy import sparse
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = np.asarray(columns, dtype=np.int64)
+    data = np.asarray(data, dtype=np.float64)
+    keep = (rows >= 0) & (columns >= 0)
+    if not keep.all():
+        rows, columns, data = rows[keep], columns[keep], data[keep]
+    matrix = sparse.coo_matrix((data, (rows, columns)), shape=(num_nodes, num_nodes))
+    if format == "coo":
+        matrix.sum_duplicates()
+        return matrix
+    return matrix.asformat(format)
+
+
+def edges_to_sparse(graph, edges, format="csr", nodes=None):
+    """Builds sparse matrix from (source, target, weight) tuples of a graph.
+
+    Arguments:
+        graph {Graph} -- Graph the edges belong to
+        edges {iterable} -- (source, target, weight) tuples
+
+    Keyword Arguments:
+        format {str} -- SciPy sparse format (default: {"csr"})
+        nodes {list} -- Node order, see get_node_order (default: {None})
+
+    Returns:
+        scipy.sparse.spmatrix -- Sparse matrix
+    """
+    node_order = get_node_order(graph, nodes)
+    columns = list(zip(*edges))
+    if len(columns) == 0:
+        return build_sparse([], [], [], len(node_order), format)
+    sources, targets, weights = columns
+    return build_sparse(get_positions(node_order, sources), get_positions(node_order, targets), weights, len(node_order), format)
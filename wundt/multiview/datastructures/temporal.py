@@ -1,7 +1,105 @@
 from collections import defaultdict
 import abc
 import numpy as np
-from .graphs import Graph, WeightedGraph, MultiplexGraph
+from .graphs import Graph, WeightedGraph, MultiplexGraph, LayerView
+from .weights import WeightAggregate, weight_mean, weight_sum, weight_to_json, copy_weight
+from .sparse import get_positions, build_sparse
+from .walks import TemporalRandomWalker
+class TemporalEdgeIndex(object):
+    """Log of all (source, target, relation, time) cells of a temporal graph sorted by time. Every column is a NumPy
+    array, so the cells within a time range are found by binary search and aggregated without visiting the rest
+    of the graph.
+    
+    Columns:
+        sources, targets {numpy.ndarray} -- Positions of the cell nodes in nodes
+        relations {numpy.ndarray} -- Positions of the cell relations in relation_names
+        times {numpy.ndarray} -- Sorted timestamps
+        values {numpy.ndarray} -- Weight the cell adds to a snapshot graph (mean of the weights for weight_is_list graphs)
+        weights {numpy.ndarray} -- Sum of the weights of the cell
+        counts {numpy.ndarray} -- Number of weights added to the cell
+    """
+    def __init__(self, nodes, relation_names, sources, targets, relations, times, values, weights, counts):
+        self.nodes = nodes
+        self.relation_names = relation_names
+        self.sources = sources
+        self.targets = targets
+        self.relations = relations
+        self.times = times
+        self.values = values
+        self.weights = weights
+        self.counts = counts
+    @classmethod
+    def from_cells(cls, cells):
+        """Builds index from (source, target, relation, time, value, weight, count) tuples
+        
+        Arguments:
+            cells {iterable} -- Cells of a temporal graph
+        
+        Returns:
+            TemporalEdgeIndex -- Time sorted index of the cells
+        """
+        node_ids = {}
+        relation_ids = {}
+        columns = ([], [], [], [], [], [], [])
+        for source, target, relation, time, value, weight, count in cells:
+            columns[0].append(node_ids.setdefault(source, len(node_ids)))
+            columns[1].append(node_ids.setdefault(target, len(node_ids)))
+            columns[2].append(relation_ids.setdefault(relation, len(relation_ids)))
+            columns[3].append(time)
+            columns[4].append(value)
+            columns[5].append(weight)
+            columns[6].append(count)
+        times = np.asarray(columns[3], dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        nodes = np.empty(len(node_ids), dtype=object)
+        nodes[:] = list(node_ids.keys())
+        relation_names = np.empty(len(relation_ids), dtype=object)
+        relation_names[:] = list(relation_ids.keys())
+        return cls(
+            nodes,
+            relation_names,
+            np.asarray(columns[0], dtype=np.int32)[order],
+            np.asarray(columns[1], dtype=np.int32)[order],
+            np.asarray(columns[2], dtype=np.int32)[order],
+            times[order],
+            np.asarray(columns[4], dtype=np.float64)[order],
+            np.asarray(columns[5], dtype=np.float64)[order],
+            np.asarray(columns[6], dtype=np.int64)[order])
+    def __len__(self):
+        return len(self.times)
+    def window(self, start_time, end_time):
+        """Returns slice of the cells whose time is within [start_time, end_time]
+        """
+        return slice(np.searchsorted(self.times, start_time, side="left"), np.searchsorted(self.times, end_time, side="right"))
+    def until(self, timestamp):
+        """Returns slice of the cells whose time is less than or equal to timestamp
+        """
+        return slice(0, np.searchsorted(self.times, timestamp, side="right"))
+    def edge_keys(self, selection=slice(None)):
+        """Returns int64 key of the (source, target, relation) triple of every selected cell
+        """
+        return (self.sources[selection].astype(np.int64) * len(self.nodes) + self.targets[selection]) * max(len(self.relation_names), 1) + self.relations[selection]
+    def split_keys(self, keys):
+        num_relations = max(len(self.relation_names), 1)
+        pairs, relations = np.divmod(keys, num_relations)
+        sources, targets = np.divmod(pairs, len(self.nodes))
+        return sources, targets, relations
+    def aggregate(self, selection, column="values"):
+        """Sums a column over the selected cells per (source, target, relation) triple
+        
+        Arguments:
+            selection {slice} -- Cells to aggregate
+        
+        Keyword Arguments:
+            column {str} -- Column to sum (default: {"values"})
+        
+        Returns:
+            tuple -- Arrays of source ids, target ids, relation ids and sums
+        """
+        keys, inverse = np.unique(self.edge_keys(selection), return_inverse=True)
+        sums = np.bincount(inverse.ravel(), weights=getattr(self, column)[selection], minlength=len(keys))
+        sources, targets, relations = self.split_keys(keys)
+        return sources, targets, relations, sums
 class TemporalGraph(Graph):
     """Parent class of all temporal graphs. This class provides  an interface to all other classes 
     which implement temporal graph networks.
@@ -9,31 +107,308 @@ class TemporalGraph(Graph):
     
     
     """
-    def __init__(self,directed):
+    def __init__(self,directed, index_predecessors=True, node_dictionary=None):
         """Initializes Temporal Graph object.
 
         
         Arguments:
             factory {type} -- Which factory to use as argument to the defaultdict initialization.
             directed {bool} -- True if the layers are directed graphs
+            index_predecessors {bool} -- If true directed graphs keep index of incoming edges
+            node_dictionary {NodeDictionary} -- Dictionary that maps the int nodes of this graph to node names
         
         Returns:
         """
-        super(TemporalGraph, self).__init__(directed)
+        super(TemporalGraph, self).__init__(directed, index_predecessors, node_dictionary)
         self.start_timestamp = np.finfo(float).max
         self.end_timestamp = -1
+        self._time_index = None
     
-   
     @abc.abstractmethod
-    def get_snapshot_graph(self, start_time, end_time):
+    def _iter_cells(self):
+        """Yields (source, target, relation, time, value, weight, count) tuple for every cell of this graph. See
+        TemporalEdgeIndex for the meaning of the fields.
+        """
         raise NotImplementedError("Not implemented yet")
-    @abc.abstractmethod
+    def get_time_index(self):
+        """Returns time sorted index of the edges of this graph. The index is built on first use and rebuilt after
+        this graph is modified.
+        
+        Returns:
+            TemporalEdgeIndex -- Time sorted index of this graph
+        """
+        if self._time_index is None:
+            self._time_index = TemporalEdgeIndex.from_cells(self._iter_cells())
+        return self._time_index
+    def add_edges_from_arrays(self, sources, targets, relations=None, timestamps=None, weights=None):
+        super(TemporalGraph, self).add_edges_from_arrays(sources, targets, relations=relations, timestamps=timestamps, weights=weights)
+        if len(sources) > 0:
+            self.start_timestamp = min(self.start_timestamp, float(np.min(timestamps)))
+            self.end_timestamp = max(self.end_timestamp, float(np.max(timestamps)))
+        self._time_index = None
+    def delete_node(self, node):
+        super(TemporalGraph, self).delete_node(node)
+        self._time_index = None
+    def _copy_storage(self, output):
+        super(TemporalGraph, self)._copy_storage(output)
+        output.start_timestamp = self.start_timestamp
+        output.end_timestamp = self.end_timestamp
+        # The index is never modified in place(changes of the graph discard it), so the copy can share it
+        output._time_index = self._time_index
+        return output
+    def _new_snapshot_graph(self):
+        return WeightedGraph(self.directed, weight_is_list=False, node_dictionary=self.node_dictionary)
+    def _snapshot_edges(self, index, sources, targets, relations, weights):
+        return zip(index.nodes[sources].tolist(), index.nodes[targets].tolist(), weights.tolist())
+    def _build_snapshot_graph(self, selection):
+        index = self.get_time_index()
+        output = self._new_snapshot_graph()
+        output.add_edges(self._snapshot_edges(index, *index.aggregate(selection)))
+        return output
+    def get_snapshot_graph(self, start_time, end_time):
+        """Returns graph made from edges with timestamp within [start_time, end_time]. Weight of a snapshot edge is
+        the sum of the weights(mean weights for weight_is_list graphs) of the edge at every timestamp in the range.
+        
+        Arguments:
+            start_time {float} -- Start of the time range
+            end_time {float} -- End of the time range
+        
+        Returns:
+            Graph -- Snapshot graph
+        """
+        assert start_time < end_time, "Start time should be less than end time"
+        return self._build_snapshot_graph(self.get_time_index().window(start_time, end_time))
     def get_evolution_snapshot_graph(self, timestamp):
-        raise NotImplementedError("Not implemented yet")
+        """Returns graph made from edges with timestamp less than or equal to the given timestamp
+        
+        Arguments:
+            timestamp {float} -- End of the time range
+        
+        Returns:
+            Graph -- Snapshot graph
+        """
+        return self._build_snapshot_graph(self.get_time_index().until(timestamp))
+    def iter_evolution_snapshot_graphs(self, timestamps, deltas=False, copy=False):
+        """Yields evolution snapshot graph for each of the given timestamps in a single pass over the edges of this
+        graph. Only the edges between consecutive timestamps are aggregated and added at each step, so generating all
+        snapshots costs about as much as generating the last one. By default the same graph object is updated and
+        yielded at each step; with copy=True every snapshot is a new graph built from all the edges seen so far, which
+        costs O(timestamps * edges).
+
+        Arguments:
+            timestamps {iterable} -- Increasing timestamps
+
+        Keyword Arguments:
+            deltas {bool} -- If true yields graphs made only from the edges added since the previous timestamp,
+                which summed up give the evolution snapshots (default: {False})
+            copy {bool} -- If true yields a new graph for every timestamp, otherwise the yielded graph should be
+                consumed before the generator is advanced (default: {False})
+
+        Raises:
+            ValueError: If the timestamps are not increasing
+
+        Yields:
+            Graph -- Evolution snapshot graph or delta graph for each timestamp
+        """
+        index = self.get_time_index()
+        keys, first_seen, inverse = np.unique(index.edge_keys(), return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        sources, targets, relations = index.split_keys(keys)
+        seen_order = np.argsort(first_seen, kind="stable")
+        first_seen = first_seen[seen_order]
+        running_weights = np.zeros(len(keys), dtype=np.float64)
+        running_graph = self._new_snapshot_graph()
+        start = 0
+        for timestamp in timestamps:
+            end = int(np.searchsorted(index.times, timestamp, side="right"))
+            if end < start:
+                raise ValueError("Timestamps should be increasing, found: %s" % str(timestamp))
+            step, step_inverse = np.unique(inverse[start:end], return_inverse=True)
+            step_weights = np.bincount(step_inverse.ravel(), weights=index.values[start:end], minlength=len(step))
+            start = end
+            if deltas:
+                output = self._new_snapshot_graph()
+                output.add_edges(self._snapshot_edges(index, sources[step], targets[step], relations[step], step_weights))
+                yield output
+            elif not copy:
+                running_graph.add_edges(self._snapshot_edges(index, sources[step], targets[step], relations[step], step_weights))
+                yield running_graph
+            else:
+                running_weights[step] += step_weights
+                active = seen_order[:np.searchsorted(first_seen, end)]
+                output = self._new_snapshot_graph()
+                output.add_edges(self._snapshot_edges(index, sources[active], targets[active], relations[active], running_weights[active]))
+                yield output
+    def iter_sliding_snapshot_graphs(self, start_time, end_time, window_length, stride, aggregate="sum", copy=True):
+        """Yields snapshot graph of every window [t, t + window_length] for t from start_time up to end_time in
+        steps of stride. Windows may overlap: each snapshot is derived from the previous one by adding the edges
+        entering the window and removing the edges leaving it, so the total cost depends on the number of edges
+        and not on the number of windows times the number of edges.
+
+        Arguments:
+            start_time {float} -- Start of the first window
+            end_time {float} -- Windows start before this time
+            window_length {float} -- Length of each window
+            stride {float} -- Distance between the starts of consecutive windows
+
+        Keyword Arguments:
+            aggregate {str} -- How edge weights within a window are combined. "sum" gives the same weights as
+                get_snapshot_graph, "count" the number of timestamps of the edge and "mean" the mean of all weights
+                added to the edge (default: {"sum"})
+            copy {bool} -- If false the same graph object is updated and yielded for every window, so it should be
+                consumed before the generator is advanced (default: {True})
+
+        Raises:
+            ValueError: If aggregate is not one of sum, count and mean
+
+        Yields:
+            Graph -- Snapshot graph of each window
+        """
+        if aggregate not in ["sum", "count", "mean"]:
+            raise ValueError("Aggregate should be one of: sum, count and mean, found: %s" % aggregate)
+        assert window_length > 0 and stride > 0, "Window length and stride should be positive"
+        index = self.get_time_index()
+        sources, targets = index.sources, index.targets
+        if not self.directed:
+            # Undirected graphs store each edge in both directions, so both directions share one running total.
+            sources, targets = np.minimum(index.sources, index.targets), np.maximum(index.sources, index.targets)
+        edge_keys = (sources.astype(np.int64) * len(index.nodes) + targets) * max(len(index.relation_names), 1) + index.relations
+        keys, inverse = np.unique(edge_keys, return_inverse=True)
+        inverse = inverse.ravel()
+        key_sources, key_targets, key_relations = index.split_keys(keys)
+        if aggregate == "mean":
+            numerators, denominators = index.weights, index.counts.astype(np.float64)
+            if not self.directed and isinstance(self, TemporalWeightedGraph) and not self.weight_is_list:
+                # Both additions of an undirected self-loop are summed into one cell which is counted once
+                denominators = np.where(index.sources == index.targets, 2.0, denominators)
+        elif aggregate == "count" and not self.directed:
+            numerators, denominators = index.values, np.where(index.sources == index.targets, 1.0, 0.5)
+        else:
+            numerators, denominators = index.values, np.ones(len(index), dtype=np.float64)
+        scales = np.ones(len(keys), dtype=np.float64)
+        if aggregate != "sum" and not self.directed:
+            # Snapshot graphs add an undirected self-loop to the same cell twice
+            scales[key_sources == key_targets] = 0.5
+        running_numerators = np.zeros(len(keys), dtype=np.float64)
+        running_denominators = np.zeros(len(keys), dtype=np.float64)
+        running_cells = np.zeros(len(keys), dtype=np.int64)
+        active = set()
+        running_graph = self._new_snapshot_graph()
+        low, high = 0, 0
+        window_start = start_time
+        while window_start < end_time:
+            window = index.window(window_start, window_start + window_length)
+            leaving = slice(low, min(window.start, high))
+            entering = slice(max(high, window.start), window.stop)
+            low, high = window.start, window.stop
+            for selection, sign in [(leaving, -1), (entering, 1)]:
+                np.add.at(running_numerators, inverse[selection], sign * numerators[selection])
+                np.add.at(running_denominators, inverse[selection], sign * denominators[selection])
+                np.add.at(running_cells, inverse[selection], sign)
+            touched = np.unique(np.concatenate((inverse[leaving], inverse[entering])))
+            expired = touched[running_cells[touched] == 0]
+            running_numerators[expired] = 0.0
+            running_denominators[expired] = 0.0
+            if aggregate == "sum":
+                weights = running_numerators
+            else:
+                weights = running_denominators if aggregate == "count" else running_numerators / np.maximum(running_denominators, 1.0)
+                weights = weights * scales
+            if copy:
+                active.difference_update(expired.tolist())
+                active.update(touched[running_cells[touched] > 0].tolist())
+                current = np.fromiter(active, dtype=np.int64, count=len(active))
+                output = self._new_snapshot_graph()
+                output.add_edges(self._snapshot_edges(index, key_sources[current], key_targets[current], key_relations[current], weights[current]))
+                yield output
+            else:
+                for edge in self._snapshot_edges(index, key_sources[touched], key_targets[touched], key_relations[touched], weights[touched]):
+                    if running_graph.contains_edge(edge[:-1]):
+                        running_graph.delete_edge(edge)
+                present = touched[running_cells[touched] > 0]
+                running_graph.add_edges(self._snapshot_edges(index, key_sources[present], key_targets[present], key_relations[present], weights[present]))
+                # Nodes left without edges would not be in a snapshot built from scratch
+                for node in index.nodes[np.unique(np.concatenate((key_sources[expired], key_targets[expired])))].tolist():
+                    if running_graph.out_degree(node) == 0 and running_graph.in_degree(node) == 0:
+                        running_graph.delete_node(node)
+                yield running_graph
+            window_start += stride
+    def _build_sparse_tensor(self, windows, format, nodes, layer):
+        index = self.get_time_index()
+        node_order = self.get_node_order(nodes)
+        positions = get_positions(node_order, index.nodes)
+        # Snapshot graphs of undirected graphs add each stored direction of an edge to both directions
+        scale = 1.0 if self.directed else 2.0
+        layer_ids = np.flatnonzero(index.relation_names == layer) if layer is not None else None
+        output = []
+        for start_time, end_time in windows:
+            assert start_time < end_time, "Start time should be less than end time"
+            sources, targets, relations, weights = index.aggregate(index.window(start_time, end_time))
+            if layer_ids is not None:
+                keep = np.isin(relations, layer_ids)
+                sources, targets, weights = sources[keep], targets[keep], weights[keep]
+            output.append(build_sparse(positions[sources], positions[targets], weights * scale, len(node_order), format))
+        return output
+    def to_sparse_tensor(self, windows, format="csr", nodes=None):
+        """Returns adjacency matrix of the snapshot graph of every time window as SciPy sparse matrices. All
+        matrices share the node order of get_node_order(nodes) and the matrix of window (start_time, end_time) holds
+        the weights of get_snapshot_graph(start_time, end_time). The matrices are built straight from the time index,
+        without creating the snapshot graphs.
+        
+        Arguments:
+            windows {iterable} -- (start_time, end_time) pairs; both ends of a window are inclusive
+        
+        Keyword Arguments:
+            format {str} -- SciPy sparse format, e.g. "csr", "csc" or "coo" (default: {"csr"})
+            nodes {list} -- Node order; edges of nodes which are not in it are left out (default: {None})
+        
+        Returns:
+            list -- Sparse matrix of each window
+        """
+        return self._build_sparse_tensor(windows, format, nodes, None)
+    def get_temporal_walker(self, bias="uniform", time_scale=None, nodes=None):
+        """Returns time respecting random walker over the edges of this graph, see TemporalRandomWalker in walks.py.
+        Node ids of the walker are positions in get_node_order(nodes).
+        
+        Keyword Arguments:
+            bias {str} -- How the next edge is chosen among the later edges: uniform, linear or exponential (default: {"uniform"})
+            time_scale {float} -- Decay time of the exponential bias (default: {None})
+            nodes {list} -- Node order; edges of nodes which are not in it are left out (default: {None})
+        
+        Returns:
+            TemporalRandomWalker -- Walker over this graph
+        """
+        index = self.get_time_index()
+        node_order = self.get_node_order(nodes)
+        positions = get_positions(node_order, index.nodes)
+        sources, targets = positions[index.sources], positions[index.targets]
+        keep = (sources >= 0) & (targets >= 0)
+        return TemporalRandomWalker(sources[keep], targets[keep], index.times[keep], len(node_order), bias=bias, time_scale=time_scale)
+    def temporal_walk_generator(self, walk_length=5, num_walks=1, bias="uniform", time_scale=None, nodes=None, batch_size=10000, seed=None, workers=1):
+        """Yields time respecting random walks(CTDNE) over this graph in batches: each step follows an edge whose
+        timestamp is greater than or equal to the timestamp of the previous step. Each batch is a tuple of an int32
+        walk array, one walk per row padded with -1, whose entries are positions in get_node_order(nodes), and a
+        float64 array with the timestamps of the steps. Batches can be streamed to disk with save_walks of walks.py.
+        
+        Keyword Arguments:
+            walk_length {int} -- Number of nodes of each walk (default: {5})
+            num_walks {int} -- Number of walks started from every node (default: {1})
+            bias {str} -- How the next edge is chosen among the later edges: uniform, linear or exponential (default: {"uniform"})
+            time_scale {float} -- Decay time of the exponential bias (default: {None})
+            nodes {list} -- Node order (default: {None})
+            batch_size {int} -- Number of walks per batch (default: {10000})
+            seed {int} -- Seed of the random number generators (default: {None})
+            workers {int} -- Number of processes generating walks (default: {1})
+        
+        Returns:
+            generator -- Generator of (walks, timestamps) tuples
+        """
+        walker = self.get_temporal_walker(bias, time_scale, nodes)
+        return walker.iter_walks(walk_length, num_walks, batch_size=batch_size, seed=seed, workers=workers)
     
 class TemporalUnweightedGraph(TemporalGraph):
-    def __init__(self, directed):
-        super(TemporalUnweightedGraph, self).__init__(directed)
+    def __init__(self, directed, index_predecessors=True, node_dictionary=None):
+        super(TemporalUnweightedGraph, self).__init__(directed, index_predecessors, node_dictionary)
     def _get_factory(self):
         return defaultdict(set)
    
@@ -51,6 +426,8 @@ class TemporalUnweightedGraph(TemporalGraph):
         self[source][target].add(time)
         if not self.directed:
             self[target][source].add(time)
+        self._index_edge(source, target)
+        self._time_index = None
         self.add_nodes([source, target])
 
     
@@ -65,7 +442,10 @@ class TemporalUnweightedGraph(TemporalGraph):
         self[source][target].remove(time)
        
         if not self.directed:
-            self[target][source].remove(time)
+            self[target][source].discard(time)
+            self._unindex_edge(target, source)
+        self._unindex_edge(source, target)
+        self._time_index = None
 
   
     def get_edges(self, data=True, sum_weights=False):
@@ -75,11 +455,11 @@ class TemporalUnweightedGraph(TemporalGraph):
         Returns:
             list -- List of edges in this graph
         """
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=True, sum_weights=False):
         for n1 in self:
             for n2 in self[n1]:
-                output.append((n1, n2, self[n1][n2]))
-        return output
+                yield (n1, n2, self[n1][n2])
    
     
     def contains_edge(self, edge):
@@ -119,35 +499,21 @@ class TemporalUnweightedGraph(TemporalGraph):
         """
         if not deep:
             return super(TemporalUnweightedGraph, self).copy(deep)
-        output = TemporalUnweightedGraph(self.directed)
-        output.add_edges(self.get_edges())
-        return output
-    def get_snapshot_graph(self, start_time, end_time):
-        assert start_time < end_time, "Start time should be less than end time"
-        output = WeightedGraph(self.directed, weight_is_list=False)
-        for source in self:
-            for target in self[source]:
-                for time in self[source][target]:
-                    if time >= start_time and time <= end_time:
-                        output.add_edge((source, target, 1.0))
-        return output
-    def get_evolution_snapshot_graph(self, timestamp):
-        output = WeightedGraph(self.directed, weight_is_list=False)
+        output = TemporalUnweightedGraph(self.directed, self.index_predecessors)
+        return self._copy_storage(output)
+    def _iter_cells(self):
         for source in self:
             for target in self[source]:
                 for time in self[source][target]:
-                    if time <= timestamp:
-                        output.add_edge((source, target, 1.0))
-        return output
+                    yield source, target, None, time, 1.0, 1.0, 1
     def get_column_names(self):
         return ("source", "target", "timestamp")
     def get_edgelist(self, data=True, sum_weights=False):
-        edges = self.get_edges()
-        output = []
-        for edge in edges:
-            for time in edge[2]:
-                output.append((edge[0], edge[1], time))
-        return output
+        return list(self.iter_edgelist(data, sum_weights))
+    def iter_edgelist(self, data=True, sum_weights=False):
+        for source, target, times in self.iter_edges():
+            for time in times:
+                yield (source, target, time)
     def to_visjs_format(self):
         nodes = list(self.get_nodes())
         edges = []
@@ -160,11 +526,26 @@ class TemporalUnweightedGraph(TemporalGraph):
         return "temporal-unweighted"
 
 class TemporalWeightedGraph(TemporalUnweightedGraph):
-    def __init__(self, directed, weight_is_list):
+    def __init__(self, directed, weight_is_list, index_predecessors=True, aggregate_weights=False, node_dictionary=None):
+        """Datastructure that represents temporal weighted graphs.
+        
+        Arguments:
+            directed {bool} -- True if graph is directed
+            weight_is_list {bool} -- True if all weights added to an edge at a timestamp are kept instead of their sum
+        
+        Keyword Arguments:
+            index_predecessors {bool} -- True if incoming edges of directed graph should be indexed (default: {True})
+            aggregate_weights {bool} -- If true, graphs with weight_is_list keep a WeightAggregate(count, sum, sum of
+                squares, min and max) per edge and timestamp instead of the list of weights (default: {False})
+            node_dictionary {NodeDictionary} -- Dictionary that maps the int nodes of this graph to node names (default: {None})
+        """
         self.weight_is_list = weight_is_list
-        super(TemporalWeightedGraph, self).__init__(directed)
+        self.aggregate_weights = weight_is_list and aggregate_weights
+        super(TemporalWeightedGraph, self).__init__(directed, index_predecessors, node_dictionary)
     def _get_factory(self):
-        if self.weight_is_list:
+        if self.aggregate_weights:
+            return defaultdict(lambda: defaultdict(WeightAggregate))
+        elif self.weight_is_list:
             return defaultdict(lambda: defaultdict(list))
         else:
             return defaultdict(lambda: defaultdict(float))
@@ -195,6 +576,8 @@ class TemporalWeightedGraph(TemporalUnweightedGraph):
                 self[target][source][time].append(weight)
             else:
                 self[target][source][time] += weight
+        self._index_edge(source, target)
+        self._time_index = None
         self.add_nodes([source, target])
 
     
@@ -208,7 +591,10 @@ class TemporalWeightedGraph(TemporalUnweightedGraph):
         self[source][target].pop(time)
        
         if not self.directed:
-            self[target][source].pop(time)
+            self[target][source].pop(time, None)
+            self._unindex_edge(target, source)
+        self._unindex_edge(source, target)
+        self._time_index = None
 
   
     def get_edges(self, data=True, sum_weights=False):
@@ -218,21 +604,18 @@ class TemporalWeightedGraph(TemporalUnweightedGraph):
         Returns:
             list -- List of edges in this graph
         """
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=True, sum_weights=False):
         for source in self:
             for target in self[source]:
                 for time in self[source][target]:
                     if self.weight_is_list:
                         if sum_weights:
-                            output.append((source, target, time, np.sum(self[source][target][time])))
+                            yield (source, target, time, weight_sum(self[source][target][time]))
                         else:
-                            output.append((source, target, time, np.mean(self[source][target][time])))
+                            yield (source, target, time, weight_mean(self[source][target][time]))
                     else:
-                        output.append((source, target, time, self[source][target][time]))
-
-
-                        
-        return output
+                        yield (source, target, time, self[source][target][time])
    
     
     def contains_edge(self, edge):
@@ -271,57 +654,42 @@ class TemporalWeightedGraph(TemporalUnweightedGraph):
         """
         if not deep:
             return super(TemporalWeightedGraph, self).copy(deep)
-        output = TemporalWeightedGraph(self.directed, self.weight_is_list)
-        output.add_edges(self.get_edges())
-        return output
-    def get_snapshot_graph(self, start_time, end_time):
-        assert start_time < end_time, "Start time should be less than end time"
-        output = WeightedGraph(self.directed, weight_is_list=False)
+        output = TemporalWeightedGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights)
+        return self._copy_storage(output)
+    def _iter_cells(self):
         for source in self:
             for target in self[source]:
-                for time in self[source][target]:
-                    if time >= start_time and time <= end_time:
-                        if self.weight_is_list:
-                            weights = self[source][target][time]
-                            if len(weights) > 0:
-                                output.add_edge((source, target, np.mean(weights)))
-                        else:
-                            output.add_edge((source, target, self[source][target][time]))
-        return output
-    def get_evolution_snapshot_graph(self, timestamp):
-        
-        output = WeightedGraph(self.directed, weight_is_list=False)
-        for source in self:
-            for target in self[source]:
-                for time in self[source][target]:
-                    if time <= timestamp:
-                        if self.weight_is_list:
-                            weights = self[source][target][time]
-                            if len(weights) > 0:
-                                output.add_edge((source, target, np.mean(weights)))
-                        else:
-                            output.add_edge((source, target, self[source][target][time]))
-        return output
+                for time, weights in self[source][target].items():
+                    if not self.weight_is_list:
+                        yield source, target, None, time, weights, weights, 1
+                    elif len(weights) > 0:
+                        yield source, target, None, time, weight_mean(weights), weight_sum(weights), len(weights)
     def get_column_names(self):
         return ("source", "target", "timestamp", "weight")
     def get_edgelist(self, data=True, sum_weights=False):
         return self.get_edges(data=data, sum_weights=sum_weights)
+    def iter_edgelist(self, data=True, sum_weights=False):
+        return self.iter_edges(data=data, sum_weights=sum_weights)
     def to_visjs_format(self):
         nodes = list(self.get_nodes())
         edges = []
         for source in self:
             for target in self[source]:
                 for timestamp in self[source][target]:
-                    edges.append({"from": source, "to": target, "timestamp": timestamp, "weight": self[source][target][timestamp]})
+                    edges.append({"from": source, "to": target, "timestamp": timestamp, "weight": weight_to_json(self[source][target][timestamp])})
         return {"nodes":nodes, "edges":edges}
     def get_graph_type(self):
         return "temporal-weighted"
 class TemporalMultiplexGraph(TemporalWeightedGraph):
-    def __init__(self, directed, weight_is_list):
+    def __init__(self, directed, weight_is_list, index_predecessors=True, aggregate_weights=False, node_dictionary=None):
         self.weight_is_list = weight_is_list
-        super(TemporalMultiplexGraph, self).__init__(directed, weight_is_list=weight_is_list)
+        self.aggregate_weights = weight_is_list and aggregate_weights
+        super(TemporalMultiplexGraph, self).__init__(directed, weight_is_list=weight_is_list, index_predecessors=index_predecessors, aggregate_weights=aggregate_weights, node_dictionary=node_dictionary)
+        self._relations = defaultdict(set)
     def _get_factory(self):
-        if self.weight_is_list:
+        if self.aggregate_weights:
+            return defaultdict(lambda: defaultdict(lambda: defaultdict(WeightAggregate)))
+        elif self.weight_is_list:
             return defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
         else:
             return defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
@@ -352,6 +720,11 @@ class TemporalMultiplexGraph(TemporalWeightedGraph):
                 self[target][source][relation][time].append(weight)
             else:
                 self[target][source][relation][time] += weight
+        self._index_edge(source, target)
+        self._index_relation(source, target, relation)
+        if not self.directed:
+            self._index_relation(target, source, relation)
+        self._time_index = None
         self.add_nodes([source, target])
 
     
@@ -363,9 +736,18 @@ class TemporalMultiplexGraph(TemporalWeightedGraph):
         """
         source, target, relation, time = edge
         self[source][target][relation].pop(time)
+        if len(self[source][target][relation]) == 0:
+            self[source][target].pop(relation)
        
         if not self.directed:
-            self[target][source][relation].pop(time)
+            self[target][source][relation].pop(time, None)
+            if len(self[target][source][relation]) == 0:
+                self[target][source].pop(relation)
+            self._unindex_edge(target, source)
+            self._unindex_relations(target, source, [relation])
+        self._unindex_edge(source, target)
+        self._unindex_relations(source, target, [relation])
+        self._time_index = None
 
   
     def get_edges(self, data=True, sum_weights=False):
@@ -375,20 +757,19 @@ class TemporalMultiplexGraph(TemporalWeightedGraph):
         Returns:
             list -- List of edges in this graph
         """
-        output = []
+        return list(self.iter_edges(data, sum_weights))
+    def iter_edges(self, data=True, sum_weights=False):
         for source in self:
             for target in self[source]:
                 for relation in self[source][target]:
                     for time in self[source][target][relation]:
                         if self.weight_is_list:
                             if sum_weights:
-                                output.append((source, target, relation, time, np.sum(self[source][target][relation][time])))
+                                yield (source, target, relation, time, weight_sum(self[source][target][relation][time]))
                             else:
-                                output.append((source, target, relation, time, np.mean(self[source][target][relation][time])))
+                                yield (source, target, relation, time, weight_mean(self[source][target][relation][time]))
                         else:
-                            output.append((source, target, relation, time, self[source][target][relation][time]))
-
-        return output
+                            yield (source, target, relation, time, self[source][target][relation][time])
    
     
     def contains_edge(self, edge):
@@ -427,43 +808,102 @@ class TemporalMultiplexGraph(TemporalWeightedGraph):
         """
         if not deep:
             return super(TemporalMultiplexGraph, self).copy(deep)
-        output = TemporalMultiplexGraph(self.directed, self.weight_is_list)
-        output.add_edges(self.get_edges())
-        return output
-    def get_snapshot_graph(self, start_time, end_time):
-        assert start_time < end_time, "Start time should be less than end time"
-        output = MultiplexGraph(self.directed, weight_is_list=False)
+        output = TemporalMultiplexGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights)
+        return self._copy_storage(output)
+    def _iter_cells(self):
         for source in self:
             for target in self[source]:
                 for relation in self[source][target]:
-                    for time in self[source][target][relation]:
-                        if time >= start_time and time <= end_time:
-                            if self.weight_is_list:
-                                weights = self[source][target][relation][time]
-                                if len(weights) > 0:
-                                    output.add_edge((source, target, relation, np.mean(weights)))
-                            else:
-                                weights = self[source][target][relation][time]
-                                output.add_edge((source, target, relation, weights))
-                                
+                    for time, weights in self[source][target][relation].items():
+                        if not self.weight_is_list:
+                            yield source, target, relation, time, weights, weights, 1
+                        elif len(weights) > 0:
+                            yield source, target, relation, time, weight_mean(weights), weight_sum(weights), len(weights)
+    def get_relations(self):
+        """Returns relation types(layers) which have at least one edge in this graph.
+        
+        Returns:
+            list -- Relation types of this graph
+        """
+        return list(self._relations)
+    def _new_layer_graph(self):
+        return TemporalWeightedGraph(self.directed, self.weight_is_list, self.index_predecessors, self.aggregate_weights, self.node_dictionary)
+    def _add_layer_edge(self, output, source, target, weights):
+        output[source][target] = copy_weight(weights)
+        output._index_edge(source, target)
+        output._nodes.update((source, target))
+        if len(weights) > 0:
+            output.start_timestamp = min(output.start_timestamp, min(weights.keys()))
+            output.end_timestamp = max(output.end_timestamp, max(weights.keys()))
+    def _iter_layer_edges(self, layer, data=True, sum_weights=False):
+        for source, target in self._relations.get(layer, ()):
+            for time, weight in self[source][target][layer].items():
+                if self.weight_is_list:
+                    if sum_weights:
+                        yield (source, target, time, weight_sum(weight))
+                    else:
+                        yield (source, target, time, weight_mean(weight))
+                else:
+                    yield (source, target, time, weight)
+    def get_layer(self, layer):
+        """Contracts temporal weighted graph from this graph where the edges are from specified layer of this graph.
+        Edges of the layer are found with the relation index, so the cost is proportional to the size of the layer.
+        
+        Arguments:
+            layer {str} -- Layer name(relation type)
+        
+        Returns:
+            TemporalWeightedGraph -- Graph constructed from a given layer of this graph
+        """
+        output = self._new_layer_graph()
+        for source, target in self._relations.get(layer, ()):
+            self._add_layer_edge(output, source, target, self[source][target][layer])
         return output
-    def get_evolution_snapshot_graph(self, timestamp):
-        output = MultiplexGraph(self.directed, weight_is_list=False)
+    def get_layers(self):
+        """Contracts temporal weighted graph of every layer of this graph in a single pass over the edges.
+        
+        Returns:
+            dict -- Maps layer name(relation type) to the TemporalWeightedGraph of that layer
+        """
+        output = {}
         for source in self:
             for target in self[source]:
-                for relation in self[source][target]:
-                    for time in self[source][target][relation]:
-                        if time <= timestamp:
-                            if self.weight_is_list:
-                                weights = self[source][target][relation][time]
-                                if len(weights) > 0:
-                                    output.add_edge((source, target, relation, np.mean(weights)))
-                            else:
-                                weights = self[source][target][relation][time]
-                                output.add_edge((source, target, relation, weights))
-                                
+                for relation, weights in self[source][target].items():
+                    if relation not in output:
+                        output[relation] = self._new_layer_graph()
+                    self._add_layer_edge(output[relation], source, target, weights)
         return output
+    def get_layer_view(self, layer):
+        """Returns read-only view of a layer of this graph. Unlike get_layer nothing is copied, so the view reflects
+        later changes of this graph.
+        
+        Arguments:
+            layer {str} -- Layer name(relation type)
         
+        Returns:
+            LayerView -- View of the given layer
+        """
+        return LayerView(self, layer)
+    def to_sparse_tensor(self, windows, format="csr", nodes=None, layer=None):
+        """Returns adjacency matrix of every time window, see TemporalGraph.to_sparse_tensor. Weights of parallel
+        edges of different layers are added up unless a single layer is selected.
+        
+        Arguments:
+            windows {iterable} -- (start_time, end_time) pairs
+        
+        Keyword Arguments:
+            format {str} -- SciPy sparse format (default: {"csr"})
+            nodes {list} -- Node order (default: {None})
+            layer {str} -- If given only the edges of this layer(relation type) are exported (default: {None})
+        
+        Returns:
+            list -- Sparse matrix of each window
+        """
+        return self._build_sparse_tensor(windows, format, nodes, layer)
+    def _new_snapshot_graph(self):
+        return MultiplexGraph(self.directed, weight_is_list=False, node_dictionary=self.node_dictionary)
+    def _snapshot_edges(self, index, sources, targets, relations, weights):
+        return zip(index.nodes[sources].tolist(), index.nodes[targets].tolist(), index.relation_names[relations].tolist(), weights.tolist())
     def get_column_names(self):
         return ("source", "target", "relation", "timestamp", "weight")
     def get_edgelist(self, data=True, sum_weights=False):
@@ -475,7 +915,7 @@ class TemporalMultiplexGraph(TemporalWeightedGraph):
             for target in self[source]:
                 for relation in self[source][target]:
                     for timestamp in self[source][target][relation]:
-                        edges.append({"from":source, "to":target, "relation":relation, "timestamp":timestamp, "weight":self[source][target][relation][timestamp]})
+                        edges.append({"from":source, "to":target, "relation":relation, "timestamp":timestamp, "weight":weight_to_json(self[source][target][relation][timestamp])})
         return {"nodes": nodes, "edges": edges}
     def get_graph_type(self):
         return "temporal-multiplex"
\ No newline at end of file
@@ -0,0 +1,519 @@
+"""
+Alias table random walks(DeepWalk, node2vec, multi-node2vec and temporal walks) over sparse adjacency matrices.
+Walks are int32 arrays with one walk per row, padded with -1.
+"""
+import multiprocessing
+import struct
+import numpy as np
+
+
+def build_alias_tables(indptr, weights):
+    """Builds alias table of every row of a CSR matrix(Vose's method). Drawing position k of a row uniformly and
+    keeping it with probability probabilities[k], else taking aliases[k], samples the row proportionally to weights.
+
+    Arguments:
+        indptr {numpy.ndarray} -- Row pointers of the CSR matrix
+        weights {numpy.ndarray} -- Non-negative weight of every stored entry
+
+    Raises:
+        ValueError: If a weight is negative
+
+    Returns:
+        tuple -- probabilities {numpy.ndarray} and aliases {numpy.ndarray}, both aligned with weights. Aliases are
+            positions within the row
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(weights) > 0 and weights.min() < 0:
+        raise ValueError("Alias tables need non-negative edge weights")
+    probabilities = np.ones(len(weights), dtype=np.float64)
+    aliases = np.zeros(len(weights), dtype=np.int32)
+    degrees = np.diff(indptr)
+    aliases[:] = np.arange(len(weights)) - np.repeat(indptr[:-1], degrees)
+    rows = np.flatnonzero(degrees > 1)
+    if len(rows) == 0:
+        return probabilities, aliases
+    starts = indptr[rows]
+    totals = np.add.reduceat(weights, starts)
+    # Uniform rows(and rows of zero weight) keep probability 1 for every entry
+    rows = rows[(totals > 0) & (np.minimum.reduceat(weights, starts) < np.maximum.reduceat(weights, starts))]
+    pairs = rows[degrees[rows] == 2]
+    if len(pairs) > 0:
+        # Rows of two entries: the lighter entry keeps twice its share and aliases the heavier one
+        firsts = indptr[pairs]
+        lighter = np.where(weights[firsts] < weights[firsts + 1], firsts, firsts + 1)
+        probabilities[lighter] = 2 * weights[lighter] / (weights[firsts] + weights[firsts + 1])
+        aliases[lighter] = 1 - (lighter - firsts)
+    for node in rows[degrees[rows] > 2].tolist():
+        start, end = indptr[node], indptr[node + 1]
+        row = weights[start:end]
+        total = row.sum()
+        scaled = (row * (len(row) / total)).tolist()
+        row_probabilities = [1.0] * len(row)
+        row_aliases = list(range(len(row)))
+        small = [position for position, value in enumerate(scaled) if value < 1.0]
+        large = [position for position, value in enumerate(scaled) if value >= 1.0]
+        while len(small) > 0 and len(large) > 0:
+            less, more = small.pop(), large.pop()
+            row_probabilities[less] = scaled[less]
+            row_aliases[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        probabilities[start:end] = row_probabilities
+        aliases[start:end] = row_aliases
+    return probabilities, aliases
+
+
+class Walker(object):
+    """Parent class of the walkers. Subclasses implement walk(start_nodes, walk_length, random_state) and set
+    num_nodes; this class runs walk over batches of start nodes, optionally in a pool of processes.
+    """
+    num_nodes = 0
+
+    def walk(self, start_nodes, walk_length, random_state=None):
+        raise NotImplementedError("Not implemented")
+
+    def _iter_batches(self, walk_length, num_walks, start_nodes, batch_size, seed):
+        seeds = np.random.SeedSequence(seed)
+        random_state = np.random.default_rng(seeds.spawn(1)[0])
+        for _ in range(num_walks):
+            order = random_state.permutation(start_nodes)
+            for start in range(0, len(order), batch_size):
+                yield order[start:start + batch_size], walk_length, seeds.spawn(1)[0]
+
+    def iter_walks(self, walk_length, num_walks=1, start_nodes=None, batch_size=10000, seed=None, workers=1):
+        """Yields walks in batches. Each of the num_walks passes starts one walk from every start node, in shuffled
+        order. With workers > 1 batches are generated by a pool of processes; the walker(with its alias tables) is
+        sent to each process once. See walk for the content of the yielded arrays.
+
+        Arguments:
+            walk_length {int} -- Number of nodes of each walk
+
+        Keyword Arguments:
+            num_walks {int} -- Number of walks per start node (default: {1})
+            start_nodes {numpy.ndarray} -- Node ids to start walks from, all nodes if None (default: {None})
+            batch_size {int} -- Number of walks per yielded array (default: {10000})
+            seed {int} -- Seed of the random number generators (default: {None})
+            workers {int} -- Number of processes (default: {1})
+
+        Yields:
+            numpy.ndarray -- int32 array of walks, one per row
+        """
+        start_nodes = np.arange(self.num_nodes, dtype=np.int32) if start_nodes is None else np.asarray(start_nodes, dtype=np.int32)
+        batches = self._iter_batches(walk_length, num_walks, start_nodes, batch_size, seed)
+        if workers <= 1:
+            for nodes, length, batch_seed in batches:
+                yield self.walk(nodes, length, np.random.default_rng(batch_seed))
+            return
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self,))
+        try:
+            for walks in pool.imap(_walk_batch, batches):
+                yield walks
+        finally:
+            pool.terminate()
+
+    def get_walks(self, walk_length, num_walks=1, start_nodes=None, batch_size=10000, seed=None, workers=1):
+        """Returns all walks of iter_walks as a single array(or tuple of arrays if walk returns a tuple).
+        """
+        batches = list(self.iter_walks(walk_length, num_walks, start_nodes, batch_size, seed, workers))
+        if len(batches) == 0:
+            return self.walk(np.zeros(0, dtype=np.int32), walk_length)
+        if isinstance(batches[0], tuple):
+            return tuple(np.concatenate(columns) for columns in zip(*batches))
+        return np.concatenate(batches)
+
+
+class RandomWalker(Walker):
+    def __init__(self, matrix, p=1, q=1, weighted=True):
+        """Initializes RandomWalker object. Alias tables of all nodes are built here, once.
+
+        With p == q == 1 walks are first order(DeepWalk): the next node is a neighbor drawn proportionally to edge
+        weight. Otherwise walks are second order(node2vec): the weight of going from v to x after coming from t is
+        multiplied by 1/p if x is t, by 1 if x is a neighbor of t and by 1/q otherwise. Second order steps are drawn
+        from the first order alias tables and accepted with probability bias / max(bias), which gives the same
+        transition probabilities as per-edge alias tables without their O(sum of squared degrees) memory.
+
+        Arguments:
+            matrix {scipy.sparse.spmatrix} -- Square adjacency matrix, e.g. graph.to_sparse()
+
+        Keyword Arguments:
+            p {float} -- Return parameter (default: {1})
+            q {float} -- In-out parameter (default: {1})
+            weighted {bool} -- If false every edge has the same weight (default: {True})
+        """
+        assert p > 0 and q > 0, "p and q should be positive"
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        self.p = p
+        self.q = q
+        self.num_nodes = matrix.shape[0]
+        self.indptr = matrix.indptr.astype(np.int64)
+        self.indices = matrix.indices.astype(np.int32)
+        self.degrees = np.diff(self.indptr)
+        weights = matrix.data if weighted else np.ones(len(self.indices))
+        self.probabilities, self.aliases = build_alias_tables(self.indptr, weights)
+        self._edge_keys = np.repeat(np.arange(self.num_nodes, dtype=np.int64), self.degrees) * self.num_nodes + self.indices
+
+    def has_edges(self, sources, targets):
+        """Returns true for every (source, target) pair that is an edge.
+        """
+        if len(self._edge_keys) == 0:
+            return np.zeros(len(sources), dtype=bool)
+        queries = sources.astype(np.int64) * self.num_nodes + targets
+        positions = np.minimum(np.searchsorted(self._edge_keys, queries), len(self._edge_keys) - 1)
+        return self._edge_keys[positions] == queries
+
+    def sample_neighbors(self, nodes, random_state):
+        """Draws a neighbor of every node proportionally to edge weight. Nodes without outgoing edges get -1.
+
+        Arguments:
+            nodes {numpy.ndarray} -- Node ids
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            numpy.ndarray -- Neighbor of every node
+        """
+        degrees = self.degrees[nodes]
+        output = np.full(len(nodes), -1, dtype=np.int32)
+        has_neighbors = degrees > 0
+        nodes, degrees = nodes[has_neighbors], degrees[has_neighbors]
+        starts = self.indptr[nodes]
+        edges = starts + (random_state.random(len(nodes)) * degrees).astype(np.int64)
+        keep = random_state.random(len(nodes)) < self.probabilities[edges]
+        edges = np.where(keep, edges, starts + self.aliases[edges])
+        output[has_neighbors] = self.indices[edges]
+        return output
+
+    def _second_order_step(self, previous, current, random_state):
+        output = np.full(len(current), -1, dtype=np.int32)
+        max_bias = max(1.0 / self.p, 1.0, 1.0 / self.q)
+        pending = np.flatnonzero(self.degrees[current] > 0)
+        while len(pending) > 0:
+            candidates = self.sample_neighbors(current[pending], random_state)
+            sources = previous[pending]
+            bias = np.where(candidates == sources, 1.0 / self.p, np.where(self.has_edges(sources, candidates), 1.0, 1.0 / self.q))
+            accepted = random_state.random(len(pending)) * max_bias < bias
+            output[pending[accepted]] = candidates[accepted]
+            pending = pending[~accepted]
+        return output
+
+    def walk(self, start_nodes, walk_length, random_state=None):
+        """Runs one walk from every start node.
+
+        Arguments:
+            start_nodes {numpy.ndarray} -- Node ids
+            walk_length {int} -- Number of nodes of each walk, including the start node
+
+        Keyword Arguments:
+            random_state {numpy.random.Generator} -- Source of randomness (default: {None})
+
+        Returns:
+            numpy.ndarray -- int32 array of shape (len(start_nodes), walk_length)
+        """
+        random_state = random_state if random_state is not None else np.random.default_rng()
+        walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+        if walk_length == 0:
+            return walks
+        walks[:, 0] = start_nodes
+        active = np.arange(len(start_nodes))
+        first_order = self.p == 1 and self.q == 1
+        for step in range(1, walk_length):
+            current = walks[active, step - 1]
+            if first_order or step == 1:
+                following = self.sample_neighbors(current, random_state)
+            else:
+                following = self._second_order_step(walks[active, step - 2], current, random_state)
+            walks[active, step] = following
+            active = active[following >= 0]
+            if len(active) == 0:
+                break
+        return walks
+
+
+class MultiplexRandomWalker(Walker):
+    def __init__(self, layers, layer_weights=None, switch_probability=0.5, p=1, q=1, weighted=True):
+        """Initializes MultiplexRandomWalker object. Walks move inside one layer(relation type) at a time and may
+        switch layers between steps(multi-node2vec). The layers are stacked into one block diagonal matrix, where
+        node v of layer l is row l * num_nodes + v, so the alias tables of all layers are built once, here, by a
+        single RandomWalker and are reused by every walk.
+
+        Before every step, and at the start node, the layer is redrawn with probability switch_probability; it is
+        always redrawn when the current node has no outgoing edge in the current layer. A layer is drawn among the
+        layers in which the current node has outgoing edges, proportionally to its layer weight. Inside a layer
+        steps are node2vec steps with parameters p and q, see RandomWalker.
+
+        Arguments:
+            layers {dict} -- Maps layer name(relation type) to its square adjacency matrix, e.g.
+                graph.to_sparse(per_layer=True). All matrices should have the same node order
+
+        Keyword Arguments:
+            layer_weights {dict} -- Maps layer name to non-negative weight, missing layers have weight 1 (default: {None})
+            switch_probability {float} -- Probability of redrawing the layer before a step (default: {0.5})
+            p {float} -- Return parameter (default: {1})
+            q {float} -- In-out parameter (default: {1})
+            weighted {bool} -- If false every edge has the same weight (default: {True})
+
+        Raises:
+            ValueError: If there is no layer or a layer weight is negative
+        """
+        from scipy import sparse
+        if len(layers) == 0:
+            raise ValueError("Multiplex random walks need at least one layer")
+        assert 0 <= switch_probability <= 1, "switch_probability should be between 0 and 1"
+        layer_weights = layer_weights if layer_weights is not None else {}
+        self.layers = list(layers)
+        self.layer_weights = np.array([layer_weights.get(layer, 1.0) for layer in self.layers], dtype=np.float64)
+        if self.layer_weights.min() < 0:
+            raise ValueError("Layer weights should be non-negative")
+        self.switch_probability = switch_probability
+        self.num_nodes = layers[self.layers[0]].shape[0]
+        self.layer_walker = RandomWalker(sparse.block_diag([layers[layer] for layer in self.layers], format="csr"), p, q, weighted)
+        # Row v holds the running total of the weights of the layers in which node v has outgoing edges
+        has_edges = self.layer_walker.degrees.reshape(len(self.layers), self.num_nodes).T > 0
+        self._layer_totals = np.cumsum(has_edges * self.layer_weights, axis=1)
+
+    def sample_layers(self, nodes, random_state):
+        """Draws a layer for every node among the layers in which it has outgoing edges, proportionally to layer
+        weight. Nodes without outgoing edges in layers of positive weight get -1.
+
+        Arguments:
+            nodes {numpy.ndarray} -- Node ids
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            numpy.ndarray -- Position of the drawn layer in self.layers
+        """
+        totals = self._layer_totals[nodes]
+        thresholds = random_state.random(len(nodes)) * totals[:, -1]
+        layers = np.minimum((totals <= thresholds[:, None]).sum(axis=1), len(self.layers) - 1)
+        return np.where(totals[:, -1] > 0, layers, -1).astype(np.int64)
+
+    def walk(self, start_nodes, walk_length, random_state=None):
+        """Runs one walk from every start node.
+
+        Arguments:
+            start_nodes {numpy.ndarray} -- Node ids
+            walk_length {int} -- Number of nodes of each walk, including the start node
+
+        Keyword Arguments:
+            random_state {numpy.random.Generator} -- Source of randomness (default: {None})
+
+        Returns:
+            numpy.ndarray -- int32 array of shape (len(start_nodes), walk_length)
+        """
+        random_state = random_state if random_state is not None else np.random.default_rng()
+        walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+        if walk_length == 0:
+            return walks
+        walks[:, 0] = start_nodes
+        layers = self.sample_layers(np.asarray(start_nodes, dtype=np.int64), random_state)
+        active = np.flatnonzero(layers >= 0)
+        walker = self.layer_walker
+        first_order = walker.p == 1 and walker.q == 1
+        for step in range(1, walk_length):
+            current = walks[active, step - 1].astype(np.int64)
+            current_layers = layers[active]
+            if step > 1:
+                switch = random_state.random(len(active)) < self.switch_probability
+                switch |= walker.degrees[current_layers * self.num_nodes + current] == 0
+                current_layers[switch] = self.sample_layers(current[switch], random_state)
+                layers[active] = current_layers
+                has_layer = current_layers >= 0
+                active, current, current_layers = active[has_layer], current[has_layer], current_layers[has_layer]
+            offsets = current_layers * self.num_nodes
+            if first_order or step == 1:
+                following = walker.sample_neighbors(offsets + current, random_state)
+            else:
+                following = walker._second_order_step(offsets + walks[active, step - 2], offsets + current, random_state)
+            walks[active, step] = np.where(following >= 0, following - offsets, -1)
+            active = active[following >= 0]
+            if len(active) == 0:
+                break
+        return walks
+
+
+class TemporalRandomWalker(Walker):
+    def __init__(self, sources, targets, times, num_nodes, bias="uniform", time_scale=None):
+        """Initializes TemporalRandomWalker object. Walks are time respecting(CTDNE): every step follows an edge
+        whose timestamp is greater than or equal to the timestamp of the previous step. Out-edges of every node are
+        kept sorted by timestamp, so the edges a walk may follow are a suffix of the out-edges of its current node,
+        found by binary search.
+
+        Among the valid edges the next one is drawn with the given bias:
+            uniform -- every valid edge is equally likely
+            linear -- the k-th valid edge in time order has weight n - k, n being the number of valid edges, so
+                edges close in time to the previous step are preferred
+            exponential -- an edge with timestamp t has weight exp(-(t - t0) / time_scale), t0 being the timestamp of
+                the earliest valid edge
+
+        Arguments:
+            sources {numpy.ndarray} -- Source node id of every timestamped edge
+            targets {numpy.ndarray} -- Target node id of every timestamped edge
+            times {numpy.ndarray} -- Timestamp of every edge
+            num_nodes {int} -- Number of nodes, node ids are in range(num_nodes)
+
+        Keyword Arguments:
+            bias {str} -- One of uniform, linear and exponential (default: {"uniform"})
+            time_scale {float} -- Decay time of the exponential bias, a tenth of the time span of the edges if None (default: {None})
+
+        Raises:
+            ValueError: If bias is not one of uniform, linear and exponential
+        """
+        if bias not in ["uniform", "linear", "exponential"]:
+            raise ValueError("Bias should be one of: uniform, linear and exponential, found: %s" % bias)
+        sources = np.asarray(sources, dtype=np.int64)
+        times = np.asarray(times, dtype=np.float64)
+        order = np.lexsort((times, sources))
+        self.bias = bias
+        self.num_nodes = num_nodes
+        self.indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=self.indptr[1:])
+        self.targets = np.asarray(targets, dtype=np.int32)[order]
+        self.times = times[order]
+        # Timestamps are replaced by their rank so that (node, time) pairs can be searched in one sorted int64 array
+        self._unique_times = np.unique(self.times)
+        self._keys = sources[order] * (len(self._unique_times) + 1) + np.searchsorted(self._unique_times, self.times)
+        if bias == "exponential":
+            if time_scale is None:
+                time_scale = max(self.times.max() - self.times.min(), 1.0) / 10 if len(self.times) > 0 else 1.0
+            self.time_scale = time_scale
+            self._levels = self._suffix_levels()
+
+    def _suffix_levels(self):
+        """Returns array which increases along the out-edges of every node, and from one node to the next, such that
+        levels[j] - levels[i] = log(total weight of the edges from i / total weight of the edges from j) for edges i
+        and j of the same node. Drawing the exponential bias then takes a single search in this array.
+        """
+        levels = np.zeros(len(self.times), dtype=np.float64)
+        base = 0.0
+        for node in np.flatnonzero(np.diff(self.indptr) > 0).tolist():
+            start, end = self.indptr[node], self.indptr[node + 1]
+            suffix_sums = np.logaddexp.accumulate((-self.times[start:end] / self.time_scale)[::-1])[::-1]
+            levels[start:end] = base + suffix_sums[0] - suffix_sums
+            base = levels[end - 1] + 1.0
+        return levels
+
+    def sample_edges(self, nodes, times, random_state):
+        """Draws for every node an out-edge with timestamp greater than or equal to the given time.
+
+        Arguments:
+            nodes {numpy.ndarray} -- Node ids
+            times {numpy.ndarray} -- Earliest allowed timestamp for every node
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            tuple -- Target(-1 if there is no valid edge) and timestamp of the drawn edge of every node
+        """
+        queries = nodes.astype(np.int64) * (len(self._unique_times) + 1) + np.searchsorted(self._unique_times, times)
+        low = np.searchsorted(self._keys, queries)
+        high = self.indptr[nodes.astype(np.int64) + 1]
+        counts = high - low
+        found = counts > 0
+        low, high, counts = low[found], high[found], counts[found]
+        random_values = random_state.random(len(low))
+        if self.bias == "uniform":
+            edges = low + np.minimum((random_values * counts).astype(np.int64), counts - 1)
+        elif self.bias == "linear":
+            # Weights counts, counts - 1, ..., 1: draw the weight m with probability proportional to m
+            thresholds = random_values * counts * (counts + 1) / 2
+            weights = np.minimum(np.floor((np.sqrt(8 * thresholds + 1) - 1) / 2).astype(np.int64) + 1, counts)
+            edges = low + counts - weights
+        else:
+            thresholds = self._levels[low] - np.log1p(-random_values)
+            edges = np.minimum(np.maximum(np.searchsorted(self._levels, thresholds), low + 1), high) - 1
+        targets = np.full(len(nodes), -1, dtype=np.int32)
+        edge_times = np.full(len(nodes), np.nan)
+        targets[found] = self.targets[edges]
+        edge_times[found] = self.times[edges]
+        return targets, edge_times
+
+    def walk(self, start_nodes, walk_length, random_state=None):
+        """Runs one time respecting walk from every start node. The first step may follow any out-edge of the start
+        node.
+
+        Arguments:
+            start_nodes {numpy.ndarray} -- Node ids
+            walk_length {int} -- Number of nodes of each walk, including the start node
+
+        Keyword Arguments:
+            random_state {numpy.random.Generator} -- Source of randomness (default: {None})
+
+        Returns:
+            tuple -- int32 array of walks of shape (len(start_nodes), walk_length), padded with -1, and float64 array
+                of the same shape holding the timestamp of the edge that led to each node(NaN for start nodes)
+        """
+        random_state = random_state if random_state is not None else np.random.default_rng()
+        walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+        times = np.full((len(start_nodes), walk_length), np.nan)
+        if walk_length == 0:
+            return walks, times
+        walks[:, 0] = start_nodes
+        active = np.arange(len(start_nodes))
+        current_times = np.full(len(start_nodes), -np.inf)
+        for step in range(1, walk_length):
+            following, following_times = self.sample_edges(walks[active, step - 1], current_times[active], random_state)
+            walks[active, step] = following
+            times[active, step] = following_times
+            current_times[active] = following_times
+            active = active[following >= 0]
+            if len(active) == 0:
+                break
+        return walks, times
+
+
+def save_walks(batches, output_path):
+    """Writes walk batches, e.g. walker.iter_walks(...), to a .npy file one batch at a time, so corpora larger than
+    memory can be written and later read back with np.load(output_path, mmap_mode="r"). Batches given as tuples
+    (as yielded by TemporalRandomWalker) are saved without their timestamps.
+
+    Arguments:
+        batches {iterable} -- int32 walk arrays of the same width
+        output_path {str} -- Path of the .npy file
+
+    Returns:
+        int -- Number of walks written
+    """
+    num_walks = 0
+    width = None
+    header_length = None
+    with open(output_path, "wb+") as output_file:
+        for batch in batches:
+            if isinstance(batch, tuple):
+                batch = batch[0]
+            if width is None:
+                width = batch.shape[1]
+                # Reserve room for the header, which is rewritten once the number of walks is known
+                header_length = len(_npy_header((np.iinfo(np.int64).max, width)))
+                output_file.write(b"\0" * header_length)
+            output_file.write(np.ascontiguousarray(batch, dtype=np.int32).tobytes())
+            num_walks += len(batch)
+        output_file.seek(0)
+        output_file.write(_npy_header((num_walks, width if width is not None else 0), header_length))
+    return num_walks
+
+
+def _npy_header(shape, length=None):
+    """Returns header of a version 1.0 .npy file holding int32 array of the given shape, padded with spaces to
+    length bytes(or to the next multiple of 64 bytes).
+    """
+    header = "{'descr': '<i4', 'fortran_order': False, 'shape': %r, }" % (tuple(int(size) for size in shape),)
+    if length is None:
+        length = (len(header) + 11 + 63) // 64 * 64
+    header = header.ljust(length - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+_worker_walker = None
+
+
+def _init_worker(walker):
+    global _worker_walker
+    _worker_walker = walker
+
+
+def _walk_batch(task):
+    nodes, walk_length, seed = task
+    return _worker_walker.walk(nodes, walk_length, np.random.default_rng(seed))
@@ -0,0 +1,155 @@
+"""
+Fixed size summaries of the weights added to an edge, kept instead of weight lists by graphs with aggregate_weights.
+"""
+from collections import defaultdict
+import numpy as np
+
+
+class WeightAggregate(object):
+    """Running count, sum, sum of squares, min and max of the weights added to an edge. Supports the list methods
+    used by the graphs(append, extend and len), so it can be used as the factory of weight_is_list graphs.
+    """
+    __slots__ = ("count", "sum", "sumsq", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_stats(cls, count, total, sumsq, minimum, maximum):
+        """Creates WeightAggregate from precomputed statistics, e.g. the result of a group-by.
+        """
+        output = cls()
+        output.count = int(count)
+        output.sum = float(total)
+        output.sumsq = float(sumsq)
+        output.min = float(minimum)
+        output.max = float(maximum)
+        return output
+
+    def append(self, weight):
+        """Adds a weight to this aggregate.
+
+        Arguments:
+            weight {float} -- Weight to add
+        """
+        if isinstance(weight, WeightAggregate):
+            self.merge(weight)
+            return
+        weight = float(weight)
+        self.count += 1
+        self.sum += weight
+        self.sumsq += weight * weight
+        if weight < self.min:
+            self.min = weight
+        if weight > self.max:
+            self.max = weight
+
+    def extend(self, weights):
+        """Adds list of weights, or all weights summarized by another aggregate, to this aggregate.
+
+        Arguments:
+            weights {list, WeightAggregate} -- Weights to add
+        """
+        if isinstance(weights, WeightAggregate):
+            self.merge(weights)
+            return
+        for weight in weights:
+            self.append(weight)
+
+    def merge(self, other):
+        """Adds all weights summarized by other aggregate to this aggregate.
+
+        Arguments:
+            other {WeightAggregate} -- Aggregate to merge
+        """
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self):
+        if self.count == 0:
+            return np.nan
+        return self.sum / self.count
+
+    def variance(self):
+        """Returns population variance of the weights.
+        """
+        if self.count == 0:
+            return np.nan
+        mean = self.sum / self.count
+        return max(self.sumsq / self.count - mean * mean, 0.0)
+
+    def copy(self):
+        return WeightAggregate.from_stats(self.count, self.sum, self.sumsq, self.min, self.max)
+
+    def to_dict(self):
+        return {"count": self.count, "sum": self.sum, "sumsq": self.sumsq, "min": self.min, "max": self.max, "mean": self.mean()}
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if not isinstance(other, WeightAggregate):
+            return NotImplemented
+        return (self.count, self.sum, self.sumsq, self.min, self.max) == (other.count, other.sum, other.sumsq, other.min, other.max)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "WeightAggregate(count=%d, sum=%r, sumsq=%r, min=%r, max=%r)" % (self.count, self.sum, self.sumsq, self.min, self.max)
+
+
+def weight_mean(weights):
+    """Returns mean of weights stored as list or WeightAggregate.
+    """
+    if isinstance(weights, WeightAggregate):
+        return weights.mean()
+    return np.mean(weights)
+
+
+def weight_sum(weights):
+    """Returns sum of weights stored as list or WeightAggregate.
+    """
+    if isinstance(weights, WeightAggregate):
+        return weights.sum
+    return np.sum(weights)
+
+
+def copy_weight(weights):
+    """Returns copy of edge weights(a number, list, WeightAggregate, set of timestamps or nested dict of those) that
+    shares no mutable state with the original. Values of a dict are expected to be all of the same kind.
+    """
+    if isinstance(weights, WeightAggregate):
+        return weights.copy()
+    if isinstance(weights, (list, set)):
+        return type(weights)(weights)
+    if isinstance(weights, dict):
+        factory = weights.default_factory if isinstance(weights, defaultdict) else None
+        first = next(iter(weights.values()), None)
+        if isinstance(first, (list, set)):
+            items = {key: value.copy() for key, value in weights.items()}
+        elif isinstance(first, (dict, WeightAggregate)):
+            items = {key: copy_weight(value) for key, value in weights.items()}
+        else:
+            # Numbers are immutable, so the dict can be copied in one call
+            items = weights
+        return defaultdict(factory, items) if factory is not None else dict(items)
+    return weights
+
+
+def weight_to_json(weights):
+    """Returns JSON serializable form of edge weights.
+    """
+    if isinstance(weights, WeightAggregate):
+        return weights.to_dict()
+    return weights
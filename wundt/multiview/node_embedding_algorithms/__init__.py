@@ -0,0 +1,3 @@
+from .skipgram import SkipGram
+from .line import LINE
+from .struc2vec import Struc2Vec
@@ -0,0 +1,125 @@
+"""
+LINE(Large-scale Information Network Embedding) with first and second order proximity, trained on edges drawn
+from an alias table.
+"""
+import numpy as np
+from wundt.multiview.datastructures.walks import build_alias_tables
+from .skipgram import SkipGram, get_noise_table, save_embeddings
+
+
+class LINE(object):
+    def __init__(self, graph, dimensions=128, order=2, negative=5, learning_rate=0.025, batch_size=1024, max_row_updates=32,
+                 noise_power=0.75, table_size=10000000, weighted=True, nodes=None, seed=None):
+        """Initializes LINE object. The edge alias table and the negative sampling table are built here.
+
+        Arguments:
+            graph {Graph, CompactGraph, scipy.sparse.spmatrix} -- Graph, or its square adjacency matrix(e.g.
+                graph.to_sparse()). Undirected graphs are trained on both directions of every edge
+
+        Keyword Arguments:
+            dimensions {int} -- Size of the embeddings of each order (default: {128})
+            order {int, str} -- 1, 2 or "both"; with "both" the embeddings of the two orders are normalized and
+                concatenated, giving 2 * dimensions values per node (default: {2})
+            negative {int} -- Number of negative nodes per edge (default: {5})
+            learning_rate {float} -- Initial learning rate, decayed linearly during training (default: {0.025})
+            batch_size {int} -- Number of edges per SGD step (default: {1024})
+            max_row_updates {int} -- See SkipGram (default: {32})
+            noise_power {float} -- Power of the degrees in the negative sampling distribution (default: {0.75})
+            table_size {int} -- Size of the negative sampling table (default: {10000000})
+            weighted {bool} -- If false every edge is drawn with the same probability (default: {True})
+            nodes {list} -- Node order of the exported matrix when a graph is given (default: {None})
+            seed {int} -- Seed of the random number generators (default: {None})
+
+        Raises:
+            ValueError: If order is not 1, 2 or "both", or if an edge weight is negative
+        """
+        if order not in [1, 2, "both"]:
+            raise ValueError("Order should be one of: 1, 2 and both, found: %s" % order)
+        if hasattr(graph, "to_sparse"):
+            self.node_order = graph.get_node_order(nodes)
+            matrix = graph.to_sparse(nodes=self.node_order)
+        else:
+            matrix = graph
+            self.node_order = range(matrix.shape[0])
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        self.num_nodes = matrix.shape[0]
+        self.sources = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(matrix.indptr))
+        self.targets = matrix.indices.astype(np.int32)
+        weights = matrix.data.astype(np.float64) if weighted else np.ones(len(self.targets))
+        # A single alias table over all edges
+        self.edge_probabilities, self.edge_aliases = build_alias_tables(np.array([0, len(weights)]), weights)
+        self.noise_table = get_noise_table(np.bincount(self.sources, weights, minlength=self.num_nodes), noise_power, table_size)
+        self.order = order
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.random_state = np.random.default_rng(seed)
+        self.models = {}
+        self.losses = {}
+        for model_order in ([1, 2] if order == "both" else [order]):
+            self.models[model_order] = SkipGram(self.num_nodes, dimensions, negative=negative, batch_size=batch_size,
+                                                max_row_updates=max_row_updates, seed=self.random_state.integers(2 ** 31))
+            self.losses[model_order] = []
+            if model_order == 1:
+                # First order has no context vectors: both ends of an edge use the node embeddings
+                self.models[model_order].output_weights = self.models[model_order].input_weights
+
+    @property
+    def embeddings(self):
+        """Embedding of every node, row i belongs to the i-th node of node_order.
+        """
+        if self.order != "both":
+            return self.models[self.order].embeddings
+        parts = [self.models[order].embeddings for order in [1, 2]]
+        return np.concatenate([part / np.maximum(np.linalg.norm(part, axis=1, keepdims=True), 1e-12) for part in parts], axis=1)
+
+    def sample_edges(self, size, random_state):
+        """Draws edges proportionally to weight.
+
+        Arguments:
+            size {int} -- Number of edges to draw
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            numpy.ndarray -- Positions of the drawn edges in sources and targets
+        """
+        edges = (random_state.random(size) * len(self.targets)).astype(np.int64)
+        keep = random_state.random(size) < self.edge_probabilities[edges]
+        return np.where(keep, edges, self.edge_aliases[edges])
+
+    def train(self, num_samples=None, verbose=False):
+        """Trains the embeddings of every order on num_samples edges drawn with replacement.
+
+        Keyword Arguments:
+            num_samples {int} -- Number of edges to train on, 100 times the number of edges if None (default: {None})
+            verbose {bool} -- If true the losses are printed after every tenth of the batches (default: {False})
+
+        Returns:
+            dict -- Mean loss of every order, which is also appended to losses[order]
+        """
+        num_samples = num_samples if num_samples is not None else 100 * len(self.targets)
+        losses = {order: 0.0 for order in self.models}
+        if len(self.targets) == 0 or num_samples == 0:
+            return losses
+        num_batches = (num_samples + self.batch_size - 1) // self.batch_size
+        for batch in range(num_batches):
+            size = min(self.batch_size, num_samples - batch * self.batch_size)
+            learning_rate = self.learning_rate * max(1 - batch / float(num_batches), 0.0001)
+            edges = self.sample_edges(size, self.random_state)
+            for order, model in self.models.items():
+                losses[order] += model.train_pairs(self.sources[edges], self.targets[edges], self.noise_table, learning_rate, self.random_state)
+            if verbose and ((batch + 1) % max(num_batches // 10, 1) == 0 or batch + 1 == num_batches):
+                trained = batch * self.batch_size + size
+                print("Trained on %d edges: %s" % (trained, ", ".join("order %d loss %.4f" % (order, losses[order] / trained) for order in self.models)))
+        output = {order: loss / num_samples for order, loss in losses.items()}
+        for order, loss in output.items():
+            self.losses[order].append(loss)
+        return output
+
+    def save_embeddings(self, output_path):
+        """Saves the embeddings in word2vec text format, one line per node of node_order.
+
+        Arguments:
+            output_path {str} -- Path of the output file
+        """
+        save_embeddings(self.embeddings, output_path, self.node_order)
@@ -0,0 +1,33 @@
+import argparse
+import os
+from wundt.multiview.utils.preprocess import load_config
+from wundt.multiview.preprocess import StaticGraphsBuilder
+from wundt.multiview.node_embedding_algorithms import LINE
+
+
+"""Trains LINE embeddings of the static graphs. Embeddings of every graph are saved in word2vec text format to
+<output_dir>/embeddings/<graph name>.emb; nodes are node ids of users-matadata.csv.
+"""
+
+
+def main(args):
+    config = load_config(args.config)
+    s_graph_builder = StaticGraphsBuilder(load_config(config["preprocess_config"]))
+    s_graph_builder.load_dataset()
+    output_dir = os.path.join(config["output_dir"], "embeddings")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    line_config = config["line"]
+    for graph_name in config["graphs"]:
+        print("Training LINE embeddings of %s graph" % graph_name)
+        model = LINE(s_graph_builder.graphs[graph_name], dimensions=line_config.get("dimensions", 128), order=line_config.get("order", 2),
+                    negative=line_config.get("negative", 5), learning_rate=line_config.get("learning_rate", 0.025),
+                    batch_size=line_config.get("batch_size", 1024), seed=line_config.get("seed"))
+        model.train(line_config.get("samples_per_edge", 100) * len(model.targets), verbose=True)
+        model.save_embeddings(os.path.join(output_dir, graph_name + ".emb"))
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config',default='wundt/multiview/node_embedding_algorithms/line_experiments/config.yml')
+    args = parser.parse_args()
+    main(args)
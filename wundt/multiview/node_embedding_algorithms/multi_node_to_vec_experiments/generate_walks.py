@@ -0,0 +1,43 @@
+import argparse
+import os
+from wundt.multiview.utils.preprocess import load_config
+from wundt.multiview.preprocess import StaticGraphsBuilder
+from wundt.multiview.datastructures import save_walks
+
+
+"""Generates cross-layer random walks(multi-node2vec) over the static multiplex graphs. Walks of every graph are
+saved to <output_dir>/walks/<graph name>.npy; entries are node ids of users-matadata.csv.
+"""
+
+
+def main(args):
+    config = load_config(args.config)
+    preprocess_config = load_config(config["preprocess_config"])
+    s_graph_builder = StaticGraphsBuilder(preprocess_config)
+    s_graph_builder.load_dataset()
+    output_dir = os.path.join(config["output_dir"], "walks")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    walk_config = config["walks"]
+    for graph_name in config["graphs"]:
+        graph = s_graph_builder.graphs[graph_name]
+        if graph.get_graph_type() != "multiplex":
+            raise ValueError("Graph '%s' is not a multiplex graph" % graph_name)
+        layer_weights = config["graphs"][graph_name].get("layer_weights", {})
+        relations = preprocess_config["static-graphs"][graph_name]["relations"]
+        for relation in layer_weights:
+            if relation not in relations:
+                raise ValueError("Unknown relation '%s' of graph '%s'" % (relation, graph_name))
+        print("Generating walks of %s graph" % graph_name)
+        walks = graph.multiplex_walk_generator(walk_config["walk_length"], walk_config["num_walks"], layer_weights=layer_weights,
+                        switch_probability=config["graphs"][graph_name].get("switch_probability", 0.5),
+                        p=walk_config.get("p", 1), q=walk_config.get("q", 1), batch_size=walk_config.get("batch_size", 10000),
+                        seed=walk_config.get("seed"), workers=walk_config.get("workers", 1))
+        num_walks = save_walks(walks, os.path.join(output_dir, graph_name + ".npy"))
+        print("Saved %d walks of %s graph" % (num_walks, graph_name))
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config',default='wundt/multiview/node_embedding_algorithms/multi_node_to_vec_experiments/config.yml')
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,34 @@
+import argparse
+import os
+import numpy as np
+from wundt.multiview.utils.preprocess import load_config
+from wundt.multiview.node_embedding_algorithms import SkipGram
+
+
+"""Trains skip-gram embeddings on the walks written by generate_walks.py. Embeddings of every graph are saved in
+word2vec text format to <output_dir>/embeddings/<graph name>.emb.
+"""
+
+
+def main(args):
+    config = load_config(args.config)
+    embedding_config = config["embedding"]
+    output_dir = os.path.join(config["output_dir"], "embeddings")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    for graph_name in config["graphs"]:
+        walks_path = os.path.join(config["output_dir"], "walks", graph_name + ".npy")
+        walks = np.load(walks_path, mmap_mode="r")
+        num_nodes = int(walks.max()) + 1 if walks.size > 0 else 0
+        print("Training embeddings of %s graph" % graph_name)
+        model = SkipGram(num_nodes, dimensions=embedding_config.get("dimensions", 128), window_size=embedding_config.get("window_size", 5),
+                        negative=embedding_config.get("negative", 5), learning_rate=embedding_config.get("learning_rate", 0.025),
+                        batch_size=embedding_config.get("batch_size", 1024), seed=embedding_config.get("seed"))
+        model.train(walks_path, epochs=embedding_config.get("epochs", 1), workers=embedding_config.get("workers", 1), verbose=True)
+        model.save_embeddings(os.path.join(output_dir, graph_name + ".emb"))
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config',default='wundt/multiview/node_embedding_algorithms/multi_node_to_vec_experiments/config.yml')
+    args = parser.parse_args()
+    main(args)
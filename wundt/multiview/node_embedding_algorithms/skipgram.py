@@ -0,0 +1,307 @@
+"""
+Skip-gram with negative sampling(word2vec) trained on random walk corpora with NumPy, the training back end of the
+walk based embeddings.
+"""
+import copy
+import multiprocessing
+import numpy as np
+
+
+class SkipGram(object):
+    def __init__(self, num_nodes, dimensions=128, window_size=5, negative=5, learning_rate=0.025, min_learning_rate=0.0001,
+                 batch_size=1024, max_row_updates=32, noise_power=0.75, table_size=10000000, seed=None):
+        """Initializes SkipGram object. Input vectors(the embeddings) start uniformly in [-0.5/dimensions,
+        0.5/dimensions) and output vectors at zero, as in word2vec.
+
+        Arguments:
+            num_nodes {int} -- Number of nodes, node ids are in range(num_nodes)
+
+        Keyword Arguments:
+            dimensions {int} -- Size of the embeddings (default: {128})
+            window_size {int} -- Largest distance between a center node and its context nodes. The distance used for
+                each center node is drawn uniformly between 1 and window_size (default: {5})
+            negative {int} -- Number of negative nodes per (center, context) pair (default: {5})
+            learning_rate {float} -- Initial learning rate, decayed linearly during training (default: {0.025})
+            min_learning_rate {float} -- Learning rate at the end of training (default: {0.0001})
+            batch_size {int} -- Number of (center, context) pairs per SGD step (default: {1024})
+            max_row_updates {int} -- Updates of a weight row within a step are summed, but rows updated more often
+                than this are scaled down to this many updates, which keeps small graphs from diverging (default: {32})
+            noise_power {float} -- Power of the node frequencies in the negative sampling distribution (default: {0.75})
+            table_size {int} -- Size of the negative sampling table (default: {10000000})
+            seed {int} -- Seed of the random number generators (default: {None})
+        """
+        self.num_nodes = num_nodes
+        self.dimensions = dimensions
+        self.window_size = window_size
+        self.negative = negative
+        self.learning_rate = learning_rate
+        self.min_learning_rate = min_learning_rate
+        self.batch_size = batch_size
+        self.max_row_updates = max_row_updates
+        self.noise_power = noise_power
+        self.table_size = table_size
+        self.seed = seed
+        random_state = np.random.default_rng(seed)
+        self.input_weights = ((random_state.random((num_nodes, dimensions), dtype=np.float32) - 0.5) / dimensions)
+        self.output_weights = np.zeros((num_nodes, dimensions), dtype=np.float32)
+        self.losses = []
+
+    @property
+    def embeddings(self):
+        """Embedding of every node, row i belongs to node id i.
+        """
+        return self.input_weights
+
+    def build_noise_table(self, walks, chunk_size=100000):
+        """Returns negative sampling table: node ids repeated proportionally to frequency^noise_power, so that a
+        uniformly drawn entry is a negative node. Nodes that never occur in the walks are never drawn.
+
+        Arguments:
+            walks {numpy.ndarray} -- Walks, one per row
+
+        Keyword Arguments:
+            chunk_size {int} -- Number of walks counted at a time (default: {100000})
+
+        Returns:
+            numpy.ndarray -- int32 table
+        """
+        counts = np.zeros(self.num_nodes, dtype=np.int64)
+        for start in range(0, len(walks), chunk_size):
+            chunk = np.asarray(walks[start:start + chunk_size])
+            counts += np.bincount(chunk[chunk >= 0], minlength=self.num_nodes)
+        return get_noise_table(counts, self.noise_power, self.table_size)
+
+    def train(self, walks, epochs=1, workers=1, chunk_size=1000, verbose=False):
+        """Trains the embeddings on a walk corpus. The walks are split into chunks of chunk_size walks, which are
+        trained in shuffled order, in parallel if workers > 1. The learning rate of a chunk depends on its position
+        in the whole run, so it decays the same way with any number of workers.
+
+        Arguments:
+            walks {numpy.ndarray, str} -- int walk array, one walk per row padded with -1, or path of a .npy file
+                written by save_walks, which is memory mapped instead of loaded
+
+        Keyword Arguments:
+            epochs {int} -- Number of passes over the walks (default: {1})
+            workers {int} -- Number of processes (default: {1})
+            chunk_size {int} -- Number of walks per task (default: {1000})
+            verbose {bool} -- If true the loss of every epoch is printed (default: {False})
+
+        Returns:
+            list -- Mean loss of every epoch, which is also appended to losses
+        """
+        walks_source = walks
+        if isinstance(walks, str):
+            walks = np.load(walks, mmap_mode="r")
+        noise_table = self.build_noise_table(walks)
+        seeds = np.random.SeedSequence(self.seed)
+        random_state = np.random.default_rng(seeds.spawn(1)[0])
+        num_chunks = (len(walks) + chunk_size - 1) // chunk_size
+        total_chunks = max(num_chunks * epochs, 1)
+        tasks = []
+        for epoch in range(epochs):
+            for position, chunk in enumerate(random_state.permutation(num_chunks).tolist()):
+                progress = (epoch * num_chunks + position) / float(total_chunks)
+                tasks.append((epoch, chunk * chunk_size, (chunk + 1) * chunk_size, self._get_learning_rate(progress),
+                              self._get_learning_rate(progress + 1.0 / total_chunks), seeds.spawn(1)[0]))
+        if workers <= 1:
+            _init_worker(self, self.input_weights, self.output_weights, walks_source if isinstance(walks_source, str) else walks, noise_table)
+            results = [_train_chunk(task) for task in tasks]
+        else:
+            results = self._train_shared(walks_source, noise_table, tasks, workers)
+        loss_sums = np.zeros(epochs)
+        pair_counts = np.zeros(epochs)
+        for (epoch, _, _, _, _, _), (loss_sum, pair_count) in zip(tasks, results):
+            loss_sums[epoch] += loss_sum
+            pair_counts[epoch] += pair_count
+        epoch_losses = (loss_sums / np.maximum(pair_counts, 1)).tolist()
+        if verbose:
+            for epoch, loss in enumerate(epoch_losses):
+                print("Epoch %d: loss %.4f over %d pairs" % (len(self.losses) + epoch, loss, pair_counts[epoch]))
+        self.losses.extend(epoch_losses)
+        return epoch_losses
+
+    def _get_learning_rate(self, progress):
+        return self.learning_rate - (self.learning_rate - self.min_learning_rate) * min(progress, 1.0)
+
+    def _train_shared(self, walks, noise_table, tasks, workers):
+        # Both weight matrices are copied to shared memory, trained by the pool and copied back
+        shared = []
+        for weights in [self.input_weights, self.output_weights]:
+            buffer = multiprocessing.RawArray("f", weights.size)
+            array = np.frombuffer(buffer, dtype=np.float32).reshape(weights.shape)
+            array[:] = weights
+            shared.append((buffer, array))
+        # The processes get the model without its weights, which they map from the shared buffers instead
+        model = copy.copy(self)
+        model.input_weights = model.output_weights = None
+        pool = multiprocessing.Pool(workers, initializer=_init_shared_worker,
+                                    initargs=(model, shared[0][0], shared[1][0], walks, noise_table))
+        try:
+            results = pool.map(_train_chunk, tasks, chunksize=1)
+        finally:
+            pool.terminate()
+        self.input_weights = shared[0][1].copy()
+        self.output_weights = shared[1][1].copy()
+        return results
+
+    def train_pairs(self, centers, contexts, noise_table, learning_rate, random_state):
+        """Runs one SGD step on (center, context) pairs and returns the summed loss.
+
+        Arguments:
+            centers {numpy.ndarray} -- Center node ids
+            contexts {numpy.ndarray} -- Context node id of every center
+            noise_table {numpy.ndarray} -- Negative sampling table, see build_noise_table
+            learning_rate {float} -- Learning rate of this step
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            float -- Sum of the negative sampling loss of the pairs
+        """
+        negatives = noise_table[random_state.integers(0, len(noise_table), (len(centers), self.negative))]
+        # Context node first, then the negatives, with labels 1 and 0
+        targets = np.concatenate([contexts[:, None], negatives], axis=1)
+        labels = np.zeros(targets.shape, dtype=np.float32)
+        labels[:, 0] = 1
+        center_vectors = self.input_weights[centers]
+        target_vectors = self.output_weights[targets]
+        scores = np.einsum("bd,bkd->bk", center_vectors, target_vectors)
+        probabilities = 1 / (1 + np.exp(-np.clip(scores, -10, 10)))
+        loss = -np.log(np.where(labels == 1, probabilities, 1 - probabilities) + 1e-7).sum()
+        gradients = (labels - probabilities) * np.float32(learning_rate)
+        pair_ids = np.arange(len(centers))
+        _scatter_add(self.input_weights, centers, pair_ids, np.ones(len(centers), dtype=np.float32),
+                     np.einsum("bk,bkd->bd", gradients, target_vectors), self.max_row_updates)
+        _scatter_add(self.output_weights, targets.ravel(), np.repeat(pair_ids, targets.shape[1]), gradients.ravel(), center_vectors,
+                     self.max_row_updates)
+        return float(loss)
+
+    def get_pairs(self, walks, random_state):
+        """Returns (center, context) pairs of walks in shuffled order. The window of every center node is drawn
+        uniformly between 1 and window_size, which weights close context nodes more(word2vec's dynamic window).
+
+        Arguments:
+            walks {numpy.ndarray} -- Walks, one per row padded with -1
+            random_state {numpy.random.Generator} -- Source of randomness
+
+        Returns:
+            tuple -- Center and context node ids
+        """
+        walks = np.asarray(walks, dtype=np.int32)
+        windows = random_state.integers(1, self.window_size + 1, walks.shape)
+        centers = []
+        contexts = []
+        for offset in range(1, min(self.window_size, walks.shape[1] - 1) + 1):
+            left, right = walks[:, :-offset], walks[:, offset:]
+            # Pairs in both directions: the left node as center, then the right node as center
+            for center, context, window in [(left, right, windows[:, :-offset]), (right, left, windows[:, offset:])]:
+                valid = (center >= 0) & (context >= 0) & (window >= offset)
+                centers.append(center[valid])
+                contexts.append(context[valid])
+        if len(centers) == 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        centers = np.concatenate(centers)
+        contexts = np.concatenate(contexts)
+        order = random_state.permutation(len(centers))
+        return centers[order], contexts[order]
+
+    def save_embeddings(self, output_path, nodes=None):
+        """Saves the embeddings in word2vec text format: a "<number of nodes> <dimensions>" line followed by one
+        "<node> <values>" line per node.
+
+        Arguments:
+            output_path {str} -- Path of the output file
+
+        Keyword Arguments:
+            nodes {list} -- Name written for every node id, the node id itself if None (default: {None})
+        """
+        save_embeddings(self.embeddings, output_path, nodes)
+
+
+def get_noise_table(counts, noise_power=0.75, table_size=10000000):
+    """Returns negative sampling table: node ids repeated proportionally to counts^noise_power, so that a uniformly
+    drawn entry is a negative node. Nodes of count 0 are never drawn.
+
+    Arguments:
+        counts {numpy.ndarray} -- Frequency(or degree) of every node id
+
+    Keyword Arguments:
+        noise_power {float} -- Power of the counts (default: {0.75})
+        table_size {int} -- Size of the table (default: {10000000})
+
+    Returns:
+        numpy.ndarray -- int32 table, empty if all counts are 0
+    """
+    frequencies = np.asarray(counts, dtype=np.float64) ** noise_power
+    if frequencies.sum() == 0:
+        return np.zeros(0, dtype=np.int32)
+    # Round the cumulative sums, so the table has exactly table_size entries
+    bounds = np.round(np.cumsum(frequencies) / frequencies.sum() * table_size).astype(np.int64)
+    return np.repeat(np.arange(len(frequencies), dtype=np.int32), np.diff(bounds, prepend=0))
+
+
+def save_embeddings(embeddings, output_path, nodes=None):
+    """Saves embeddings in word2vec text format: a "<number of nodes> <dimensions>" line followed by one
+    "<node> <values>" line per node.
+
+    Arguments:
+        embeddings {numpy.ndarray} -- Embedding of every node id, one per row
+        output_path {str} -- Path of the output file
+
+    Keyword Arguments:
+        nodes {list} -- Name written for every node id, the node id itself if None (default: {None})
+    """
+    nodes = nodes if nodes is not None else range(len(embeddings))
+    with open(output_path, "w+") as output_file:
+        output_file.write("%d %d\n" % embeddings.shape)
+        for node, vector in zip(nodes, embeddings):
+            output_file.write("%s %s\n" % (node, " ".join("%.6f" % value for value in vector)))
+
+
+def _scatter_add(weights, rows, columns, values, vectors, max_row_updates):
+    """Adds values[i] * vectors[columns[i]] to weights[rows[i]] for every i. The sum of a row updated more than
+    max_row_updates times is scaled by max_row_updates / number of updates. Updates are summed with a sparse matrix
+    product, which is much faster than numpy.add.at on rows of a matrix.
+    """
+    from scipy import sparse
+    order = np.argsort(rows)
+    rows = rows[order]
+    starts = np.flatnonzero(np.concatenate([[True], rows[1:] != rows[:-1]]))
+    indptr = np.append(starts, len(rows))
+    updates = sparse.csr_matrix((values[order], columns[order], indptr), shape=(len(starts), len(vectors))) @ vectors
+    weights[rows[starts]] += updates / np.maximum(1, np.diff(indptr) / float(max_row_updates)).astype(np.float32)[:, None]
+
+
+_worker_model = None
+_worker_walks = None
+_worker_noise_table = None
+
+
+def _init_worker(model, input_weights, output_weights, walks, noise_table):
+    global _worker_model, _worker_walks, _worker_noise_table
+    model.input_weights = input_weights
+    model.output_weights = output_weights
+    _worker_model = model
+    _worker_walks = np.load(walks, mmap_mode="r") if isinstance(walks, str) else walks
+    _worker_noise_table = noise_table
+
+
+def _init_shared_worker(model, input_buffer, output_buffer, walks, noise_table):
+    shape = (model.num_nodes, model.dimensions)
+    _init_worker(model, np.frombuffer(input_buffer, dtype=np.float32).reshape(shape),
+                 np.frombuffer(output_buffer, dtype=np.float32).reshape(shape), walks, noise_table)
+
+
+def _train_chunk(task):
+    _, start, end, start_learning_rate, end_learning_rate, seed = task
+    model = _worker_model
+    random_state = np.random.default_rng(seed)
+    centers, contexts = model.get_pairs(_worker_walks[start:end], random_state)
+    if len(centers) == 0 or len(_worker_noise_table) == 0:
+        return 0.0, 0
+    loss = 0.0
+    num_batches = (len(centers) + model.batch_size - 1) // model.batch_size
+    for batch in range(num_batches):
+        learning_rate = start_learning_rate + (end_learning_rate - start_learning_rate) * batch / float(num_batches)
+        batch_slice = slice(batch * model.batch_size, (batch + 1) * model.batch_size)
+        loss += model.train_pairs(centers[batch_slice], contexts[batch_slice], _worker_noise_table, learning_rate, random_state)
+    return loss, len(centers)
@@ -0,0 +1,344 @@
+"""
+struc2vec: embeddings of structural roles, learned from walks over a multi-layer context graph of degree sequence
+similarities.
+"""
+import hashlib
+import math
+import multiprocessing
+import os
+import numpy as np
+from wundt.multiview.datastructures.walks import Walker, RandomWalker
+
+
+class Struc2Vec(object):
+    def __init__(self, graph, num_layers=3, num_candidates=None, nodes=None, workers=1, cache_dir=None, block_size=512, verbose=False):
+        """Initializes Struc2Vec object and builds(or loads from cache_dir) the layers of the context graph. Edge
+        directions and weights of the graph are ignored.
+
+        Arguments:
+            graph {Graph, CompactGraph, scipy.sparse.spmatrix} -- Graph, or its square adjacency matrix
+
+        Keyword Arguments:
+            num_layers {int} -- Largest distance whose degree sequences are compared (default: {3})
+            num_candidates {int} -- Number of nodes following every node in degree order which it is compared with,
+                2 * ceil(log2(number of nodes)) if None (default: {None})
+            nodes {list} -- Node order of the exported matrix when a graph is given (default: {None})
+            workers {int} -- Number of processes computing DTW distances (default: {1})
+            cache_dir {str} -- Directory where the context graph is cached, no caching if None (default: {None})
+            block_size {int} -- Number of BFS sources processed together (default: {512})
+            verbose {bool} -- If true progress messages are printed (default: {False})
+        """
+        if hasattr(graph, "to_sparse"):
+            self.node_order = graph.get_node_order(nodes)
+            matrix = graph.to_sparse(nodes=self.node_order)
+        else:
+            matrix = graph
+            self.node_order = range(matrix.shape[0])
+        matrix = matrix.tocsr()
+        # Structure only: symmetric 0/1 adjacency without self loops
+        matrix = ((abs(matrix) + abs(matrix.T)) != 0).astype(np.int32).tocsr()
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+        self.adjacency = matrix
+        self.num_nodes = matrix.shape[0]
+        self.num_layers = num_layers
+        self.num_candidates = num_candidates if num_candidates is not None else 2 * int(math.ceil(math.log(max(self.num_nodes, 2), 2)))
+        self.workers = workers
+        self.block_size = block_size
+        self.verbose = verbose
+        self.layers = None
+        cache_path = self.get_cache_path(cache_dir) if cache_dir is not None else None
+        if cache_path is not None and os.path.exists(cache_path):
+            if self.verbose:
+                print("Loading struc2vec context graph from %s" % cache_path)
+            self.layers = self.load_layers(cache_path)
+        else:
+            self.layers = self.build_layers()
+            if cache_path is not None:
+                if not os.path.exists(cache_dir):
+                    os.makedirs(cache_dir)
+                self.save_layers(cache_path)
+
+    def get_cache_path(self, cache_dir):
+        """Returns path of the cached context graph: a hash of the graph structure and of the settings that change
+        the context graph.
+        """
+        digest = hashlib.sha1()
+        for array in [self.adjacency.indptr, self.adjacency.indices]:
+            digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+        digest.update(("%d-%d-%d" % (self.num_nodes, self.num_layers, self.num_candidates)).encode("utf-8"))
+        return os.path.join(cache_dir, "struc2vec-%s.npz" % digest.hexdigest()[:16])
+
+    def save_layers(self, output_path):
+        arrays = {}
+        for layer, matrix in enumerate(self.layers):
+            arrays["indptr_%d" % layer] = matrix.indptr
+            arrays["indices_%d" % layer] = matrix.indices
+            arrays["data_%d" % layer] = matrix.data
+        np.savez(output_path, num_layers=len(self.layers), **arrays)
+
+    def load_layers(self, input_path):
+        from scipy import sparse
+        with np.load(input_path) as arrays:
+            return [sparse.csr_matrix((arrays["data_%d" % layer], arrays["indices_%d" % layer], arrays["indptr_%d" % layer]),
+                                      shape=(self.num_nodes, self.num_nodes)) for layer in range(int(arrays["num_layers"]))]
+
+    def get_degree_sequences(self):
+        """Returns the compressed ordered degree sequence of every node at every distance 0..num_layers.
+
+        Returns:
+            list -- One (indptr, degrees, counts) triple per distance; the sequence of node u at that distance is
+                degrees[indptr[u]:indptr[u + 1]] in increasing order, with the number of nodes of each degree in counts
+        """
+        from scipy import sparse
+        degrees = np.diff(self.adjacency.indptr).astype(np.int64)
+        base = int(degrees.max()) + 1 if self.num_nodes > 0 else 1
+        parts = [[] for _ in range(self.num_layers + 1)]
+        for start in range(0, self.num_nodes, self.block_size):
+            sources = np.arange(start, min(start + self.block_size, self.num_nodes))
+            frontier = sparse.csr_matrix((np.ones(len(sources), dtype=np.int32), (np.arange(len(sources)), sources)),
+                                         shape=(len(sources), self.num_nodes))
+            visited = frontier
+            # Isolated nodes get empty sequences, so they are not similar to any node
+            connected = sources[degrees[sources] > 0]
+            parts[0].append((connected, degrees[connected], np.ones(len(connected), dtype=np.int64)))
+            for distance in range(1, self.num_layers + 1):
+                reached = (frontier @ self.adjacency) != 0
+                frontier = (reached.astype(np.int32) - reached.multiply(visited)).tocsr()
+                frontier.eliminate_zeros()
+                if frontier.nnz == 0:
+                    break
+                visited = visited + frontier
+                rows, columns = frontier.nonzero()
+                # (node, degree) keys sorted and counted give the compressed, ordered sequences
+                keys, counts = np.unique((rows + start).astype(np.int64) * base + degrees[columns], return_counts=True)
+                parts[distance].append((keys // base, keys % base, counts))
+        sequences = []
+        for distance_parts in parts:
+            nodes = np.concatenate([part[0] for part in distance_parts]) if len(distance_parts) > 0 else np.zeros(0, dtype=np.int64)
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(nodes, minlength=self.num_nodes), out=indptr[1:])
+            sequences.append((indptr,
+                              np.concatenate([part[1] for part in distance_parts]).astype(np.float64) if len(distance_parts) > 0 else np.zeros(0),
+                              np.concatenate([part[2] for part in distance_parts]).astype(np.float64) if len(distance_parts) > 0 else np.zeros(0)))
+        return sequences
+
+    def get_candidate_pairs(self):
+        """Returns the pairs of nodes whose distances are computed: every node with the num_candidates nodes that
+        follow it in degree order.
+
+        Returns:
+            tuple -- First and second node of every pair
+        """
+        order = np.argsort(np.diff(self.adjacency.indptr), kind="stable")
+        firsts = []
+        seconds = []
+        for shift in range(1, min(self.num_candidates, self.num_nodes - 1) + 1):
+            firsts.append(order[:-shift])
+            seconds.append(order[shift:])
+        if len(firsts) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(firsts).astype(np.int64), np.concatenate(seconds).astype(np.int64)
+
+    def get_distances(self, firsts, seconds, sequences):
+        """Returns structural distance of every pair at every layer: the DTW distances of the degree sequences at
+        distances 0..k summed. Layers where one of the nodes has no node at that distance get inf.
+
+        Returns:
+            numpy.ndarray -- Array of shape (num_layers + 1, number of pairs)
+        """
+        chunk_size = 50000
+        tasks = [(firsts[start:start + chunk_size], seconds[start:start + chunk_size]) for start in range(0, len(firsts), chunk_size)]
+        if self.workers <= 1:
+            _init_worker(sequences)
+            results = [_pair_distances(task) for task in tasks]
+        else:
+            pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(sequences,))
+            try:
+                results = pool.map(_pair_distances, tasks)
+            finally:
+                pool.terminate()
+        if len(results) == 0:
+            return np.zeros((len(sequences), 0))
+        return np.cumsum(np.concatenate(results, axis=1), axis=0)
+
+    def build_layers(self):
+        """Builds the layers of the context graph: layer k links the candidate pairs whose layer k distance is
+        finite, with weight exp(-distance).
+
+        Returns:
+            list -- Symmetric scipy.sparse.csr_matrix of every layer
+        """
+        from scipy import sparse
+        if self.verbose:
+            print("Computing degree sequences of %d nodes" % self.num_nodes)
+        sequences = self.get_degree_sequences()
+        firsts, seconds = self.get_candidate_pairs()
+        if self.verbose:
+            print("Computing structural distances of %d pairs" % len(firsts))
+        distances = self.get_distances(firsts, seconds, sequences)
+        layers = []
+        for layer in range(len(distances)):
+            defined = np.isfinite(distances[layer])
+            if layer > 0 and not defined.any():
+                break
+            weights = np.exp(-distances[layer][defined])
+            rows = np.concatenate([firsts[defined], seconds[defined]])
+            columns = np.concatenate([seconds[defined], firsts[defined]])
+            matrix = sparse.coo_matrix((np.concatenate([weights, weights]), (rows, columns)), shape=(self.num_nodes, self.num_nodes)).tocsr()
+            matrix.sum_duplicates()
+            layers.append(matrix)
+        return layers
+
+    def get_walker(self, stay_probability=0.3):
+        """Returns random walker over the layers of the context graph, see Struc2VecWalker.
+        """
+        return Struc2VecWalker(self.layers, stay_probability)
+
+    def walk_generator(self, walk_length=80, num_walks=10, stay_probability=0.3, batch_size=10000, seed=None, workers=1):
+        """Yields random walks over the context graph in batches. Walks are int32 arrays, one walk per row padded
+        with -1, whose entries are positions in node_order. Batches can be saved with save_walks and trained with
+        SkipGram.
+
+        Keyword Arguments:
+            walk_length {int} -- Number of nodes of each walk (default: {80})
+            num_walks {int} -- Number of walks started from every node (default: {10})
+            stay_probability {float} -- Probability of a step inside the current layer (default: {0.3})
+            batch_size {int} -- Number of walks per yielded array (default: {10000})
+            seed {int} -- Seed of the random number generators (default: {None})
+            workers {int} -- Number of processes generating walks (default: {1})
+
+        Returns:
+            generator -- Generator of int32 walk arrays
+        """
+        return self.get_walker(stay_probability).iter_walks(walk_length, num_walks, batch_size=batch_size, seed=seed, workers=workers)
+
+
+class Struc2VecWalker(Walker):
+    def __init__(self, layers, stay_probability=0.3):
+        """Initializes Struc2VecWalker object. With probability stay_probability a walk moves to a neighbor in the
+        current layer, drawn proportionally to edge weight, and records it. Otherwise it changes layer without
+        recording a node: up from layer k with probability log(x + e) / (log(x + e) + 1), x being the number of
+        edges of the node in layer k heavier than the mean edge weight of the layer, else down. Walks start in
+        layer 0. Alias tables of all layers are built once, on the block diagonal stack of the layers.
+
+        Arguments:
+            layers {list} -- Symmetric sparse matrix of every layer; edges of layer k + 1 are edges of layer k
+
+        Keyword Arguments:
+            stay_probability {float} -- Probability of a step inside the current layer (default: {0.3})
+        """
+        from scipy import sparse
+        assert stay_probability > 0, "stay_probability should be positive"
+        self.num_nodes = layers[0].shape[0]
+        self.num_layers = len(layers)
+        self.stay_probability = stay_probability
+        self.layer_walker = RandomWalker(sparse.block_diag(layers, format="csr"), 1, 1)
+        self.up_probabilities = np.zeros((self.num_layers, self.num_nodes))
+        for layer in range(self.num_layers - 1):
+            matrix = layers[layer].tocsr()
+            mean_weight = matrix.data.mean() if matrix.nnz > 0 else 0.0
+            rows = np.repeat(np.arange(self.num_nodes), np.diff(matrix.indptr))
+            heavy = np.log(np.bincount(rows[matrix.data > mean_weight], minlength=self.num_nodes) + np.e)
+            can_move_up = np.diff(layers[layer + 1].tocsr().indptr) > 0
+            self.up_probabilities[layer] = np.where(can_move_up, heavy / (heavy + 1), 0.0)
+
+    def walk(self, start_nodes, walk_length, random_state=None):
+        """Runs one walk from every start node.
+
+        Arguments:
+            start_nodes {numpy.ndarray} -- Node ids
+            walk_length {int} -- Number of nodes of each walk, including the start node
+
+        Keyword Arguments:
+            random_state {numpy.random.Generator} -- Source of randomness (default: {None})
+
+        Returns:
+            numpy.ndarray -- int32 array of shape (len(start_nodes), walk_length)
+        """
+        random_state = random_state if random_state is not None else np.random.default_rng()
+        walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+        if walk_length == 0:
+            return walks
+        walks[:, 0] = start_nodes
+        degrees = self.layer_walker.degrees
+        lengths = np.ones(len(start_nodes), dtype=np.int64)
+        layers = np.zeros(len(start_nodes), dtype=np.int64)
+        active = np.flatnonzero(degrees[np.asarray(start_nodes, dtype=np.int64)] > 0) if walk_length > 1 else np.zeros(0, dtype=np.int64)
+        while len(active) > 0:
+            nodes = walks[active, lengths[active] - 1].astype(np.int64)
+            current_layers = layers[active]
+            states = current_layers * self.num_nodes + nodes
+            has_edges = degrees[states] > 0
+            stay = (random_state.random(len(active)) < self.stay_probability) & has_edges
+            moving = active[stay]
+            walks[moving, lengths[moving]] = self.layer_walker.sample_neighbors(states[stay], random_state) - current_layers[stay] * self.num_nodes
+            lengths[moving] += 1
+            # Nodes without edges in their layer go down; layer 0 has edges for every active node
+            up = (random_state.random(len(active)) < self.up_probabilities[current_layers, nodes]) & has_edges
+            changing = ~stay
+            layers[active[changing & up]] += 1
+            down = changing & ~up & (current_layers > 0)
+            layers[active[down]] -= 1
+            active = active[lengths[active] < walk_length]
+        return walks
+
+
+_worker_sequences = None
+
+
+def _init_worker(sequences):
+    global _worker_sequences
+    _worker_sequences = sequences
+
+
+def _pair_distances(task):
+    firsts, seconds = task
+    return np.array([compressed_dtw(indptr, degrees, counts, firsts, seconds) for indptr, degrees, counts in _worker_sequences])
+
+
+def compressed_dtw(indptr, degrees, counts, firsts, seconds):
+    """Returns DTW distance between the compressed degree sequences of every pair (firsts[i], seconds[i]), inf when
+    one of the sequences is empty. Pairs are grouped by sequence lengths and every group runs the DTW recursion for
+    all of its pairs at once.
+
+    Arguments:
+        indptr {numpy.ndarray} -- Sequence pointers, see Struc2Vec.get_degree_sequences
+        degrees {numpy.ndarray} -- Degrees of the sequences
+        counts {numpy.ndarray} -- Number of nodes of every degree
+        firsts {numpy.ndarray} -- First node of every pair
+        seconds {numpy.ndarray} -- Second node of every pair
+
+    Returns:
+        numpy.ndarray -- Distance of every pair
+    """
+    lengths = np.diff(indptr)
+    first_lengths, second_lengths = lengths[firsts], lengths[seconds]
+    output = np.full(len(firsts), np.inf)
+    defined = (first_lengths > 0) & (second_lengths > 0)
+    # Lengths are rounded up to powers of two to form groups, which bounds the padding to a factor of two
+    groups = np.ceil(np.log2(np.maximum(first_lengths, 1))).astype(np.int64) * 64 + np.ceil(np.log2(np.maximum(second_lengths, 1))).astype(np.int64)
+    for group in np.unique(groups[defined]).tolist():
+        pairs = np.flatnonzero(defined & (groups == group))
+        first_length, second_length = first_lengths[pairs], second_lengths[pairs]
+        first_values, first_counts = _padded(indptr, degrees, counts, firsts[pairs], first_length.max())
+        second_values, second_counts = _padded(indptr, degrees, counts, seconds[pairs], second_length.max())
+        previous = np.full((len(pairs), second_values.shape[1] + 1), np.inf)
+        previous[:, 0] = 0
+        for i in range(first_values.shape[1]):
+            costs = (np.maximum(first_values[:, i:i + 1], second_values) / np.minimum(first_values[:, i:i + 1], second_values) - 1) * \
+                np.maximum(first_counts[:, i:i + 1], second_counts)
+            current = np.full(previous.shape, np.inf)
+            for j in range(second_values.shape[1]):
+                current[:, j + 1] = costs[:, j] + np.minimum(np.minimum(previous[:, j + 1], current[:, j]), previous[:, j])
+            # Padding only follows the real entries, so the distance of a pair is read at its own lengths
+            finished = first_length == i + 1
+            output[pairs[finished]] = current[finished, second_length[finished]]
+            previous = current
+    return output
+
+
+def _padded(indptr, degrees, counts, nodes, width):
+    positions = np.minimum(indptr[nodes][:, None] + np.arange(width), indptr[nodes + 1][:, None] - 1)
+    return degrees[positions], counts[positions]
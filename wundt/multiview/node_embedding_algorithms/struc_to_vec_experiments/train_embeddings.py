@@ -0,0 +1,43 @@
+import argparse
+import os
+from wundt.multiview.utils.preprocess import load_config
+from wundt.multiview.preprocess import StaticGraphsBuilder
+from wundt.multiview.datastructures import save_walks
+from wundt.multiview.node_embedding_algorithms import Struc2Vec, SkipGram
+
+
+"""Trains struc2vec embeddings of the static graphs. Walks of every graph are saved to
+<output_dir>/walks/<graph name>.npy and embeddings in word2vec text format to <output_dir>/embeddings/<graph name>.emb;
+nodes are node ids of users-matadata.csv.
+"""
+
+
+def main(args):
+    config = load_config(args.config)
+    s_graph_builder = StaticGraphsBuilder(load_config(config["preprocess_config"]))
+    s_graph_builder.load_dataset()
+    for directory in ["walks", "embeddings"]:
+        if not os.path.exists(os.path.join(config["output_dir"], directory)):
+            os.makedirs(os.path.join(config["output_dir"], directory))
+    struc2vec_config, walk_config, embedding_config = config["struc2vec"], config["walks"], config["embedding"]
+    for graph_name in config["graphs"]:
+        print("Building struc2vec context graph of %s graph" % graph_name)
+        model = Struc2Vec(s_graph_builder.graphs[graph_name], num_layers=struc2vec_config.get("num_layers", 3),
+                        num_candidates=struc2vec_config.get("num_candidates"), workers=struc2vec_config.get("workers", 1),
+                        cache_dir=config.get("cache_dir"), verbose=True)
+        walks_path = os.path.join(config["output_dir"], "walks", graph_name + ".npy")
+        walks = model.walk_generator(walk_config["walk_length"], walk_config["num_walks"], stay_probability=walk_config.get("stay_probability", 0.3),
+                        batch_size=walk_config.get("batch_size", 10000), seed=walk_config.get("seed"), workers=walk_config.get("workers", 1))
+        save_walks(walks, walks_path)
+        print("Training embeddings of %s graph" % graph_name)
+        skip_gram = SkipGram(model.num_nodes, dimensions=embedding_config.get("dimensions", 128), window_size=embedding_config.get("window_size", 5),
+                        negative=embedding_config.get("negative", 5), learning_rate=embedding_config.get("learning_rate", 0.025),
+                        seed=embedding_config.get("seed"))
+        skip_gram.train(walks_path, epochs=embedding_config.get("epochs", 1), workers=embedding_config.get("workers", 1), verbose=True)
+        skip_gram.save_embeddings(os.path.join(config["output_dir"], "embeddings", graph_name + ".emb"), model.node_order)
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config',default='wundt/multiview/node_embedding_algorithms/struc_to_vec_experiments/config.yml')
+    args = parser.parse_args()
+    main(args)
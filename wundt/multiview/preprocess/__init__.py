@@ -14,9 +14,99 @@ inside "People Analytics.xlsx" and "Actions.csv" files.
 Given the above two files this module will produce edge list file and json files for both temporal and static graphs. 
 """
 
-from wundt.multiview.utils.preprocess import display_error, array_softmax, get_topics_from_config, calculate_response_rate_weight, to_json_serializable
+from wundt.multiview.utils.preprocess import display_error, array_softmax, get_topics_from_config, calculate_response_rate_weight, to_json_serializable, save_edgelist, translate_network
+from wundt.multiview.utils.preprocess import save_npy_edgelist, load_npy_edgelist, save_parquet_edgelist, load_parquet_edgelist
+from wundt.multiview.utils.preprocess import SnapshotPackWriter, SnapshotParquetWriter, load_snapshot_pack
 from wundt.multiview.utils.preprocess  import MessageCategories, TopicType, MessageWrapper, UsersInfoWrapper
 
+def get_graph_header(graph, **kwargs):
+    """Returns description of a graph saved in binary formats: graph type, directedness, weight_is_list, time range
+    of temporal graphs and the given extra fields.
+    """
+    header = {
+        "graph_type": graph.get_graph_type(),
+        "directed": graph.directed,
+        "weight_is_list": getattr(graph, "weight_is_list", False)
+    }
+    if hasattr(graph, "start_timestamp"):
+        header["start_timestamp"] = float(graph.start_timestamp)
+        header["end_timestamp"] = float(graph.end_timestamp)
+    header.update(kwargs)
+    return header
+
+def load_temporal_edgelist(config, graph_name):
+    """Loads columns of a temporal graph saved by TemporalGraphsBuilder. If "parquet" is one of the graph save
+    formats the Parquet files are read, only the edges within dataset.load_time_range if that is set. Otherwise
+    if "npy" is one of the formats the binary columns are memory mapped, else the csv edgelist is parsed.
+
+    Arguments:
+        config {dict} -- Configuration
+        graph_name {str} -- Name of the temporal graph
+
+    Returns:
+        dict -- Maps column names(source, target, timestamp and, depending on the graph, relation and weight) to arrays
+    """
+    temporal_dir = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal")
+    if "parquet" in config["dataset"]["graph_save_format"]:
+        start_time, end_time = config["dataset"].get("load_time_range") or (None, None)
+        _, columns = load_parquet_edgelist(os.path.join(temporal_dir, "parquet", "graph=" + graph_name), start_time, end_time)
+        return columns
+    if "npy" in config["dataset"]["graph_save_format"]:
+        _, columns = load_npy_edgelist(os.path.join(temporal_dir, "npy", graph_name))
+        return columns
+    t_graph_df = pd.read_csv(os.path.join(temporal_dir, "edgelists", graph_name + ".csv"), sep=",", header=0)
+    return {name: t_graph_df[name].to_numpy() for name in t_graph_df.columns}
+
+def add_edges_from_columns(graph, columns, node_dictionary):
+    """Adds edges loaded by load_temporal_edgelist to a graph, interning the node names with node_dictionary.
+    """
+    graph.add_edges_from_arrays(
+        node_dictionary.get_ids(columns["source"].astype(int)),
+        node_dictionary.get_ids(columns["target"].astype(int)),
+        relations=columns.get("relation"),
+        timestamps=columns.get("timestamp"),
+        weights=columns.get("weight"))
+
+def load_snapshot_graph(input_path, index, node_dictionary=None, header=None):
+    """Builds snapshot graph index of a snapshot pack file written by TemporalSnapshotGraphsBuilder, reading only
+    the edges of that snapshot. Its time range is header["ranges"][index].
+
+    Arguments:
+        input_path {str} -- Path of the snapshot pack file
+        index {int} -- Index of the snapshot
+
+    Keyword Arguments:
+        node_dictionary {NodeDictionary} -- If given the node names are interned with it (default: {None})
+        header {dict} -- Header of the file, see read_snapshot_pack_header; read from the file if None (default: {None})
+
+    Returns:
+        Graph -- Unweighted, weighted or multiplex graph
+    """
+    header, columns = load_snapshot_pack(input_path, snapshots=index, header=header)
+    directed = header.get("directed", False)
+    graph_type = header.get("graph_type", "weighted")
+    if graph_type == "unweighted":
+        graph = datastructures.UnweightedGraph(directed=directed, node_dictionary=node_dictionary)
+    elif graph_type == "weighted":
+        graph = datastructures.WeightedGraph(directed=directed, node_dictionary=node_dictionary)
+    elif graph_type == "multiplex":
+        graph = datastructures.MultiplexGraph(directed=directed, node_dictionary=node_dictionary)
+    else:
+        raise ValueError("Unrecognized graph type:'%s'"%graph_type)
+    if not directed:
+        # Undirected edges are saved in both directions
+        keep = columns["source"] <= columns["target"]
+        columns = {name: column[keep] for name, column in columns.items()}
+        if "weight" in columns:
+            # Self loops of undirected graphs are saved with the doubled weight the graph stores, which adding
+            # them would double again
+            columns["weight"] = np.where(columns["source"] == columns["target"], columns["weight"] / 2.0, columns["weight"])
+    if node_dictionary is not None:
+        add_edges_from_columns(graph, columns, node_dictionary)
+    else:
+        graph.add_edges_from_arrays(columns["source"], columns["target"], relations=columns.get("relation"), weights=columns.get("weight"))
+    return graph
+
 
 class TemporalGraphsBuilder(object):
     def __init__(self, config):
@@ -55,41 +145,54 @@ class TemporalGraphsBuilder(object):
                 index2topic[channel][index_by_channel] =  topic
         prev_m_wrapper = None
         self.graphs = self._init_graphs()
+        self._edge_buffers = {graph_name: [] for graph_name in self.graphs}
         for index, row in messages_df.iterrows():
             channel_num_topics = self.config["channels"][row["channel"]]["num_topics"]
             current_m_wrapper = MessageWrapper(self.users_info_wrapper, row, index2topic, channel_num_topics)
             self._add_edges(prev_m_wrapper, current_m_wrapper)
             prev_m_wrapper = current_m_wrapper
+        for graph_name in self.graphs:
+            self._add_buffered_edges(graph_name)
         self.slack_id2username = slack_id2username
 
+    def _add_buffered_edges(self, graph_name):
+        """Adds edges collected by _add_edges to the graph in one bulk operation.
+        """
+        edges = self._edge_buffers.pop(graph_name)
+        if len(edges) == 0:
+            return
+        graph = self.graphs[graph_name]
+        columns = dict(zip(graph.get_column_names(), map(list, zip(*edges))))
+        graph.add_edges_from_arrays(columns["source"], columns["target"], relations=columns.get("relation"), timestamps=columns.get("timestamp"), weights=columns.get("weight"))
+
 
     def _add_edges(self, prev_m_wrapper, current_m_wrapper):
 
-        source_node = self.users_info_wrapper.get_default_node_name(current_m_wrapper.source_user["hashcode"], self.config)
-        target_node = self.users_info_wrapper.get_default_node_name(current_m_wrapper.target_user["hashcode"], self.config)
+        source_node = self.users_info_wrapper.get_default_node_id(current_m_wrapper.source_user["hashcode"], self.config)
+        target_node = self.users_info_wrapper.get_default_node_id(current_m_wrapper.target_user["hashcode"], self.config)
         timestamp = current_m_wrapper.date_time.timestamp()
-        self.graphs["connected"].add_edge((source_node, target_node, timestamp))
-        self.graphs["undirected"].add_edge((source_node, target_node, timestamp, 1))
-        self.graphs["directed"].add_edge((source_node, target_node, timestamp, 1))
+        self._edge_buffers["connected"].append((source_node, target_node, timestamp))
+        self._edge_buffers["undirected"].append((source_node, target_node, timestamp, 1))
+        self._edge_buffers["directed"].append((source_node, target_node, timestamp, 1))
         if current_m_wrapper.message_type == "Direct Mention":
-            self.graphs["mention"].add_edge((source_node, target_node, timestamp, 1))
+            self._edge_buffers["mention"].append((source_node, target_node, timestamp, 1))
         
-        self.graphs["sentiment_directed"].add_edge((source_node, target_node, timestamp, current_m_wrapper.sentiment_weight))
-        self.graphs["sentiment_undirected"].add_edge((source_node, target_node, timestamp, current_m_wrapper.sentiment_weight))
+        self._edge_buffers["sentiment_directed"].append((source_node, target_node, timestamp, current_m_wrapper.sentiment_weight))
+        self._edge_buffers["sentiment_undirected"].append((source_node, target_node, timestamp, current_m_wrapper.sentiment_weight))
         message_categories = current_m_wrapper.message_categories
         message_category_edges = []
         for category in message_categories:
             message_category_edges.append((source_node, target_node, category, timestamp, message_categories[category]))
-        self.graphs["message_category"].add_edges(message_category_edges)
+        self._edge_buffers["message_category"].extend(message_category_edges)
 
         message_topics = current_m_wrapper.message_topics
         message_topics_edges = []
         for topic in message_topics:
             message_topics_edges.append((source_node, target_node, topic, timestamp, message_topics[topic]))
-        self.graphs["topic_category"].add_edges(message_topics_edges)
+        self._edge_buffers["topic_category"].extend(message_topics_edges)
 
         if prev_m_wrapper is not None:
-            prev_message_source_node = self.users_info_wrapper.get_default_node_name(prev_m_wrapper.source_user["hashcode"], self.config)
+            prev_message_source_node = self.users_info_wrapper.get_default_node_id(prev_m_wrapper.source_user["hashcode"], self.config)
             current_channel = current_m_wrapper.channel
             prev_channel = prev_m_wrapper.channel
             
@@ -100,9 +203,9 @@ class TemporalGraphsBuilder(object):
                 response_weight = calculate_response_rate_weight(timestamp, prev_message_timestamp, self.config["temporal-graphs"]["response_rate"])
 
                 response_rate_edge = (source_node, prev_message_source_node, timestamp, response_weight)
-                self.graphs["response_rate"].add_edge(response_rate_edge)
+                self._edge_buffers["response_rate"].append(response_rate_edge)
                 reply_edge = (source_node, prev_message_source_node, timestamp, 1)
-                self.graphs["reply"].add_edge(reply_edge)
+                self._edge_buffers["reply"].append(reply_edge)
 
 
     def _load_reaction_data(self):
@@ -150,20 +253,21 @@ class TemporalGraphsBuilder(object):
    
     def _init_graphs(self):
         output = {}
+        node_dictionary = self.users_info_wrapper.node_dictionary
         for graph_name in self.config["temporal-graphs"]:
             graph_type = self.config["temporal-graphs"][graph_name]["graph_type"]
             directed = self.config["temporal-graphs"][graph_name]["directed"]
 
             if graph_type == "temporal_unweighted":
-                output[graph_name] = datastructures.TemporalUnweightedGraph(directed=directed)
+                output[graph_name] = datastructures.TemporalUnweightedGraph(directed=directed, node_dictionary=node_dictionary)
             elif graph_type == "temporal_weighted":
                 weight_type = locate(self.config["temporal-graphs"][graph_name]["weight_type"])
-                output[graph_name] = datastructures.TemporalWeightedGraph(directed=directed, weight_is_list=weight_type==list)
+                output[graph_name] = datastructures.TemporalWeightedGraph(directed=directed, weight_is_list=weight_type==list, aggregate_weights=self.config["temporal-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
                 
             elif graph_type == "temporal_multiplex":
                 weight_type = locate(self.config["temporal-graphs"][graph_name]["weight_type"])
                 relations = self.config["temporal-graphs"][graph_name]["relations"]
-                output[graph_name] = datastructures.TemporalMultiplexGraph(directed=directed, weight_is_list=weight_type == list)
+                output[graph_name] = datastructures.TemporalMultiplexGraph(directed=directed, weight_is_list=weight_type == list, aggregate_weights=self.config["temporal-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
         return output
     def include_node_metadata(self, nodes):
         output = []
@@ -179,30 +283,46 @@ class TemporalGraphsBuilder(object):
         if not os.path.exists(os.path.join(output_dir, "jsons")):
             os.makedirs(os.path.join(output_dir, "jsons"))
         for graph_name in self.graphs:
-            network = self.graphs[graph_name].to_visjs_format()
+            network = translate_network(self.graphs[graph_name].to_visjs_format(), self.graphs[graph_name].node_dictionary)
             nodes = self.include_node_metadata(network["nodes"])
             network["nodes"] = nodes
             with open(os.path.join(output_dir, "jsons", graph_name + ".json"), "w+") as output_file:
                 json.dump(network, output_file)
 
+    def _iter_graph_edgelist(self, graph_name):
+        if self.config["temporal-graphs"][graph_name]["graph_type"] == "temporal_weighted":
+            if self.config["temporal-graphs"][graph_name]["weight_type"] == "list":
+                return self.graphs[graph_name].iter_edgelist(data=True, sum_weights=False)
+            else:
+                return self.graphs[graph_name].iter_edgelist(data=True, sum_weights=True)
+        else:
+            return self.graphs[graph_name].iter_edgelist(data=True)
+
     def save_graphs2edgelist(self, output_dir):
         if not os.path.exists(os.path.join(output_dir, "edgelists")):
             os.makedirs(os.path.join(output_dir, "edgelists"))
         for graph_name in self.graphs:
-            with open(os.path.join(output_dir, "edgelists", graph_name + ".csv"), "w+") as output_file:
-                columns = self.graphs[graph_name].get_column_names()
-                header = ",".join(columns)
-                output_file.write(header + "\n")
-                if self.config["temporal-graphs"][graph_name]["graph_type"] == "temporal_weighted":
-                    if self.config["temporal-graphs"][graph_name]["weight_type"] == "list":
-                        edges = self.graphs[graph_name].get_edgelist(data=True, sum_weights=False)
-                    else:
-                        edges = self.graphs[graph_name].get_edgelist(data=True, sum_weights=True)
-                        
-                else:
-                    edges = self.graphs[graph_name].get_edgelist(data=True)
-                for edge in edges:
-                    output_file.write(",".join(list(map(str,edge)))+"\n")
+            columns = self.graphs[graph_name].get_column_names()
+            edges = self._iter_graph_edgelist(graph_name)
+            save_edgelist(edges, columns, os.path.join(output_dir, "edgelists", graph_name + ".csv"), node_dictionary=self.graphs[graph_name].node_dictionary)
+
+    def save_graphs2npy(self, output_dir):
+        """Saves every temporal graph as binary columns(see save_npy_edgelist) under output_dir/npy/<graph name>.
+        """
+        for graph_name in self.graphs:
+            graph = self.graphs[graph_name]
+            save_npy_edgelist(self._iter_graph_edgelist(graph_name), graph.get_column_names(), os.path.join(output_dir, "npy", graph_name),
+                              header=get_graph_header(graph), node_dictionary=graph.node_dictionary)
+
+    def save_graphs2parquet(self, output_dir):
+        """Saves every temporal graph as Parquet files partitioned into time buckets of dataset.parquet_bucket_units
+        under output_dir/parquet/graph=<graph name>, see save_parquet_edgelist.
+        """
+        bucket_size = self.config["dataset"].get("parquet_bucket_units", 7776000)
+        for graph_name in self.graphs:
+            graph = self.graphs[graph_name]
+            save_parquet_edgelist(self._iter_graph_edgelist(graph_name), graph.get_column_names(), os.path.join(output_dir, "parquet", "graph=" + graph_name),
+                                  header=get_graph_header(graph), bucket_size=bucket_size, node_dictionary=graph.node_dictionary)
         
         
     def save_graphs(self):
@@ -224,6 +344,10 @@ class TemporalGraphsBuilder(object):
             self._save_graphs2json(output_dir)
         if "edgelist" in formats:
             self.save_graphs2edgelist(output_dir)
+        if "npy" in formats:
+            self.save_graphs2npy(output_dir)
+        if "parquet" in formats:
+            self.save_graphs2parquet(output_dir)
         self.save_users_meta()
         
         
@@ -244,43 +368,27 @@ class StaticGraphsBuilder(object):
 
         self.users_info_wrapper = UsersInfoWrapper()
         self.users_info_wrapper.build_from_metadata(os.path.join(self.config["dataset"]["output_dir"], "users-matadata.csv"))
+        node_dictionary = self.users_info_wrapper.node_dictionary
 
         for graph_name in self.config["static-graphs"]:
             print("Loading %s temporal graph"%graph_name)
-            t_graph_edgelist_path = os.path.join(self.config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", graph_name + ".csv")
-            t_graph_df = pd.read_csv(t_graph_edgelist_path, sep=",", header=0)
+            t_graph_columns = load_temporal_edgelist(self.config, graph_name)
             graph_type = self.config["static-graphs"][graph_name]["graph_type"]
             directed = self.config["static-graphs"][graph_name]["directed"]
             if graph_type == "unweighted":
-                self.graphs[graph_name] = datastructures.UnweightedGraph(directed=directed)
+                self.graphs[graph_name] = datastructures.UnweightedGraph(directed=directed, node_dictionary=node_dictionary)
             elif graph_type == "weighted":
                 weight_type = locate(self.config["static-graphs"][graph_name]["weight_type"])
-                self.graphs[graph_name] = datastructures.WeightedGraph(directed=directed, weight_is_list=weight_type==list)
+                self.graphs[graph_name] = datastructures.WeightedGraph(directed=directed, weight_is_list=weight_type==list, aggregate_weights=self.config["static-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
                 
             elif graph_type == "multiplex":
                 weight_type = locate(self.config["static-graphs"][graph_name]["weight_type"])
                 relations = self.config["static-graphs"][graph_name]["relations"]
-                self.graphs[graph_name] = datastructures.MultiplexGraph(directed=directed, weight_is_list=weight_type == list)
+                self.graphs[graph_name] = datastructures.MultiplexGraph(directed=directed, weight_is_list=weight_type == list, aggregate_weights=self.config["static-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
+            else:
+                raise ValueError("Unrecognized graph type:'%s'"%graph_type)
             print("Building %s static graph"%graph_name)
-            for index, row in t_graph_df.iterrows():
-                source = int(row["source"])
-                target = int(row["target"])
-                timestamp = row["timestamp"]
-                if graph_type == "unweighted":
-                    self.graphs[graph_name].add_edge((source, target))
-                elif graph_type == "weighted":
-                    weight = row["weight"]
-                    if (type(weight) == dict):
-                        weight = weight["weight"]
-                    self.graphs[graph_name].add_edge((source, target, weight))
-                elif graph_type == "multiplex":
-                    weight = row["weight"]
-                    relation = row["relation"]
-                    if (type(weight) == dict):
-                        weight = weight["weight"]
-                    self.graphs[graph_name].add_edge((source, target, relation, weight))
-                else:
-                    raise ValueError("Unrecognized graph type:'%s'"%graph_type)
+            add_edges_from_columns(self.graphs[graph_name], t_graph_columns, node_dictionary)
 
     def include_node_metadata(self, nodes):
         output = []
@@ -295,7 +403,7 @@ class StaticGraphsBuilder(object):
         if not os.path.exists(os.path.join(output_dir, "jsons")):
             os.makedirs(os.path.join(output_dir, "jsons"))
         for graph_name in self.graphs:
-            network = self.graphs[graph_name].to_visjs_format()
+            network = translate_network(self.graphs[graph_name].to_visjs_format(), self.graphs[graph_name].node_dictionary)
             nodes = self.include_node_metadata(network["nodes"])
             network["nodes"] = nodes
             with open(os.path.join(output_dir, "jsons", graph_name + ".json"), "w+") as output_file:
@@ -305,22 +413,26 @@ class StaticGraphsBuilder(object):
         if not os.path.exists(os.path.join(output_dir, "edgelists")):
             os.makedirs(os.path.join(output_dir, "edgelists"))
         for graph_name in self.graphs:
-            with open(os.path.join(output_dir, "edgelists", graph_name + ".csv"), "w+") as output_file:
-                columns = self.graphs[graph_name].get_column_names()
-                header = ",".join(columns)
-                output_file.write(header + "\n")
-                if self.config["static-graphs"][graph_name]["graph_type"] == "weighted":
-                    if self.config["static-graphs"][graph_name]["weight_type"] == "list":
-                        edges = self.graphs[graph_name].get_edgelist(data=True, sum_weights=False)
-                    else:
-                        edges = self.graphs[graph_name].get_edgelist(data=True, sum_weights=True)
-                        
-                else:
-                    edges = self.graphs[graph_name].get_edgelist(data=True)
-                for edge in edges:
-                    if type(edge[-1]) == dict:
-                        edge = edge[:-1] + (edge[-1]["weight"], )
-                    output_file.write(",".join(list(map(str,edge)))+"\n")
+            columns = self.graphs[graph_name].get_column_names()
+            edges = self._iter_graph_edgelist(graph_name)
+            save_edgelist(edges, columns, os.path.join(output_dir, "edgelists", graph_name + ".csv"), node_dictionary=self.graphs[graph_name].node_dictionary)
+
+    def _iter_graph_edgelist(self, graph_name):
+        if self.config["static-graphs"][graph_name]["graph_type"] == "weighted":
+            if self.config["static-graphs"][graph_name]["weight_type"] == "list":
+                return self.graphs[graph_name].iter_edgelist(data=True, sum_weights=False)
+            else:
+                return self.graphs[graph_name].iter_edgelist(data=True, sum_weights=True)
+        else:
+            return self.graphs[graph_name].iter_edgelist(data=True)
+
+    def save_graphs2parquet(self, output_dir):
+        """Saves every static graph as a Parquet file under output_dir/parquet/graph=<graph name>.
+        """
+        for graph_name in self.graphs:
+            graph = self.graphs[graph_name]
+            save_parquet_edgelist(self._iter_graph_edgelist(graph_name), graph.get_column_names(), os.path.join(output_dir, "parquet", "graph=" + graph_name),
+                                  header=get_graph_header(graph), node_dictionary=graph.node_dictionary)
         
         
     def save_graphs(self):
@@ -342,6 +454,8 @@ class StaticGraphsBuilder(object):
             self._save_graphs2json(output_dir)
         if "edgelist" in formats:
             self.save_graphs2edgelist(output_dir)
+        if "parquet" in formats:
+            self.save_graphs2parquet(output_dir)
 
 
 class TemporalSnapshotGraphsBuilder(object):
@@ -350,6 +464,7 @@ class TemporalSnapshotGraphsBuilder(object):
     def load_temporal_graphs(self):
         self.users_info_wrapper = UsersInfoWrapper()
         self.users_info_wrapper.build_from_metadata(os.path.join(self.config["dataset"]["output_dir"], "users-matadata.csv"))
+        node_dictionary = self.users_info_wrapper.node_dictionary
 
         t_graphs = {}
 
@@ -358,51 +473,29 @@ class TemporalSnapshotGraphsBuilder(object):
     
         print("Loading temporal graphs")
         for graph_name in self.config["temporal-graphs"]:
-            t_graph_edgelist_path = os.path.join(self.config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", graph_name + ".csv")
-            t_graph_df = pd.read_csv(t_graph_edgelist_path, sep=",", header=0)
+            t_graph_columns = load_temporal_edgelist(self.config, graph_name)
             graph_type = self.config["temporal-graphs"][graph_name]["graph_type"]
             directed = self.config["temporal-graphs"][graph_name]["directed"]
 
             if graph_type == "temporal_unweighted":
-                t_graphs[graph_name] = datastructures.TemporalUnweightedGraph(directed=directed)
+                t_graphs[graph_name] = datastructures.TemporalUnweightedGraph(directed=directed, node_dictionary=node_dictionary)
             elif graph_type == "temporal_weighted":
                 weight_type = locate(self.config["temporal-graphs"][graph_name]["weight_type"])
-                t_graphs[graph_name] = datastructures.TemporalWeightedGraph(directed=directed, weight_is_list=weight_type==list)
+                t_graphs[graph_name] = datastructures.TemporalWeightedGraph(directed=directed, weight_is_list=weight_type==list, aggregate_weights=self.config["temporal-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
                 
             elif graph_type == "temporal_multiplex":
                 weight_type = locate(self.config["temporal-graphs"][graph_name]["weight_type"])
                 relations = self.config["temporal-graphs"][graph_name]["relations"]
-                t_graphs[graph_name] = datastructures.TemporalMultiplexGraph(directed=directed, weight_is_list=weight_type == list)
+                t_graphs[graph_name] = datastructures.TemporalMultiplexGraph(directed=directed, weight_is_list=weight_type == list, aggregate_weights=self.config["temporal-graphs"][graph_name].get("aggregate_weights", False), node_dictionary=node_dictionary)
             else:
                 raise ValueError("Unrecognized graph type:'%s'"%graph_type)
             start_timestamp = np.finfo(np.float64).max
             end_timestamp = 0
+            if len(t_graph_columns["timestamp"]) > 0:
+                start_timestamp = t_graph_columns["timestamp"].min()
+                end_timestamp = t_graph_columns["timestamp"].max()
 
-            for index, row in t_graph_df.iterrows():
-                source = int(row["source"])
-                target = int(row["target"])
-                timestamp = row["timestamp"]
-
-                if timestamp < start_timestamp:
-                    start_timestamp = timestamp
-                if timestamp > end_timestamp:
-                    end_timestamp = timestamp
-                    
-                if graph_type == "temporal_unweighted":
-                    t_graphs[graph_name].add_edge((source, target, timestamp))
-                elif graph_type == "temporal_weighted":
-                    weight = row["weight"]
-                    if (type(weight) == dict):
-                        weight = weight["weight"]
-                    t_graphs[graph_name].add_edge((source, target, timestamp, weight))
-                elif graph_type == "temporal_multiplex":
-                    weight = row["weight"]
-                    relation = row["relation"]
-                    if (type(weight) == dict):
-                        weight = weight["weight"]
-                    t_graphs[graph_name].add_edge((source, target, relation, timestamp, weight))
-                else:
-                    raise ValueError("Unrecognized graph type:'%s'"%graph_type)
+            add_edges_from_columns(t_graphs[graph_name], t_graph_columns, node_dictionary)
             t_graphs_info[graph_name] = {
                 "start_timestamp": start_timestamp,
                 "end_timestamp":end_timestamp
@@ -411,18 +504,17 @@ class TemporalSnapshotGraphsBuilder(object):
     def load_dataset(self):
         t_graphs, t_graphs_info = self.load_temporal_graphs()
         print("Building snapshot graphs")
-        self.snapshot_graphs = {}
         self.snapshot_graphs_range = {}
         for graph_name in t_graphs:
             start_timestamp = t_graphs_info[graph_name]["start_timestamp"]
             end_timestamp = t_graphs_info[graph_name]["end_timestamp"]
-            snapshot_graphs = []
             steps = self.config["temporal"]["snapshot_length_units"]
+            stride = self.config["temporal"].get("snapshot_stride_units") or steps
             self.snapshot_graphs_range[graph_name] = []
-            for ts in range(int(start_timestamp), int(end_timestamp), steps):
-                snapshot_graphs.append(t_graphs[graph_name].get_snapshot_graph(ts, ts + steps))
+            for ts in range(int(start_timestamp), int(end_timestamp), stride):
                 self.snapshot_graphs_range[graph_name].append({"start":ts, "end":ts+steps})
-            self.snapshot_graphs[graph_name] = snapshot_graphs
+        # Snapshots are built while they are saved, see iter_snapshot_graphs
+        self.temporal_graphs = t_graphs
 
     def include_node_metadata(self, nodes):
         output = []
@@ -432,36 +524,92 @@ class TemporalSnapshotGraphsBuilder(object):
             node_user["id"] = node_user["user_index"]
             output.append(node_user)
         return output
+    def iter_snapshot_graphs(self, graph_name):
+        """Yields the snapshot graphs of a graph, in the order of snapshot_graphs_range[graph_name]. Without
+        temporal.snapshot_stride_units each snapshot is built from the time index on its own. With a stride the
+        windows are generated by iter_sliding_snapshot_graphs, which updates one graph in place, so a snapshot is
+        only valid until the next one is yielded.
+        """
+        graph = self.temporal_graphs[graph_name]
+        ranges = self.snapshot_graphs_range[graph_name]
+        stride = self.config["temporal"].get("snapshot_stride_units")
+        if stride is None:
+            return (graph.get_snapshot_graph(range_info["start"], range_info["end"]) for range_info in ranges)
+        if len(ranges) == 0:
+            return iter([])
+        aggregate = self.config["temporal"].get("snapshot_aggregate", "sum")
+        steps = self.config["temporal"]["snapshot_length_units"]
+        return graph.iter_sliding_snapshot_graphs(ranges[0]["start"], ranges[-1]["start"] + 1, steps, stride, aggregate=aggregate, copy=False)
+
+    def _save_snapshot2json(self, output_dir, graph_name, index, snapshot):
+        network = translate_network(snapshot.to_visjs_format(), snapshot.node_dictionary)
+        nodes = self.include_node_metadata(network["nodes"])
+        network["nodes"] = nodes
+        with open(os.path.join(output_dir, "jsons", graph_name, "snapshot-%d"%index + ".json"), "w+") as output_file:
+            json.dump(network, output_file)
+
+    def _save_snapshot2edgelist(self, output_dir, graph_name, index, snapshot):
+        save_edgelist(snapshot.iter_edges(data=True), snapshot.get_column_names(),
+                      os.path.join(output_dir, "edgelists", graph_name, "snapshot-%d"%index + ".csv"),
+                      node_dictionary=snapshot.node_dictionary)
+
+    def _save_snapshots(self, output_dir, formats):
+        """Saves the snapshots of every graph in the given formats in one pass over iter_snapshot_graphs: every
+        snapshot is written in all formats before the next one is built, so the snapshots need not be kept in memory.
+        """
+        for graph_name in self.snapshot_graphs_range:
+            if "json" in formats and not os.path.exists(os.path.join(output_dir, "jsons", graph_name)):
+                os.makedirs(os.path.join(output_dir, "jsons", graph_name))
+            if "edgelist" in formats and not os.path.exists(os.path.join(output_dir, "edgelists", graph_name)):
+                os.makedirs(os.path.join(output_dir, "edgelists", graph_name))
+            if "pack" in formats and not os.path.exists(os.path.join(output_dir, "pack")):
+                os.makedirs(os.path.join(output_dir, "pack"))
+            parquet_writer = None
+            pack_writer = None
+            for i, current_snapshot in enumerate(self.iter_snapshot_graphs(graph_name)):
+                if "json" in formats:
+                    self._save_snapshot2json(output_dir, graph_name, i, current_snapshot)
+                if "edgelist" in formats:
+                    self._save_snapshot2edgelist(output_dir, graph_name, i, current_snapshot)
+                if "parquet" in formats:
+                    if parquet_writer is None:
+                        parquet_writer = SnapshotParquetWriter(os.path.join(output_dir, "parquet", "graph=" + graph_name), current_snapshot.get_column_names(),
+                                                               header=get_graph_header(current_snapshot))
+                    parquet_writer.add_snapshot(current_snapshot.iter_edges(data=True), node_dictionary=current_snapshot.node_dictionary,
+                                                **self.snapshot_graphs_range[graph_name][i])
+                if "pack" in formats:
+                    if pack_writer is None:
+                        pack_writer = SnapshotPackWriter(os.path.join(output_dir, "pack", graph_name + ".pack"), current_snapshot.get_column_names(),
+                                                         header=get_graph_header(current_snapshot))
+                    pack_writer.add_snapshot(current_snapshot.iter_edges(data=True), node_dictionary=current_snapshot.node_dictionary,
+                                             **self.snapshot_graphs_range[graph_name][i])
+            if "parquet" in formats:
+                if parquet_writer is None:
+                    parquet_writer = SnapshotParquetWriter(os.path.join(output_dir, "parquet", "graph=" + graph_name), ("source", "target"), header={})
+                parquet_writer.close()
+            if "pack" in formats:
+                if pack_writer is None:
+                    pack_writer = SnapshotPackWriter(os.path.join(output_dir, "pack", graph_name + ".pack"), ("source", "target"), header={})
+                pack_writer.close()
+
     def _save_graphs2json(self, output_dir):
-        if not os.path.exists(os.path.join(output_dir, "jsons")):
-            os.makedirs(os.path.join(output_dir, "jsons"))
-        for graph_name in self.snapshot_graphs:
-            if not os.path.exists(os.path.join(output_dir, "jsons", graph_name)):
-                os.mkdir(os.path.join(output_dir, "jsons", graph_name))
-            for i in range(len(self.snapshot_graphs[graph_name])):
-                
-                network = self.snapshot_graphs[graph_name][i].to_visjs_format()
-                nodes = self.include_node_metadata(network["nodes"])
-                network["nodes"] = nodes
-                with open(os.path.join(output_dir, "jsons", graph_name, "snapshot-%d"%i + ".json"), "w+") as output_file:
-                    json.dump(network, output_file)
+        self._save_snapshots(output_dir, ["json"])
 
     def save_graphs2edgelist(self, output_dir):
-        if not os.path.exists(os.path.join(output_dir, "edgelists")):
-            os.makedirs(os.path.join(output_dir, "edgelists"))
-        for graph_name in self.snapshot_graphs:
-            if not os.path.exists(os.path.join(output_dir, "edgelists", graph_name)):
-                os.mkdir(os.path.join(output_dir, "edgelists", graph_name))
-            for i in range(len(self.snapshot_graphs[graph_name])):
-                current_snapshot = self.snapshot_graphs[graph_name][i]
-
-                with open(os.path.join(output_dir, "edgelists", graph_name, "snapshot-%d"%i + ".csv"), "w+") as output_file:
-                    columns = current_snapshot.get_column_names()
-                    header = ",".join(columns)
-                    output_file.write(header + "\n")
-                    edges = current_snapshot.get_edges(data=True)
-                    for edge in edges:
-                        output_file.write(",".join(list(map(str,edge)))+"\n")
+        self._save_snapshots(output_dir, ["edgelist"])
+
+    def save_graphs2parquet(self, output_dir):
+        """Saves all snapshots of every graph as one Parquet file with a snapshot column under
+        output_dir/parquet/graph=<graph name>, whose header also holds the range of every snapshot. See
+        SnapshotParquetWriter.
+        """
+        self._save_snapshots(output_dir, ["parquet"])
+
+    def save_graphs2pack(self, output_dir):
+        """Saves all snapshots of every graph in one snapshot pack file, output_dir/pack/<graph name>.pack, which also
+        holds the range of every snapshot. See SnapshotPackWriter and load_snapshot_graph.
+        """
+        self._save_snapshots(output_dir, ["pack"])
         
         
     def save_graphs(self):
@@ -476,13 +624,14 @@ class TemporalSnapshotGraphsBuilder(object):
         
         if not os.path.exists(os.path.join(result_dir, "graphs", "snapshots")):
             os.makedirs(os.path.join(result_dir, "graphs", "snapshots"))
-        formats = self.config["dataset"]["graph_save_format"]
+        # Snapshot graphs have their own formats, "pack" only applies to them
+        formats = self.config["dataset"].get("snapshot_save_format", self.config["dataset"]["graph_save_format"])
 
         output_dir = os.path.join(result_dir, "graphs", "snapshots")
-        if "json" in formats:
-            self._save_graphs2json(output_dir)
-        if "edgelist" in formats:
-            self.save_graphs2edgelist(output_dir)
+        self._save_snapshots(output_dir, formats)
+        if all(save_format == "pack" for save_format in formats):
+            # The ranges are stored in the pack files
+            return
         if not os.path.exists(os.path.join(result_dir, "graphs", "snapshot-graphs-range")):
             os.mkdir(os.path.join(result_dir, "graphs", "snapshot-graphs-range"))
         for graph_name in self.snapshot_graphs_range:
@@ -505,18 +654,22 @@ class TemporalDynamicGraphBuilder(TemporalSnapshotGraphsBuilder):
     def load_dataset(self):
         t_graphs, t_graphs_info = self.load_temporal_graphs()
         print("Building snapshot graphs")
-        self.snapshot_graphs = {}
         self.snapshot_graphs_range = {}
         for graph_name in t_graphs:
             start_timestamp = t_graphs_info[graph_name]["start_timestamp"]
             end_timestamp = t_graphs_info[graph_name]["end_timestamp"]
-            current_snapshot_graphs = []
             steps = self.config["temporal"]["snapshot_length_units"]
             self.snapshot_graphs_range[graph_name] = []
             for ts in range(int(start_timestamp), int(end_timestamp), steps):
-                current_snapshot_graphs.append(t_graphs[graph_name].get_evolution_snapshot_graph(ts + steps))
                 self.snapshot_graphs_range[graph_name].append({"timestamp":ts+steps})
-            self.snapshot_graphs[graph_name] = current_snapshot_graphs
+        # Snapshots are built while they are saved, see iter_snapshot_graphs
+        self.temporal_graphs = t_graphs
+    def iter_snapshot_graphs(self, graph_name):
+        """Yields the evolution snapshot graphs of a graph. One graph is updated in place with the edges of each
+        step, so a snapshot is only valid until the next one is yielded.
+        """
+        timestamps = [range_info["timestamp"] for range_info in self.snapshot_graphs_range[graph_name]]
+        return self.temporal_graphs[graph_name].iter_evolution_snapshot_graphs(timestamps)
     def save_graphs(self):
         print("Saving graphs to disk")
         result_dir = self.config["dataset"]["output_dir"]
@@ -529,13 +682,13 @@ class TemporalDynamicGraphBuilder(TemporalSnapshotGraphsBuilder):
         
         if not os.path.exists(os.path.join(result_dir, "graphs", "dynamic-snapshots")):
             os.makedirs(os.path.join(result_dir, "graphs", "dynamic-snapshots"))
-        formats = self.config["dataset"]["graph_save_format"]
+        # Snapshot graphs have their own formats, "pack" only applies to them
+        formats = self.config["dataset"].get("snapshot_save_format", self.config["dataset"]["graph_save_format"])
 
         output_dir = os.path.join(result_dir, "graphs", "dynamic-snapshots")
-        if "json" in formats:
-            self._save_graphs2json(output_dir)
-        if "edgelist" in formats:
-            self.save_graphs2edgelist(output_dir)
+        self._save_snapshots(output_dir, formats)
+        if all(save_format == "pack" for save_format in formats):
+            return
         if not os.path.exists(os.path.join(result_dir, "graphs", "dynamic-snapshot-graphs-range")):
             os.mkdir(os.path.join(result_dir, "graphs", "dynamic-snapshot-graphs-range"))
         for graph_name in self.snapshot_graphs_range:
@@ -1,5 +1,6 @@
 import argparse
-from wundt.multiview.utils.preprocess import load_config
+from wundt.multiview.utils.preprocess import load_config, save_edgelist, save_npy_edgelist, save_parquet_edgelist
+from wundt.multiview.preprocess import load_temporal_edgelist, get_graph_header
 import os
 import pandas as pd
 from wundt.multiview import datastructures
@@ -10,24 +11,36 @@ Sentiment graphs are signed graphs(edge have sign). This module will split senti
 
 
 def save_temporal_graph(output_path, edgelist, weighted):
-
-    with open(output_path, "w+") as output_file:
-        if weighted:
-            output_file.write("source,target,timestamp,weight\n")
-        else:
-            output_file.write("source,target,timestamp\n")
-        for edge in edgelist:
-            output_file.write(",".join(map(str, edge)) + "\n")
+    if weighted:
+        save_edgelist(edgelist, ("source", "target", "timestamp", "weight"), output_path)
+    else:
+        save_edgelist(edgelist, ("source", "target", "timestamp"), output_path)
+
+def save_temporal_graph_binary(config, graph_name, graph):
+    formats = config["dataset"]["graph_save_format"]
+    temporal_graphs_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal")
+    if "npy" in formats:
+        save_npy_edgelist(graph.iter_edgelist(data=True), graph.get_column_names(), os.path.join(temporal_graphs_path, "npy", graph_name),
+                          header=get_graph_header(graph))
+    if "parquet" in formats:
+        save_parquet_edgelist(graph.iter_edgelist(data=True), graph.get_column_names(), os.path.join(temporal_graphs_path, "parquet", "graph=" + graph_name),
+                              header=get_graph_header(graph), bucket_size=config["dataset"].get("parquet_bucket_units", 7776000))
+
+def split_sentiment_graph(sentiment_df, threshold, neutral_graph, positive_graph, negative_graph):
+    sentiment_df = sentiment_df.astype({"source": int, "target": int})
+    neutral_mask = sentiment_df["weight"].between(-threshold, threshold)
+    positive_mask = sentiment_df["weight"] > threshold
+    negative_mask = ~(neutral_mask | positive_mask)
+    neutral_graph.add_edges_from_dataframe(sentiment_df[neutral_mask])
+    positive_graph.add_edges_from_dataframe(sentiment_df[positive_mask])
+    negative_df = sentiment_df[negative_mask].assign(weight=-sentiment_df["weight"][negative_mask])
+    negative_graph.add_edges_from_dataframe(negative_df)
 
 def main(args):
     threshold = 0.1
     config = load_config(args.config)
-    temporal_graphs_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists")
-    sentiment_directed_graph_path = os.path.join(temporal_graphs_path, "sentiment_directed.csv")
-    sentiment_undirected_graph_path = os.path.join(temporal_graphs_path, "sentiment_undirected.csv")
-
-    directed_df = pd.read_csv(sentiment_directed_graph_path, header=0)
-    undirected_df = pd.read_csv(sentiment_undirected_graph_path, header=0)
+    directed_df = pd.DataFrame(load_temporal_edgelist(config, "sentiment_directed"))
+    undirected_df = pd.DataFrame(load_temporal_edgelist(config, "sentiment_undirected"))
     
     directed_pos_graph = datastructures.TemporalWeightedGraph(directed=True, weight_is_list=False)
     directed_neg_graph = datastructures.TemporalWeightedGraph(directed=True, weight_is_list=False)
@@ -38,44 +51,38 @@ def main(args):
     undirected_neg_graph = datastructures.TemporalWeightedGraph(directed=False, weight_is_list=False)
     undirected_neut_graph = datastructures.TemporalUnweightedGraph(directed=False)
 
-    for index, row in directed_df.iterrows():
-        if( - threshold) <= row["weight"] <= threshold:
-            directed_neut_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"]))
-        elif row["weight"] > threshold:
-            directed_pos_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"], row["weight"]))
-        else:
-            directed_neg_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"], -row["weight"]))
-    
-    for index, row in undirected_df.iterrows():
-        if( - threshold) <= row["weight"] <= threshold:
-            undirected_neut_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"]))
-        elif row["weight"] > threshold:
-            undirected_pos_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"], row["weight"]))
-        else:
-            undirected_neg_graph.add_edge((int(row["source"]), int(row["target"]), row["timestamp"], -row["weight"]))
-    directed_neut_graph_edgelist = directed_neut_graph.get_edgelist()
+    split_sentiment_graph(directed_df, threshold, directed_neut_graph, directed_pos_graph, directed_neg_graph)
+    split_sentiment_graph(undirected_df, threshold, undirected_neut_graph, undirected_pos_graph, undirected_neg_graph)
+    directed_neut_graph_edgelist = directed_neut_graph.iter_edgelist()
     d_neutral_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_directed_neutral.csv")
     save_temporal_graph(d_neutral_path, directed_neut_graph_edgelist, False)
 
-    directed_pos_graph_edgelist = directed_pos_graph.get_edgelist(data=True)
+    directed_pos_graph_edgelist = directed_pos_graph.iter_edgelist(data=True)
     d_positive_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_directed_positive.csv")
     save_temporal_graph(d_positive_path, directed_pos_graph_edgelist, True)
 
-    directed_neg_graph_edgelist = directed_neg_graph.get_edgelist(data=True)
+    directed_neg_graph_edgelist = directed_neg_graph.iter_edgelist(data=True)
     d_negative_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_directed_negative.csv")
     save_temporal_graph(d_negative_path, directed_neg_graph_edgelist, True)
 
-    undirected_neut_graph_edgelist = undirected_neut_graph.get_edgelist()
+    undirected_neut_graph_edgelist = undirected_neut_graph.iter_edgelist()
     und_neutral_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_undirected_neutral.csv")
     save_temporal_graph(und_neutral_path, undirected_neut_graph_edgelist, False)
 
-    undirected_pos_graph_edgelist = undirected_pos_graph.get_edgelist(data=True)
+    undirected_pos_graph_edgelist = undirected_pos_graph.iter_edgelist(data=True)
     und_positive_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_undirected_positive.csv")
     save_temporal_graph(und_positive_path, undirected_pos_graph_edgelist, True)
 
-    undirected_neg_graph_edgelist = undirected_neg_graph.get_edgelist(data=True)
+    undirected_neg_graph_edgelist = undirected_neg_graph.iter_edgelist(data=True)
     und_negative_path = os.path.join(config["dataset"]["output_dir"], "graphs", "temporal", "edgelists", "sentiment_undirected_negative.csv")
     save_temporal_graph(und_negative_path, undirected_neg_graph_edgelist, True)
+
+    save_temporal_graph_binary(config, "sentiment_directed_neutral", directed_neut_graph)
+    save_temporal_graph_binary(config, "sentiment_directed_positive", directed_pos_graph)
+    save_temporal_graph_binary(config, "sentiment_directed_negative", directed_neg_graph)
+    save_temporal_graph_binary(config, "sentiment_undirected_neutral", undirected_neut_graph)
+    save_temporal_graph_binary(config, "sentiment_undirected_positive", undirected_pos_graph)
+    save_temporal_graph_binary(config, "sentiment_undirected_negative", undirected_neg_graph)
     
 
 
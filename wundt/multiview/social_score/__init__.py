@@ -0,0 +1,4 @@
+from .centrality import pagerank, eigenvector_centrality, katz_centrality, hits
+from .incremental import WarmStartedCentrality, get_warm_started_scores
+from .paths import get_path_scores, get_sample_size
+from .scores import compute_scores, get_graph_scores, get_snapshot_scores, get_warm_started_snapshot_scores
@@ -0,0 +1,239 @@
+"""
+PageRank, eigenvector, Katz and HITS scores computed by power iteration on SciPy sparse matrices, following the
+networkx definitions. A list of snapshot matrices is solved as one block diagonal matrix.
+"""
+import numpy as np
+
+
+class _Blocks(object):
+    """Block diagonal stack of square matrices, with per-block sums and maxima of node vectors.
+    """
+    def __init__(self, matrices, weighted=True):
+        from scipy import sparse
+        self.is_list = isinstance(matrices, (list, tuple))
+        matrices = list(matrices) if self.is_list else [matrices]
+        self.sizes = np.array([matrix.shape[0] for matrix in matrices], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)])
+        self.block_ids = np.repeat(np.arange(len(matrices)), self.sizes)
+        matrix = sparse.block_diag(matrices, format="csr") if len(matrices) > 1 else sparse.csr_matrix(matrices[0])
+        matrix = matrix.astype(np.float64)
+        matrix.sum_duplicates()
+        if not weighted:
+            matrix.data[:] = 1.0
+        self.matrix = matrix
+        self.transposed = matrix.T.tocsr()
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def sums(self, values):
+        return np.bincount(self.block_ids, weights=values, minlength=len(self))
+
+    def maxima(self, values):
+        # Blocks are contiguous, empty blocks get 0
+        non_empty = self.sizes > 0
+        output = np.zeros(len(self))
+        if non_empty.any():
+            output[non_empty] = np.maximum.reduceat(values, self.offsets[:-1][non_empty])
+        return output
+
+    def expand(self, block_values):
+        return block_values[self.block_ids]
+
+    def split(self, values):
+        if not self.is_list:
+            return values
+        return [values[self.offsets[block]:self.offsets[block + 1]] for block in range(len(self))]
+
+    def start_vector(self, start, default):
+        if start is None:
+            return default
+        return np.concatenate([np.asarray(part, dtype=np.float64) for part in start]) if self.is_list else np.asarray(start, dtype=np.float64).copy()
+
+
+def _power_iteration(blocks, update, start, tol, max_iter, name, threshold=None):
+    """Runs x = update(x) until the sum of absolute changes of every block falls below threshold(block size * tol by
+    default). Blocks that converged keep their values. Returns the values and the number of iterations of every block.
+    """
+    threshold = blocks.sizes * tol if threshold is None else threshold
+    values = start
+    converged = blocks.sizes == 0
+    iterations = np.zeros(len(blocks), dtype=np.int64)
+    for iteration in range(max_iter):
+        if converged.all():
+            return values, iterations
+        updated = update(values)
+        errors = blocks.sums(np.abs(updated - values))
+        frozen = blocks.expand(converged)
+        values = np.where(frozen, values, updated)
+        iterations[~converged] = iteration + 1
+        converged |= errors < threshold
+    if converged.all():
+        return values, iterations
+    raise RuntimeError("%s did not converge in %d iterations" % (name, max_iter))
+
+
+def pagerank(matrices, alpha=0.85, personalization=None, dangling=None, start=None, tol=1e-06, max_iter=100, weighted=True,
+             return_iterations=False):
+    """Returns PageRank of every node. A walker follows an out-edge with probability proportional to its weight with
+    probability alpha, and jumps to a node drawn from personalization otherwise.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices solved together
+
+    Keyword Arguments:
+        alpha {float} -- Damping factor (default: {0.85})
+        personalization {numpy.ndarray, list} -- Jump distribution(of every matrix), uniform if None (default: {None})
+        dangling {numpy.ndarray, list} -- Distribution followed from nodes without out-edges, personalization if
+            None (default: {None})
+        start {numpy.ndarray, list} -- Initial scores, personalization if None (default: {None})
+        tol {float} -- Tolerance of the sum of absolute changes, per node (default: {1e-06})
+        max_iter {int} -- Largest number of iterations (default: {100})
+        weighted {bool} -- If false every edge has weight 1 (default: {True})
+        return_iterations {bool} -- If true the number of iterations(of every matrix) is returned too (default: {False})
+
+    Raises:
+        ValueError: If a weight is negative
+        RuntimeError: If the iteration does not converge in max_iter iterations
+
+    Returns:
+        numpy.ndarray, list -- Scores summing to 1(for every matrix), and the iterations if return_iterations
+    """
+    blocks = _Blocks(matrices, weighted)
+    if blocks.matrix.nnz > 0 and blocks.matrix.data.min() < 0:
+        raise ValueError("PageRank needs non-negative edge weights")
+    out_weights = np.asarray(blocks.matrix.sum(axis=1)).ravel()
+    is_dangling = out_weights == 0
+    inverse_out_weights = np.where(is_dangling, 0.0, 1.0 / np.where(is_dangling, 1.0, out_weights))
+    uniform = 1.0 / blocks.expand(np.maximum(blocks.sizes, 1).astype(np.float64))
+    personalization = _normalized(blocks, blocks.start_vector(personalization, uniform))
+    dangling = _normalized(blocks, blocks.start_vector(dangling, personalization))
+    start = _normalized(blocks, blocks.start_vector(start, personalization))
+
+    def update(values):
+        dangling_sums = blocks.expand(blocks.sums(np.where(is_dangling, values, 0.0)))
+        return alpha * blocks.transposed.dot(values * inverse_out_weights) + alpha * dangling_sums * dangling + (1 - alpha) * personalization
+    values, iterations = _power_iteration(blocks, update, start, tol, max_iter, "PageRank")
+    return _output(blocks, [values], iterations, return_iterations)
+
+
+def eigenvector_centrality(matrices, start=None, tol=1e-06, max_iter=100, weighted=True, return_iterations=False):
+    """Returns eigenvector centrality of every node: the principal eigenvector of the transposed adjacency matrix, so
+    a node is central when central nodes link to it. Iterates x = (A^T + I) x, which has the same eigenvectors and
+    also converges on bipartite graphs.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices solved together
+
+    Keyword Arguments:
+        start {numpy.ndarray, list} -- Initial scores, all ones if None (default: {None})
+        tol {float} -- Tolerance of the sum of absolute changes, per node (default: {1e-06})
+        max_iter {int} -- Largest number of iterations (default: {100})
+        weighted {bool} -- If false every edge has weight 1 (default: {True})
+        return_iterations {bool} -- If true the number of iterations(of every matrix) is returned too (default: {False})
+
+    Raises:
+        RuntimeError: If the iteration does not converge in max_iter iterations
+
+    Returns:
+        numpy.ndarray, list -- Scores with Euclidean norm 1(for every matrix), and the iterations if return_iterations
+    """
+    blocks = _Blocks(matrices, weighted)
+    start = _normalized(blocks, blocks.start_vector(start, np.ones(blocks.offsets[-1])))
+
+    def update(values):
+        updated = values + blocks.transposed.dot(values)
+        norms = np.sqrt(blocks.sums(updated ** 2))
+        return updated / blocks.expand(np.where(norms == 0, 1.0, norms))
+    values, iterations = _power_iteration(blocks, update, start, tol, max_iter, "Eigenvector centrality")
+    return _output(blocks, [values], iterations, return_iterations)
+
+
+def katz_centrality(matrices, alpha=0.1, beta=1.0, start=None, tol=1e-06, max_iter=1000, normalized=True, weighted=True,
+                    return_iterations=False):
+    """Returns Katz centrality of every node: x = alpha * A^T x + beta. alpha should be less than the inverse of the
+    largest eigenvalue of the adjacency matrix, or the iteration does not converge.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices solved together
+
+    Keyword Arguments:
+        alpha {float} -- Attenuation factor (default: {0.1})
+        beta {float, numpy.ndarray} -- Score every node gets regardless of its edges (default: {1.0})
+        start {numpy.ndarray, list} -- Initial scores, zeros if None (default: {None})
+        tol {float} -- Tolerance of the sum of absolute changes, per node (default: {1e-06})
+        max_iter {int} -- Largest number of iterations (default: {1000})
+        normalized {bool} -- If true the scores of every matrix are scaled to Euclidean norm 1 (default: {True})
+        weighted {bool} -- If false every edge has weight 1 (default: {True})
+        return_iterations {bool} -- If true the number of iterations(of every matrix) is returned too (default: {False})
+
+    Raises:
+        RuntimeError: If the iteration does not converge in max_iter iterations
+
+    Returns:
+        numpy.ndarray, list -- Scores, and the iterations if return_iterations
+    """
+    blocks = _Blocks(matrices, weighted)
+    start = blocks.start_vector(start, np.zeros(blocks.offsets[-1]))
+    beta = blocks.start_vector(beta, None) if isinstance(beta, (list, tuple, np.ndarray)) else beta
+
+    def update(values):
+        return alpha * blocks.transposed.dot(values) + beta
+    values, iterations = _power_iteration(blocks, update, start, tol, max_iter, "Katz centrality")
+    if normalized:
+        norms = np.sqrt(blocks.sums(values ** 2))
+        values = values / blocks.expand(np.where(norms == 0, 1.0, norms))
+    return _output(blocks, [values], iterations, return_iterations)
+
+
+def hits(matrices, start=None, tol=1e-08, max_iter=100, normalized=True, weighted=True, return_iterations=False):
+    """Returns HITS hub and authority scores of every node. Authorities are linked from good hubs, and hubs link to
+    good authorities.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices solved together
+
+    Keyword Arguments:
+        start {numpy.ndarray, list} -- Initial hub scores, uniform if None (default: {None})
+        tol {float} -- Tolerance of the sum of absolute changes of the hub scores of a matrix (default: {1e-08})
+        max_iter {int} -- Largest number of iterations (default: {100})
+        normalized {bool} -- If true the scores of every matrix sum to 1 (default: {True})
+        weighted {bool} -- If false every edge has weight 1 (default: {True})
+        return_iterations {bool} -- If true the number of iterations(of every matrix) is returned too (default: {False})
+
+    Raises:
+        ValueError: If a weight is negative
+        RuntimeError: If the iteration does not converge in max_iter iterations
+
+    Returns:
+        tuple -- Hub scores and authority scores, arrays or lists of arrays, and the iterations if return_iterations
+    """
+    blocks = _Blocks(matrices, weighted)
+    if blocks.matrix.nnz > 0 and blocks.matrix.data.min() < 0:
+        raise ValueError("HITS needs non-negative edge weights")
+    uniform = 1.0 / blocks.expand(np.maximum(blocks.sizes, 1).astype(np.float64))
+    start = _normalized(blocks, blocks.start_vector(start, uniform))
+
+    def update(hubs):
+        # Hub update through the authorities, both scaled to a largest score of 1 as in networkx
+        hubs = blocks.matrix.dot(blocks.transposed.dot(hubs))
+        maxima = blocks.maxima(hubs)
+        return hubs / blocks.expand(np.where(maxima == 0, 1.0, maxima))
+    hubs, iterations = _power_iteration(blocks, update, start, tol, max_iter, "HITS", threshold=np.full(len(blocks), tol))
+    authorities = blocks.transposed.dot(hubs)
+    if normalized:
+        hubs = _normalized(blocks, hubs)
+        authorities = _normalized(blocks, authorities)
+    return _output(blocks, [hubs, authorities], iterations, return_iterations)
+
+
+def _normalized(blocks, values):
+    sums = blocks.sums(values)
+    return values / blocks.expand(np.where(sums == 0, 1.0, sums))
+
+
+def _output(blocks, results, iterations, return_iterations):
+    output = [blocks.split(values) for values in results]
+    if return_iterations:
+        output.append(iterations.tolist() if blocks.is_list else int(iterations[0]))
+    return tuple(output) if len(output) > 1 else output[0]
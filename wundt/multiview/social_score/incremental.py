@@ -0,0 +1,165 @@
+"""
+Centrality of a sequence of snapshots, where every power iteration starts from the scores of the previous snapshot.
+"""
+import numpy as np
+from .centrality import pagerank, eigenvector_centrality, katz_centrality, hits
+
+WARM_STARTED_CENTRALITIES = ["pagerank", "eigenvector_centrality", "katz_centrality", "hits"]
+
+
+class WarmStartedCentrality(object):
+    def __init__(self, centrality="eigenvector_centrality", options=None, compare_cold_start=False):
+        """Initializes WarmStartedCentrality object.
+
+        Keyword Arguments:
+            centrality {str} -- One of WARM_STARTED_CENTRALITIES; hits scores hub_score and authority_score
+                (default: {"eigenvector_centrality"})
+            options {dict} -- Keyword arguments of the centrality function, e.g. {"alpha": 0.9} (default: {None})
+            compare_cold_start {bool} -- If true every snapshot is also solved from the default start, to report
+                the exact number of iterations saved; doubles the work (default: {False})
+
+        Raises:
+            ValueError: If the centrality is unknown
+        """
+        if centrality not in WARM_STARTED_CENTRALITIES:
+            raise ValueError("Unrecognized centrality:'%s'" % centrality)
+        self.centrality = centrality
+        self.options = dict(options) if options is not None else {}
+        self.compare_cold_start = compare_cold_start
+        self.previous_matrix = None
+        self.previous_nodes = None
+        self.previous_state = None
+        self.previous_scores = None
+        self.iterations = []
+        self.cold_start_iterations = []
+        self.skipped = 0
+
+    def _solve(self, matrix, start):
+        # Returns the scores and the state the next snapshot starts from
+        if self.centrality == "pagerank":
+            scores, iterations = pagerank(matrix, start=start, return_iterations=True, **self.options)
+            return {"pagerank": scores}, scores, iterations
+        if self.centrality == "eigenvector_centrality":
+            scores, iterations = eigenvector_centrality(matrix, start=start, return_iterations=True, **self.options)
+            return {"eigenvector_centrality": scores}, scores, iterations
+        if self.centrality == "katz_centrality":
+            # Katz iterates unnormalized scores, so the state is kept before normalization
+            options = dict(self.options)
+            normalized = options.pop("normalized", True)
+            state, iterations = katz_centrality(matrix, start=start, normalized=False, return_iterations=True, **options)
+            norm = np.linalg.norm(state)
+            scores = state / norm if normalized and norm > 0 else state
+            return {"katz_centrality": scores}, state, iterations
+        hubs, authorities, iterations = hits(matrix, start=start, return_iterations=True, **self.options)
+        return {"hub_score": hubs, "authority_score": authorities}, hubs, iterations
+
+    def _mapped_state(self, nodes):
+        # Previous state in the order of nodes; new nodes start at the mean of the previous state
+        if self.previous_state is None or len(self.previous_state) == 0:
+            return None
+        positions = {node: position for position, node in enumerate(self.previous_nodes)}
+        indices = np.array([positions.get(node, -1) for node in nodes], dtype=np.int64)
+        start = np.where(indices >= 0, self.previous_state[np.maximum(indices, 0)], self.previous_state.mean())
+        if not start.any():
+            return None
+        return start
+
+    def _is_unchanged(self, matrix, nodes):
+        if self.previous_matrix is None or self.previous_nodes != nodes or self.previous_matrix.shape != matrix.shape:
+            return False
+        return self.previous_matrix.nnz == matrix.nnz and (self.previous_matrix != matrix).nnz == 0
+
+    def update(self, matrix, nodes=None):
+        """Scores the next snapshot.
+
+        Arguments:
+            matrix {scipy.sparse.spmatrix} -- Adjacency matrix of the snapshot
+
+        Keyword Arguments:
+            nodes {list} -- Node of every row of the matrix, used to map the previous scores; positions if None
+                (default: {None})
+
+        Returns:
+            dict -- Maps score name to the array of scores of the snapshot
+        """
+        matrix = matrix.tocsr()
+        nodes = list(nodes) if nodes is not None else list(range(matrix.shape[0]))
+        if self._is_unchanged(matrix, nodes):
+            self.skipped += 1
+            self.iterations.append(0)
+            if self.compare_cold_start:
+                self.cold_start_iterations.append(self._solve(matrix, None)[2])
+            return self.previous_scores
+        scores, state, iterations = self._solve(matrix, self._mapped_state(nodes))
+        self.iterations.append(iterations)
+        if self.compare_cold_start:
+            self.cold_start_iterations.append(self._solve(matrix, None)[2])
+        self.previous_matrix = matrix
+        self.previous_nodes = nodes
+        self.previous_state = state
+        self.previous_scores = scores
+        return scores
+
+    def get_summary(self):
+        """Returns iteration counts of the snapshots scored so far.
+
+        Returns:
+            dict -- Number of snapshots, skipped(unchanged) snapshots, iterations, mean iterations per snapshot and,
+                with compare_cold_start, the iterations of cold starts and the iterations saved
+        """
+        summary = {"snapshots": len(self.iterations), "skipped": self.skipped, "iterations": sum(self.iterations),
+                   "iterations_per_snapshot": sum(self.iterations) / float(max(len(self.iterations), 1))}
+        if self.compare_cold_start:
+            summary["cold_start_iterations"] = sum(self.cold_start_iterations)
+            summary["iterations_saved"] = summary["cold_start_iterations"] - summary["iterations"]
+        return summary
+
+    def print_summary(self):
+        summary = self.get_summary()
+        line = "%s: %d snapshots, %d unchanged, %d iterations(%.1f per snapshot)" % (
+            self.centrality, summary["snapshots"], summary["skipped"], summary["iterations"], summary["iterations_per_snapshot"])
+        if self.compare_cold_start:
+            line += ", %d with cold starts(%d saved)" % (summary["cold_start_iterations"], summary["iterations_saved"])
+        print(line)
+
+
+def get_warm_started_scores(snapshots, centralities=None, options=None, compare_cold_start=False, verbose=False):
+    """Scores a sequence of snapshots with warm started power iterations, see WarmStartedCentrality.
+
+    Arguments:
+        snapshots {iterable} -- (matrix, nodes) pairs in time order, where nodes lists the node of every row
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores: pagerank, eigenvector_centrality, katz_centrality, hub_score and
+            authority_score; eigenvector_centrality if None (default: {None})
+        options {dict} -- Keyword arguments of every score, hub_score and authority_score take those of "hits"
+            (default: {None})
+        compare_cold_start {bool} -- If true the iterations saved are measured against cold starts (default: {False})
+        verbose {bool} -- If true the iteration summary of every centrality is printed (default: {False})
+
+    Raises:
+        ValueError: If a score name is unknown
+
+    Returns:
+        tuple -- List of {score name: {node: score}} for every snapshot, and {centrality: summary}
+    """
+    centralities = centralities if centralities is not None else ["eigenvector_centrality"]
+    options = options if options is not None else {}
+    solvers = {}
+    for centrality in centralities:
+        name = "hits" if centrality in ["hub_score", "authority_score"] else centrality
+        if name not in WARM_STARTED_CENTRALITIES:
+            raise ValueError("Unrecognized score:'%s'" % centrality)
+        if name not in solvers:
+            solvers[name] = WarmStartedCentrality(name, options.get(name), compare_cold_start)
+    output = []
+    for matrix, nodes in snapshots:
+        nodes = list(nodes)
+        scores = {}
+        for solver in solvers.values():
+            scores.update(solver.update(matrix, nodes))
+        output.append({centrality: dict(zip(nodes, scores[centrality].tolist())) for centrality in centralities})
+    if verbose:
+        for solver in solvers.values():
+            solver.print_summary()
+    return output, {name: solver.get_summary() for name, solver in solvers.items()}
@@ -0,0 +1,221 @@
+"""
+Betweenness and closeness centrality of SciPy sparse matrices, following the networkx definitions, computed
+exactly or from a sample of pivot sources.
+"""
+import multiprocessing
+import numpy as np
+
+PATH_CENTRALITIES = ["betweenness_centrality", "closeness_centrality"]
+
+
+class _ShortestPathDAG(object):
+    """Edges of a graph, and the incidence matrices used to push values from the edges to their ends.
+    """
+    def __init__(self, matrix, weighted=False):
+        from scipy import sparse
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        if weighted and matrix.nnz > 0 and matrix.data.min() < 0:
+            raise ValueError("Shortest path centralities need non-negative edge weights")
+        self.num_nodes = matrix.shape[0]
+        sources = np.repeat(np.arange(self.num_nodes), np.diff(matrix.indptr))
+        # Self loops are never on a shortest path
+        keep = sources != matrix.indices
+        self.sources = sources[keep]
+        self.targets = matrix.indices[keep]
+        self.lengths = matrix.data[keep] if weighted else np.ones(len(self.sources))
+        self.weighted = weighted
+        self.graph = sparse.csr_matrix((self.lengths, (self.sources, self.targets)), shape=matrix.shape)
+        edges = np.arange(len(self.sources))
+        self.source_incidence = sparse.csr_matrix((np.ones(len(edges)), (self.sources, edges)), shape=(self.num_nodes, len(edges)))
+        self.target_incidence = sparse.csr_matrix((np.ones(len(edges)), (self.targets, edges)), shape=(self.num_nodes, len(edges)))
+
+    def get_batch_size(self, batch_size=None):
+        if batch_size is not None:
+            return batch_size
+        # About 4M values per dense (batch, edges) array
+        return max(1, int(2 ** 22 // max(len(self.sources) + self.num_nodes, 1)))
+
+    def get_distances(self, sources):
+        from scipy.sparse import csgraph
+        return csgraph.dijkstra(self.graph, directed=True, indices=sources, unweighted=not self.weighted)
+
+    def get_dag_edges(self, distances):
+        # (batch, edges) mask of the edges on a shortest path from the source of every row
+        starts = distances[:, self.sources]
+        ends = distances[:, self.targets]
+        reached = np.isfinite(starts)
+        with np.errstate(invalid="ignore"):
+            if self.weighted:
+                return reached & (np.abs(starts + self.lengths - ends) <= 1e-12 * np.maximum(np.abs(ends), 1.0))
+            return reached & (starts + 1 == ends)
+
+    def _push(self, incidence, values):
+        # Sums the (batch, edges) values into the (batch, nodes) ends given by incidence
+        return np.asarray(incidence.dot(values.T)).T
+
+    def get_dependencies(self, sources, dag_edges):
+        """Returns Brandes dependency of every source on every node: the sum over targets t of the fraction of the
+        shortest paths from the source to t which pass through the node.
+        """
+        counts = np.zeros((len(sources), self.num_nodes))
+        counts[np.arange(len(sources)), sources] = 1.0
+        frontier = counts
+        # Path counts: paths of h DAG edges are pushed one edge further per step
+        while True:
+            frontier = self._push(self.target_incidence, dag_edges * frontier[:, self.sources])
+            if not frontier.any():
+                break
+            counts = counts + frontier
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(dag_edges, counts[:, self.sources] / counts[:, self.targets], 0.0)
+        # delta = M 1 + M delta over the DAG, i.e. the sum of M^h 1 for h >= 1
+        dependencies = np.zeros_like(counts)
+        term = np.ones_like(counts)
+        while True:
+            term = self._push(self.source_incidence, ratios * term[:, self.targets])
+            if not term.any():
+                break
+            dependencies += term
+        dependencies[np.arange(len(sources)), sources] = 0.0
+        return dependencies
+
+
+def _source_scores(dag, sources, centralities, batch_size=None):
+    # Betweenness, distance sums and reached counts accumulated over the given sources
+    betweenness = np.zeros(dag.num_nodes)
+    distance_sums = np.zeros(dag.num_nodes)
+    reached = np.zeros(dag.num_nodes)
+    batch_size = dag.get_batch_size(batch_size)
+    for start in range(0, len(sources), batch_size):
+        batch = np.asarray(sources[start:start + batch_size], dtype=np.int64)
+        distances = dag.get_distances(batch)
+        if "closeness_centrality" in centralities:
+            finite = np.isfinite(distances)
+            distance_sums += np.where(finite, distances, 0.0).sum(axis=0)
+            # The source itself is at distance 0 and is not counted
+            reached += finite.sum(axis=0) - np.bincount(batch, minlength=dag.num_nodes)
+        if "betweenness_centrality" in centralities:
+            betweenness += dag.get_dependencies(batch, dag.get_dag_edges(distances)).sum(axis=0)
+    return betweenness, distance_sums, reached
+
+
+def get_sample_size(num_nodes, epsilon, delta=0.1):
+    """Returns the number of pivot sources for which the sampled normalized betweenness of every node is within
+    epsilon of the exact score with probability at least 1 - delta(Hoeffding bound, with a union bound over nodes).
+
+    Arguments:
+        num_nodes {int} -- Number of nodes
+        epsilon {float} -- Largest absolute error of the normalized scores
+
+    Keyword Arguments:
+        delta {float} -- Probability that some score misses the error target (default: {0.1})
+
+    Returns:
+        int -- Number of pivots
+    """
+    return int(np.ceil(np.log(2.0 * max(num_nodes, 1) / delta) / (2 * epsilon ** 2)))
+
+
+def get_path_scores(matrices, centralities=None, directed=True, weighted=False, normalized=True, wf_improved=True,
+                    sample_size=None, epsilon=None, delta=0.1, workers=1, seed=None, batch_size=None):
+    """Returns betweenness and closeness centrality of every node, as networkx's betweenness_centrality and
+    closeness_centrality. Closeness of a node is computed from the distances of the nodes which reach it.
+
+    With sample_size or epsilon set, only a random sample of pivot sources is used: betweenness sums the dependencies
+    of the pivots scaled by n / k, and closeness uses the distances from the pivots, which is an estimate of the
+    average distance to the node. Snapshots with no more nodes than pivots are computed exactly.
+
+    With workers > 1 the sources of every matrix are split into chunks, and the chunks of all matrices run on one
+    process pool.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices(e.g. snapshots)
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores, see PATH_CENTRALITIES; both if None (default: {None})
+        directed {bool} -- If false the matrices are symmetric adjacency matrices of undirected graphs (default: {True})
+        weighted {bool} -- If true the weights are edge lengths, otherwise every edge has length 1 (default: {False})
+        normalized {bool} -- If true betweenness is divided by the number of node pairs (default: {True})
+        wf_improved {bool} -- If true closeness is scaled by the fraction of nodes reaching the node (default: {True})
+        sample_size {int} -- Number of pivots, k (default: {None})
+        epsilon {float} -- Error target used to choose the number of pivots when sample_size is None, see
+            get_sample_size (default: {None})
+        delta {float} -- Failure probability of the error target (default: {0.1})
+        workers {int} -- Number of processes (default: {1})
+        seed {int} -- Seed of the pivot sampling (default: {None})
+        batch_size {int} -- Number of sources solved together, chosen from the number of edges if None
+            (default: {None})
+
+    Raises:
+        ValueError: If a score name is unknown, or if a weight is negative
+
+    Returns:
+        dict -- Maps score name to scores(array, or list of arrays for a list of matrices)
+    """
+    centralities = centralities if centralities is not None else PATH_CENTRALITIES
+    for centrality in centralities:
+        if centrality not in PATH_CENTRALITIES:
+            raise ValueError("Unrecognized score:'%s'" % centrality)
+    is_list = isinstance(matrices, (list, tuple))
+    dags = [_ShortestPathDAG(matrix, weighted) for matrix in (matrices if is_list else [matrices])]
+    random_state = np.random.default_rng(seed)
+    pivots = []
+    for dag in dags:
+        num_pivots = sample_size if sample_size is not None else (get_sample_size(dag.num_nodes, epsilon, delta) if epsilon is not None else None)
+        if num_pivots is None or num_pivots >= dag.num_nodes:
+            pivots.append(np.arange(dag.num_nodes))
+        else:
+            pivots.append(np.sort(random_state.choice(dag.num_nodes, num_pivots, replace=False)))
+    tasks = []
+    for index, sources in enumerate(pivots):
+        chunk_size = max(1, int(np.ceil(len(sources) / float(max(workers, 1) * 4)))) if workers > 1 else max(len(sources), 1)
+        tasks.extend((index, sources[start:start + chunk_size], centralities, batch_size) for start in range(0, len(sources), chunk_size))
+    if workers <= 1:
+        _init_worker(dags)
+        results = [_score_chunk(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(dags,))
+        try:
+            results = pool.map(_score_chunk, tasks)
+        finally:
+            pool.terminate()
+    totals = [[np.zeros(dag.num_nodes) for _ in range(3)] for dag in dags]
+    for (index, _, _, _), result in zip(tasks, results):
+        for total, values in zip(totals[index], result):
+            total += values
+    output = {centrality: [] for centrality in centralities}
+    for dag, sources, (betweenness, distance_sums, reached) in zip(dags, pivots, totals):
+        n = dag.num_nodes
+        if "betweenness_centrality" in centralities:
+            scale = 1.0
+            if normalized:
+                scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+            elif not directed:
+                scale = 0.5
+            if len(sources) < n:
+                scale *= n / float(len(sources))
+            output["betweenness_centrality"].append(betweenness * scale)
+        if "closeness_centrality" in centralities:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                closeness = np.where(distance_sums > 0, reached / distance_sums, 0.0)
+                if wf_improved:
+                    # Sampled: reached / (pivots other than the node) estimates the fraction of nodes reaching it
+                    others = np.full(n, len(sources), dtype=np.float64) - np.isin(np.arange(n), sources) if len(sources) < n else np.full(n, n - 1.0)
+                    closeness *= np.where(others > 0, reached / others, 0.0)
+            output["closeness_centrality"].append(closeness)
+    return {centrality: scores if is_list else scores[0] for centrality, scores in output.items()}
+
+
+_worker_dags = None
+
+
+def _init_worker(dags):
+    global _worker_dags
+    _worker_dags = dags
+
+
+def _score_chunk(task):
+    index, sources, centralities, batch_size = task
+    return _source_scores(_worker_dags[index], sources, centralities, batch_size)
@@ -0,0 +1,115 @@
+"""
+Social scores of the nodes of graphs and of the snapshots of temporal graphs.
+"""
+from .centrality import pagerank, eigenvector_centrality, katz_centrality, hits
+from .incremental import get_warm_started_scores
+
+CENTRALITIES = ["pagerank", "eigenvector_centrality", "katz_centrality", "hub_score", "authority_score"]
+
+
+def compute_scores(matrices, centralities=None, options=None):
+    """Computes scores of adjacency matrices.
+
+    Arguments:
+        matrices {scipy.sparse.spmatrix, list} -- Adjacency matrix, or list of matrices solved together
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores, see CENTRALITIES; all if None (default: {None})
+        options {dict} -- Maps score name to keyword arguments of its function, e.g. {"pagerank": {"alpha": 0.9}};
+            hub_score and authority_score take the options of "hits" (default: {None})
+
+    Raises:
+        ValueError: If a score name is unknown
+
+    Returns:
+        dict -- Maps score name to scores(array, or list of arrays for a list of matrices)
+    """
+    centralities = centralities if centralities is not None else CENTRALITIES
+    options = options if options is not None else {}
+    output = {}
+    for centrality in centralities:
+        if centrality == "pagerank":
+            output[centrality] = pagerank(matrices, **options.get(centrality, {}))
+        elif centrality == "eigenvector_centrality":
+            output[centrality] = eigenvector_centrality(matrices, **options.get(centrality, {}))
+        elif centrality == "katz_centrality":
+            output[centrality] = katz_centrality(matrices, **options.get(centrality, {}))
+        elif centrality in ["hub_score", "authority_score"]:
+            if "hub_score" not in output:
+                output["hub_score"], output["authority_score"] = hits(matrices, **options.get("hits", {}))
+        else:
+            raise ValueError("Unrecognized score:'%s'" % centrality)
+    return {centrality: output[centrality] for centrality in centralities}
+
+
+def get_graph_scores(graph, centralities=None, options=None, nodes=None):
+    """Returns scores of the nodes of a graph(see compute_scores).
+
+    Arguments:
+        graph {Graph, CompactGraph} -- Graph; multiplex graphs are scored on the sum of their layers
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores (default: {None})
+        options {dict} -- Keyword arguments of every score (default: {None})
+        nodes {list} -- Node order (default: {None})
+
+    Returns:
+        dict -- Maps score name to {node: score}
+    """
+    node_order = graph.get_node_order(nodes)
+    scores = compute_scores(graph.to_sparse(nodes=node_order), centralities, options)
+    return {centrality: dict(zip(node_order, values.tolist())) for centrality, values in scores.items()}
+
+
+def get_snapshot_scores(graph, windows, centralities=None, options=None, nodes=None):
+    """Returns scores of the nodes of the snapshot graph of every time window of a temporal graph. All snapshots are
+    solved together as one block diagonal matrix. Nodes without edges in a snapshot get the score of an isolated
+    node(e.g. the jump probability for PageRank).
+
+    Arguments:
+        graph {TemporalGraph} -- Temporal graph
+        windows {iterable} -- (start_time, end_time) pairs, see TemporalGraph.to_sparse_tensor
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores (default: {None})
+        options {dict} -- Keyword arguments of every score (default: {None})
+        nodes {list} -- Node order (default: {None})
+
+    Returns:
+        dict -- Maps score name to {node: [score of every window]}
+    """
+    node_order = graph.get_node_order(nodes)
+    scores = compute_scores(graph.to_sparse_tensor(list(windows), nodes=node_order), centralities, options)
+    output = {}
+    for centrality, snapshots in scores.items():
+        columns = [values.tolist() for values in snapshots]
+        output[centrality] = {node: [column[position] for column in columns] for position, node in enumerate(node_order)}
+    return output
+
+
+def get_warm_started_snapshot_scores(graph, windows, centralities=None, options=None, nodes=None, compare_cold_start=False):
+    """Returns scores of the snapshots of a temporal graph like get_snapshot_scores, but solves the windows in order,
+    each starting from the scores of the previous window(see incremental.py). Faster than the batched solve when
+    consecutive windows overlap, e.g. sliding windows.
+
+    Arguments:
+        graph {TemporalGraph} -- Temporal graph
+        windows {iterable} -- (start_time, end_time) pairs in time order
+
+    Keyword Arguments:
+        centralities {list} -- Names of the scores, all of CENTRALITIES if None (default: {None})
+        options {dict} -- Keyword arguments of every score (default: {None})
+        nodes {list} -- Node order (default: {None})
+        compare_cold_start {bool} -- If true the iterations saved are measured against cold starts (default: {False})
+
+    Returns:
+        tuple -- {score name: {node: [score of every window]}}, and the iteration summary of every centrality
+    """
+    centralities = centralities if centralities is not None else CENTRALITIES
+    node_order = graph.get_node_order(nodes)
+    matrices = graph.to_sparse_tensor(list(windows), nodes=node_order)
+    snapshot_scores, summary = get_warm_started_scores(((matrix, node_order) for matrix in matrices), centralities,
+                                                       options, compare_cold_start)
+    output = {centrality: {node: [scores[centrality][node] for scores in snapshot_scores] for node in node_order}
+              for centrality in centralities}
+    return output, summary
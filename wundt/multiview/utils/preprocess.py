@@ -1,7 +1,12 @@
 from collections import defaultdict
+from itertools import islice
+import json
+import os
+import shutil
 import numpy as np
 import pandas as pd
 import yaml
+from wundt.multiview.datastructures import NodeDictionary
 
 
 def to_regular_dict(d):
@@ -38,6 +43,612 @@ def calculate_response_rate_weight(message_timestamp, prev_message_timestamp, co
         return 0;
     return 1.0 / (1.0 + np.exp(a + b * inteval_converted))
     
+def save_edgelist(edges, columns, output_path, chunk_size=100000, node_dictionary=None):
+    """Writes edges to a csv file, chunk_size rows at a time, so that at most one chunk of rows is held in memory
+    however large the graph is. Each chunk is formatted by pandas instead of row by row.
+
+    Arguments:
+        edges {iterable} -- Edge tuples, e.g. graph.iter_edgelist(). Weights given as {"weight": w} dicts are unwrapped.
+        columns {tuple} -- Column names, e.g. graph.get_column_names()
+        output_path {str} -- Path of the csv file to write
+
+    Keyword Arguments:
+        chunk_size {int} -- Number of rows formatted at once (default: {100000})
+        node_dictionary {NodeDictionary} -- If given, source and target are node ids which are written as the node
+            names they map to (default: {None})
+    """
+    edges = iter(edges)
+    columns = list(columns)
+    with open(output_path, "w+") as output_file:
+        output_file.write(",".join(columns) + "\n")
+        while True:
+            chunk = list(islice(edges, chunk_size))
+            if len(chunk) == 0:
+                break
+            chunk_df = pd.DataFrame.from_records(chunk, columns=columns)
+            if node_dictionary is not None:
+                chunk_df["source"] = node_dictionary.get_nodes(chunk_df["source"].to_numpy())
+                chunk_df["target"] = node_dictionary.get_nodes(chunk_df["target"].to_numpy())
+            last_column = columns[-1]
+            if chunk_df[last_column].dtype == object:
+                chunk_df[last_column] = chunk_df[last_column].map(lambda value: value["weight"] if type(value) == dict else value)
+            chunk_df.to_csv(output_file, header=False, index=False)
+
+def _node_column(nodes):
+    nodes = np.asarray(nodes)
+    if nodes.dtype.kind in "iu" or (nodes.dtype == object and pd.api.types.infer_dtype(nodes, skipna=False) == "integer"):
+        return nodes.astype(np.int64)
+    return nodes.astype(str)
+
+def _edgelist_columns(edges, columns, chunk_size, node_dictionary):
+    """Converts edge tuples, chunk_size at a time, to one NumPy array per column. Relations are returned as int32
+    positions in the returned list of relation names.
+    """
+    edges = iter(edges)
+    chunks = {name: [] for name in columns}
+    relations = []
+    while True:
+        chunk = list(islice(edges, chunk_size))
+        if len(chunk) == 0:
+            break
+        chunk_df = pd.DataFrame.from_records(chunk, columns=columns)
+        for name in ["source", "target"]:
+            nodes = chunk_df[name].to_numpy()
+            if node_dictionary is not None:
+                nodes = node_dictionary.get_nodes(nodes)
+            chunks[name].append(_node_column(nodes))
+        if "relation" in columns:
+            new_relations = pd.unique(chunk_df["relation"]).tolist()
+            relations.extend(relation for relation in new_relations if relation not in relations)
+            chunks["relation"].append(pd.Index(relations, dtype=object).get_indexer(chunk_df["relation"].to_numpy()).astype(np.int32))
+        if "timestamp" in columns:
+            chunks["timestamp"].append(chunk_df["timestamp"].to_numpy(dtype=np.float64))
+        if "weight" in columns:
+            weights = chunk_df["weight"]
+            if weights.dtype == object:
+                weights = weights.map(lambda value: value["weight"] if type(value) == dict else value)
+            chunks["weight"].append(weights.to_numpy(dtype=np.float64))
+    dtypes = {"source": np.int64, "target": np.int64, "relation": np.int32, "timestamp": np.float64, "weight": np.float64}
+    output = {}
+    for name in columns:
+        output[name] = np.concatenate(chunks[name]) if len(chunks[name]) > 0 else np.zeros(0, dtype=dtypes.get(name, np.float64))
+    return output, relations
+
+def save_npy_edgelist(edges, columns, output_dir, header=None, chunk_size=100000, node_dictionary=None):
+    """Writes edges in binary columnar form: a directory holding one .npy file per column and a header.json file.
+    Nodes are saved as int64(or fixed width strings if node names are not integers), timestamps and weights as
+    float64 and relations as int32 positions in the "relations" list of the header. See load_npy_edgelist.
+
+    Arguments:
+        edges {iterable} -- Edge tuples, e.g. graph.iter_edgelist(). Weights given as {"weight": w} dicts are unwrapped.
+        columns {tuple} -- Column names, e.g. graph.get_column_names()
+        output_dir {str} -- Directory to write the columns to
+
+    Keyword Arguments:
+        header {dict} -- Extra header fields, e.g. graph type and directedness (default: {None})
+        chunk_size {int} -- Number of rows converted at once (default: {100000})
+        node_dictionary {NodeDictionary} -- If given, source and target are node ids which are written as the node
+            names they map to (default: {None})
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    columns = list(columns)
+    arrays, relations = _edgelist_columns(edges, columns, chunk_size, node_dictionary)
+    for name in columns:
+        np.save(os.path.join(output_dir, name + ".npy"), arrays[name])
+    output_header = dict(header or {})
+    output_header.update({"columns": columns, "num_edges": len(arrays[columns[0]]), "relations": relations})
+    with open(os.path.join(output_dir, "header.json"), "w+") as header_file:
+        json.dump(output_header, header_file)
+
+def load_npy_edgelist(input_dir, mmap_mode="r", decode_relations=True):
+    """Loads edges saved by save_npy_edgelist. The columns are memory mapped, so nothing is parsed and only the
+    pages that are used are read from disk.
+
+    Arguments:
+        input_dir {str} -- Directory written by save_npy_edgelist
+
+    Keyword Arguments:
+        mmap_mode {str} -- Mode passed to numpy.load, None reads the columns into memory (default: {"r"})
+        decode_relations {bool} -- If true the relation column holds relation names instead of their positions in
+            the relations list of the header (default: {True})
+
+    Returns:
+        tuple -- Header dict and dict which maps column names to arrays
+    """
+    with open(os.path.join(input_dir, "header.json")) as header_file:
+        header = json.load(header_file)
+    columns = {}
+    for name in header["columns"]:
+        columns[name] = np.load(os.path.join(input_dir, name + ".npy"), mmap_mode=mmap_mode)
+    if decode_relations and "relation" in columns:
+        relations = np.empty(len(header["relations"]), dtype=object)
+        relations[:] = header["relations"]
+        columns["relation"] = relations[columns["relation"]]
+    return header, columns
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("The parquet graph format requires pyarrow, install it with: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+def save_parquet_edgelist(edges, columns, output_dir, header=None, bucket_size=None, row_group_size=65536, chunk_size=100000, node_dictionary=None):
+    """Writes edges as Parquet files under output_dir together with a header.json file. If the edges have timestamps
+    and bucket_size is given they are partitioned into time buckets: output_dir/bucket=<k>/part-0.parquet holds the
+    edges with k * bucket_size <= timestamp < (k + 1) * bucket_size. Other edges go to output_dir/part-0.parquet.
+    Edges are sorted by timestamp, so the min/max timestamp statistics of each row group of row_group_size rows
+    are narrow and load_parquet_edgelist can skip the row groups outside of a time range. Any previous content of
+    output_dir is removed. Requires pyarrow.
+
+    Arguments:
+        edges {iterable} -- Edge tuples, e.g. graph.iter_edgelist(). Weights given as {"weight": w} dicts are unwrapped.
+        columns {tuple} -- Column names, e.g. graph.get_column_names()
+        output_dir {str} -- Directory to write the edges to
+
+    Keyword Arguments:
+        header {dict} -- Extra header fields, e.g. graph type and directedness (default: {None})
+        bucket_size {float} -- Length of a time bucket, None writes a single file (default: {None})
+        row_group_size {int} -- Number of rows per Parquet row group (default: {65536})
+        chunk_size {int} -- Number of rows converted at once (default: {100000})
+        node_dictionary {NodeDictionary} -- If given, source and target are node ids which are written as the node
+            names they map to (default: {None})
+    """
+    pa, pq = _import_pyarrow()
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+    columns = list(columns)
+    arrays, relations = _edgelist_columns(edges, columns, chunk_size, node_dictionary)
+    if "relation" in arrays:
+        relation_names = np.empty(len(relations), dtype=object)
+        relation_names[:] = relations
+        arrays["relation"] = relation_names[arrays["relation"]]
+    num_edges = len(arrays[columns[0]])
+    parts = [(None, 0, num_edges)]
+    bucketed = "timestamp" in arrays and bucket_size is not None
+    if "timestamp" in arrays:
+        timestamps = arrays["timestamp"]
+        if bucketed:
+            buckets = np.floor(timestamps / bucket_size).astype(np.int64)
+            order = np.lexsort((timestamps, buckets))
+            buckets = buckets[order]
+            bucket_ids, starts = np.unique(buckets, return_index=True)
+            parts = list(zip(bucket_ids.tolist(), starts.tolist(), starts[1:].tolist() + [num_edges]))
+        else:
+            order = np.argsort(timestamps, kind="stable")
+        arrays = {name: column[order] for name, column in arrays.items()}
+    output_header = dict(header or {})
+    output_header.update({"columns": columns, "num_edges": num_edges, "relations": relations, "bucket_size": bucket_size if bucketed else None, "buckets": []})
+    for bucket, start, stop in parts:
+        table = pa.table({name: arrays[name][start:stop] for name in columns})
+        if bucket is None:
+            path = os.path.join(output_dir, "part-0.parquet")
+        else:
+            os.makedirs(os.path.join(output_dir, "bucket=%d" % bucket))
+            path = os.path.join(output_dir, "bucket=%d" % bucket, "part-0.parquet")
+            output_header["buckets"].append(bucket)
+        pq.write_table(table, path, row_group_size=row_group_size, write_statistics=True)
+    with open(os.path.join(output_dir, "header.json"), "w+") as header_file:
+        json.dump(output_header, header_file)
+
+def load_parquet_edgelist(input_dir, start_time=None, end_time=None):
+    """Loads edges saved by save_parquet_edgelist, optionally only the edges with timestamp within
+    [start_time, end_time]. Time buckets outside of the range are not opened, and of the opened files only the row
+    groups whose timestamp statistics overlap the range are read. Requires pyarrow.
+
+    Arguments:
+        input_dir {str} -- Directory written by save_parquet_edgelist
+
+    Keyword Arguments:
+        start_time {float} -- Start of the time range, None for no lower bound (default: {None})
+        end_time {float} -- End of the time range, None for no upper bound (default: {None})
+
+    Returns:
+        tuple -- Header dict and dict which maps column names to arrays
+    """
+    pa, pq = _import_pyarrow()
+    with open(os.path.join(input_dir, "header.json")) as header_file:
+        header = json.load(header_file)
+    columns = header["columns"]
+    ranged = "timestamp" in columns and (start_time is not None or end_time is not None)
+    low = -np.inf if start_time is None else start_time
+    high = np.inf if end_time is None else end_time
+    if header["bucket_size"] is not None:
+        bucket_size = header["bucket_size"]
+        paths = [os.path.join(input_dir, "bucket=%d" % bucket, "part-0.parquet") for bucket in header["buckets"]
+                 if not ranged or (bucket * bucket_size <= high and (bucket + 1) * bucket_size > low)]
+    else:
+        paths = [os.path.join(input_dir, "part-0.parquet")]
+    tables = []
+    for path in paths:
+        parquet_file = pq.ParquetFile(path)
+        if not ranged:
+            tables.append(parquet_file.read(columns=columns))
+            continue
+        timestamp_index = parquet_file.schema_arrow.get_field_index("timestamp")
+        row_groups = []
+        for row_group in range(parquet_file.num_row_groups):
+            statistics = parquet_file.metadata.row_group(row_group).column(timestamp_index).statistics
+            if statistics is None or not statistics.has_min_max or (statistics.max >= low and statistics.min <= high):
+                row_groups.append(row_group)
+        if len(row_groups) > 0:
+            tables.append(parquet_file.read_row_groups(row_groups, columns=columns))
+    output = {}
+    if len(tables) > 0:
+        table = pa.concat_tables(tables)
+        for name in columns:
+            output[name] = table.column(name).to_numpy()
+    else:
+        for name in columns:
+            output[name] = np.zeros(0, dtype=object if name == "relation" else np.float64)
+    if ranged:
+        mask = (output["timestamp"] >= low) & (output["timestamp"] <= high)
+        output = {name: column[mask] for name, column in output.items()}
+    return header, output
+
+SNAPSHOT_PACK_MAGIC = b"WSNPACK1"
+
+class SnapshotPackWriter(object):
+    def __init__(self, output_path, columns, header=None):
+        """Initializes SnapshotPackWriter object, which writes the snapshots of a graph to one binary file, one
+        snapshot at a time. The file holds the edges of all snapshots as fixed size records ordered by snapshot,
+        followed by a JSON footer with the record layout, the offsets index(row of the first edge of every
+        snapshot), the node and relation names the records refer to, and the extra header fields. Snapshot i can be
+        read without reading the others, see load_snapshot_pack.
+
+        Arguments:
+            output_path {str} -- Path of the file to write
+            columns {tuple} -- Column names, e.g. graph.get_column_names()
+
+        Keyword Arguments:
+            header {dict} -- Extra header fields, e.g. graph type and directedness (default: {None})
+        """
+        self.output_path = output_path
+        self.columns = list(columns)
+        self.header = dict(header or {})
+        dtypes = {"source": np.int64, "target": np.int64, "relation": np.int32, "timestamp": np.float64, "weight": np.float64}
+        self.record_dtype = np.dtype([(name, dtypes.get(name, np.float64)) for name in self.columns])
+        self.nodes = pd.Index([])
+        self.relations = []
+        self.snapshot_offsets = [0]
+        self.ranges = []
+        self.output_file = open(output_path, "wb")
+        self.output_file.write(SNAPSHOT_PACK_MAGIC)
+
+    def _codes(self, names, table):
+        # Positions of names in table, appending the new names
+        if len(names) > 0:
+            new_names = pd.Index(pd.unique(names)).difference(table)
+            table = new_names if len(table) == 0 else table.append(new_names)
+        return table.get_indexer(names), table
+
+    def add_snapshot(self, edges, chunk_size=100000, node_dictionary=None, **range_info):
+        """Appends the next snapshot.
+
+        Arguments:
+            edges {iterable, dict} -- Edge tuples(e.g. graph.iter_edges(data=True)), or dict which maps column names
+                to arrays
+
+        Keyword Arguments:
+            chunk_size {int} -- Number of rows converted at once (default: {100000})
+            node_dictionary {NodeDictionary} -- If given, source and target are node ids which are written as the
+                node names they map to (default: {None})
+            range_info -- Time range of the snapshot, e.g. start=..., end=..., stored in the "ranges" list of the
+                header
+        """
+        if isinstance(edges, dict):
+            arrays = {name: np.asarray(edges[name]) for name in self.columns}
+            if node_dictionary is not None:
+                arrays["source"] = node_dictionary.get_nodes(arrays["source"])
+                arrays["target"] = node_dictionary.get_nodes(arrays["target"])
+            relations = pd.unique(arrays["relation"]).tolist() if "relation" in arrays else []
+        else:
+            arrays, relations = _edgelist_columns(edges, self.columns, chunk_size, node_dictionary)
+            if "relation" in arrays:
+                relation_names = np.empty(len(relations), dtype=object)
+                relation_names[:] = relations
+                arrays["relation"] = relation_names[arrays["relation"]]
+        records = np.empty(len(arrays[self.columns[0]]), dtype=self.record_dtype)
+        for name in ["source", "target"]:
+            records[name], self.nodes = self._codes(_node_column(arrays[name]), self.nodes)
+        if "relation" in self.columns:
+            self.relations.extend(relation for relation in relations if relation not in self.relations)
+            records["relation"] = pd.Index(self.relations, dtype=object).get_indexer(arrays["relation"])
+        for name in self.columns:
+            if name not in ["source", "target", "relation"]:
+                records[name] = arrays[name]
+        self.output_file.write(records.tobytes())
+        self.snapshot_offsets.append(self.snapshot_offsets[-1] + len(records))
+        self.ranges.append(range_info)
+
+    def close(self):
+        footer = dict(self.header)
+        footer.update({"columns": self.columns, "dtypes": [self.record_dtype[name].str for name in self.columns],
+                       "num_edges": self.snapshot_offsets[-1], "num_snapshots": len(self.snapshot_offsets) - 1,
+                       "snapshot_offsets": self.snapshot_offsets, "ranges": self.ranges,
+                       "nodes": [node.item() if isinstance(node, np.generic) else node for node in self.nodes.tolist()], "relations": self.relations})
+        footer = json.dumps(footer).encode("utf-8")
+        self.output_file.write(footer)
+        self.output_file.write(np.array([len(footer)], dtype="<i8").tobytes())
+        self.output_file.write(SNAPSHOT_PACK_MAGIC)
+        self.output_file.close()
+
+class SnapshotParquetWriter(object):
+    def __init__(self, output_dir, columns, header=None, row_group_size=65536):
+        """Initializes SnapshotParquetWriter object, which writes the snapshots of a graph, one snapshot at a time, to
+        a single Parquet file output_dir/part-0.parquet with a "snapshot" column, and a header.json file with the
+        range and the first row of every snapshot. Rows are ordered by snapshot, so the snapshot statistics of each
+        row group let readers skip the other snapshots. The directory can be read with load_parquet_edgelist or
+        load_snapshot_edgelists. Any previous content of output_dir is removed. Requires pyarrow.
+
+        Arguments:
+            output_dir {str} -- Directory to write the snapshots to
+            columns {tuple} -- Column names, e.g. graph.get_column_names()
+
+        Keyword Arguments:
+            header {dict} -- Extra header fields, e.g. graph type and directedness (default: {None})
+            row_group_size {int} -- Number of rows per Parquet row group (default: {65536})
+        """
+        self.pa, self.pq = _import_pyarrow()
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.makedirs(output_dir)
+        self.output_dir = output_dir
+        self.columns = list(columns)
+        self.header = dict(header or {})
+        self.row_group_size = row_group_size
+        self.writer = None
+        self.tables = []
+        self.num_buffered = 0
+        self.relations = []
+        self.snapshot_offsets = [0]
+        self.ranges = []
+
+    def add_snapshot(self, edges, chunk_size=100000, node_dictionary=None, **range_info):
+        """Appends the next snapshot, see SnapshotPackWriter.add_snapshot.
+        """
+        arrays, relations = _edgelist_columns(edges, self.columns, chunk_size, node_dictionary)
+        if "relation" in arrays:
+            relation_names = np.empty(len(relations), dtype=object)
+            relation_names[:] = relations
+            arrays["relation"] = relation_names[arrays["relation"]]
+            self.relations.extend(relation for relation in relations if relation not in self.relations)
+        num_edges = len(arrays[self.columns[0]])
+        if num_edges > 0:
+            table = {"snapshot": np.full(num_edges, len(self.ranges), dtype=np.int32)}
+            table.update((name, arrays[name]) for name in self.columns)
+            self.tables.append(self.pa.table(table))
+            self.num_buffered += num_edges
+            if self.num_buffered >= self.row_group_size:
+                self._flush()
+        self.snapshot_offsets.append(self.snapshot_offsets[-1] + num_edges)
+        self.ranges.append(range_info)
+
+    def _flush(self):
+        if len(self.tables) == 0:
+            return
+        table = self.pa.concat_tables(self.tables)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(os.path.join(self.output_dir, "part-0.parquet"), table.schema, write_statistics=True)
+        self.writer.write_table(table, row_group_size=self.row_group_size)
+        self.tables = []
+        self.num_buffered = 0
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            # No edges: empty file with the default column types
+            dtypes = {"source": np.int64, "target": np.int64, "relation": object, "timestamp": np.float64, "weight": np.float64}
+            table = {"snapshot": self.pa.array(np.zeros(0, dtype=np.int32))}
+            for name in self.columns:
+                table[name] = self.pa.array([], type=self.pa.string()) if dtypes.get(name) == object else self.pa.array(np.zeros(0, dtype=dtypes.get(name, np.float64)))
+            self.pq.write_table(self.pa.table(table), os.path.join(self.output_dir, "part-0.parquet"))
+        header = dict(self.header)
+        header.update({"columns": ["snapshot"] + self.columns, "num_edges": self.snapshot_offsets[-1], "relations": self.relations,
+                       "bucket_size": None, "buckets": [], "num_snapshots": len(self.ranges),
+                       "snapshot_offsets": self.snapshot_offsets, "ranges": self.ranges})
+        with open(os.path.join(self.output_dir, "header.json"), "w+") as header_file:
+            json.dump(header, header_file)
+
+def save_snapshot_pack(columns, output_path, header=None, num_snapshots=None):
+    """Writes snapshot edges held as columns with a "snapshot" column(see load_snapshot_edgelists) to a snapshot
+    pack file, see SnapshotPackWriter.
+
+    Arguments:
+        columns {dict} -- Maps column names to arrays, including "snapshot"
+        output_path {str} -- Path of the file to write
+
+    Keyword Arguments:
+        header {dict} -- Extra header fields; a "ranges" list gives the time range of every snapshot (default: {None})
+        num_snapshots {int} -- Number of snapshots, one more than the largest snapshot id if None (default: {None})
+    """
+    header = dict(header or {})
+    ranges = header.pop("ranges", None)
+    names = [name for name in columns if name != "snapshot"]
+    snapshots = np.asarray(columns["snapshot"], dtype=np.int64)
+    num_snapshots = num_snapshots if num_snapshots is not None else (int(snapshots.max()) + 1 if len(snapshots) > 0 else 0)
+    order = np.argsort(snapshots, kind="stable")
+    offsets = np.searchsorted(snapshots[order], np.arange(num_snapshots + 1))
+    writer = SnapshotPackWriter(output_path, names, header)
+    for snapshot in range(num_snapshots):
+        rows = order[offsets[snapshot]:offsets[snapshot + 1]]
+        writer.add_snapshot({name: np.asarray(columns[name])[rows] for name in names}, **(ranges[snapshot] if ranges is not None else {}))
+    writer.close()
+
+def read_snapshot_pack_header(input_path):
+    """Returns the header of a snapshot pack file, see SnapshotPackWriter.
+    """
+    with open(input_path, "rb") as input_file:
+        input_file.seek(-16, os.SEEK_END)
+        footer_length = int(np.frombuffer(input_file.read(8), dtype="<i8")[0])
+        if input_file.read(8) != SNAPSHOT_PACK_MAGIC:
+            raise ValueError("Not a snapshot pack file: %s" % input_path)
+        input_file.seek(-16 - footer_length, os.SEEK_END)
+        return json.loads(input_file.read(footer_length).decode("utf-8"))
+
+def load_snapshot_pack(input_path, snapshots=None, header=None):
+    """Loads edges of a snapshot pack file. The records are memory mapped, so only the selected snapshots are read
+    from disk.
+
+    Arguments:
+        input_path {str} -- Path of the file written by SnapshotPackWriter
+
+    Keyword Arguments:
+        snapshots {int, iterable} -- Index of one snapshot or indices of snapshots to load, all if None (default: {None})
+        header {dict} -- Header returned by read_snapshot_pack_header, read from the file if None (default: {None})
+
+    Returns:
+        tuple -- Header dict and dict which maps column names to arrays; the "snapshot" column holds the snapshot
+            index of every edge
+    """
+    header = header if header is not None else read_snapshot_pack_header(input_path)
+    record_dtype = np.dtype([(name, dtype) for name, dtype in zip(header["columns"], header["dtypes"])])
+    offsets = header["snapshot_offsets"]
+    if snapshots is None:
+        snapshots = range(header["num_snapshots"])
+    elif isinstance(snapshots, (int, np.integer)):
+        snapshots = [snapshots]
+    snapshots = list(snapshots)
+    if header["num_edges"] > 0:
+        records = np.memmap(input_path, dtype=record_dtype, mode="r", offset=len(SNAPSHOT_PACK_MAGIC), shape=(header["num_edges"],))
+        parts = [np.array(records[offsets[snapshot]:offsets[snapshot + 1]]) for snapshot in snapshots]
+        del records
+    else:
+        parts = []
+    records = np.concatenate(parts) if len(parts) > 0 else np.zeros(0, dtype=record_dtype)
+    nodes = np.asarray(header["nodes"]) if len(header["nodes"]) > 0 else np.zeros(0, dtype=np.int64)
+    relations = np.empty(len(header["relations"]), dtype=object)
+    relations[:] = header["relations"]
+    columns = {"snapshot": np.repeat(np.array(snapshots, dtype=np.int32), [offsets[snapshot + 1] - offsets[snapshot] for snapshot in snapshots]).astype(np.int32)}
+    for name in header["columns"]:
+        if name in ["source", "target"]:
+            columns[name] = nodes[records[name]]
+        elif name == "relation":
+            columns[name] = relations[records[name]]
+        else:
+            columns[name] = records[name]
+    return header, columns
+
+def _snapshot_csv_paths(input_dir):
+    # snapshot-0.csv, snapshot-1.csv, ... up to the first missing index
+    paths = []
+    while os.path.exists(os.path.join(input_dir, "snapshot-%d.csv" % len(paths))):
+        paths.append(os.path.join(input_dir, "snapshot-%d.csv" % len(paths)))
+    return paths
+
+def _read_snapshot_csv(path):
+    snapshot_df = pd.read_csv(path, sep=",", header=0)
+    columns = {}
+    for name in snapshot_df.columns:
+        if name in ["source", "target"]:
+            columns[name] = _node_column(snapshot_df[name].to_numpy())
+        elif name == "relation":
+            columns[name] = snapshot_df[name].to_numpy(dtype=object)
+        else:
+            columns[name] = snapshot_df[name].to_numpy(dtype=np.float64)
+    return list(snapshot_df.columns), columns
+
+def load_snapshot_edgelists(input_path, workers=1):
+    """Loads every snapshot of a graph into one set of columns with a "snapshot" column. input_path is either a
+    directory of snapshot-<index>.csv files, which are parsed by a pool of workers processes, a snapshot pack file
+    (see SnapshotPackWriter) or a directory written by SnapshotParquetWriter.
+
+    Arguments:
+        input_path {str} -- Snapshot directory, snapshot pack file or snapshot Parquet directory
+
+    Keyword Arguments:
+        workers {int} -- Number of processes parsing csv files (default: {1})
+
+    Returns:
+        tuple -- Header dict(with num_snapshots and snapshot_offsets) and dict which maps column names to arrays
+    """
+    if os.path.isfile(input_path):
+        return load_snapshot_pack(input_path)
+    if os.path.exists(os.path.join(input_path, "header.json")):
+        return load_parquet_edgelist(input_path)
+    paths = _snapshot_csv_paths(input_path)
+    if workers > 1 and len(paths) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        try:
+            results = pool.map(_read_snapshot_csv, paths, chunksize=max(1, len(paths) // (workers * 4)))
+        finally:
+            pool.terminate()
+    else:
+        results = [_read_snapshot_csv(path) for path in paths]
+    names = results[0][0] if len(results) > 0 else ["source", "target"]
+    sizes = [len(columns[names[0]]) for _, columns in results]
+    output = {"snapshot": np.repeat(np.arange(len(results), dtype=np.int32), sizes)}
+    for name in names:
+        # Snapshots without edges are left out, their empty columns have no reliable dtype
+        parts = [columns[name] for (_, columns), size in zip(results, sizes) if size > 0]
+        output[name] = np.concatenate(parts) if len(parts) > 0 else np.zeros(0, dtype=object if name == "relation" else (np.int64 if name in ["source", "target"] else np.float64))
+    header = {"columns": names, "num_snapshots": len(results), "num_edges": int(sum(sizes)),
+              "snapshot_offsets": np.concatenate([[0], np.cumsum(sizes)]).astype(int).tolist()}
+    return header, output
+
+def get_snapshot_matrices(columns, num_snapshots, directed=True, weighted=True):
+    """Builds the adjacency matrix of every snapshot from loaded snapshot columns. Rows and columns of a matrix are
+    the nodes of the snapshot's edges, in sorted order. Weights of duplicate edges(e.g. of several relations) are
+    summed; matrices of undirected snapshots are made symmetric, keeping the larger weight of (u, v) and (v, u).
+
+    Arguments:
+        columns {dict} -- Columns returned by load_snapshot_edgelists
+        num_snapshots {int} -- Number of snapshots
+
+    Keyword Arguments:
+        directed {bool} -- If false the snapshots are undirected (default: {True})
+        weighted {bool} -- If false every edge has weight 1 (default: {True})
+
+    Returns:
+        list -- (scipy.sparse.csr_matrix, list of nodes) pair of every snapshot
+    """
+    from wundt.multiview.datastructures.sparse import build_sparse
+    snapshots = np.asarray(columns["snapshot"], dtype=np.int64)
+    node_names, codes = np.unique(np.concatenate([columns["source"], columns["target"]]), return_inverse=True)
+    sources, targets = codes[:len(snapshots)], codes[len(snapshots):]
+    weights = np.asarray(columns["weight"], dtype=np.float64) if weighted and "weight" in columns else np.ones(len(snapshots))
+    # Nodes of every snapshot: sorted unique (snapshot, node) keys
+    keys = np.unique(np.concatenate([snapshots * len(node_names) + sources, snapshots * len(node_names) + targets]))
+    node_offsets = np.searchsorted(keys, np.arange(num_snapshots + 1) * len(node_names))
+    order = np.argsort(snapshots, kind="stable")
+    edge_offsets = np.searchsorted(snapshots[order], np.arange(num_snapshots + 1))
+    output = []
+    for snapshot in range(num_snapshots):
+        snapshot_keys = keys[node_offsets[snapshot]:node_offsets[snapshot + 1]]
+        rows = order[edge_offsets[snapshot]:edge_offsets[snapshot + 1]]
+        base = snapshot * len(node_names)
+        matrix = build_sparse(np.searchsorted(snapshot_keys, base + sources[rows]), np.searchsorted(snapshot_keys, base + targets[rows]),
+                              weights[rows], len(snapshot_keys))
+        if not directed:
+            matrix = matrix.maximum(matrix.T).tocsr()
+        output.append((matrix, node_names[snapshot_keys - base].tolist()))
+    return output
+
+def translate_network(network, node_dictionary):
+    """Replaces node ids of a graph in vis.js format(see to_visjs_format of the graphs) with the node names they
+    map to.
+
+    Arguments:
+        network {dict} -- Graph in vis.js format
+        node_dictionary {NodeDictionary} -- Dictionary of the graph, may be None in which case network is returned as is
+
+    Returns:
+        dict -- Graph in vis.js format
+    """
+    if node_dictionary is None:
+        return network
+    network["nodes"] = node_dictionary.get_nodes(network["nodes"]).tolist()
+    for edge in network["edges"]:
+        edge["from"] = node_dictionary.get_node(edge["from"])
+        edge["to"] = node_dictionary.get_node(edge["to"])
+    return network
+
 def display_error(message):
     print("\x1B[31;40m" + message + "\x1B[0m")
 
@@ -150,6 +761,7 @@ class UsersInfoWrapper(object):
         self.action_fakename2hash = {value: key for key, value in self.hash2fakename.items() if self.hashSource[key] == "action"}
         
         self.index2hash = {value:key for key, value in self.hash2index.items()}
+        self.node_dictionary = NodeDictionary()
     def get_default_node_name(self, hashcode, config):
         default_node_name = config["users"]["default"]["node_name"]
         if default_node_name == "hashcode":
@@ -159,6 +771,10 @@ class UsersInfoWrapper(object):
             return user_info[default_node_name]
         else:
             ValueError("Node name should be one of: user_index, username and hashcode")
+    def get_default_node_id(self, hashcode, config):
+        """Returns id of the default node name(see get_default_node_name) of a user in node_dictionary.
+        """
+        return self.node_dictionary.get_id(self.get_default_node_name(hashcode, config))
         
 
     def save_metadata(self, path):
@@ -216,6 +832,7 @@ class UsersInfoWrapper(object):
         self.action_fakename2hash = {value: key for key, value in self.hash2fakename.items() if hashsource[key] == "action"}
 
         self.index2hash = {value:key for key, value in self.hash2index.items()}
+        self.node_dictionary = NodeDictionary()
         
 
     def get_user_by_username(self, username, source):